@@ -16,17 +16,51 @@ class Settings(BaseSettings):
     # Application Settings
     APP_NAME: str = "Personal Calendar Assistant"
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
     
     # Calendar Settings
+    CALENDAR_BACKEND: str = os.getenv("CALENDAR_BACKEND", "google")  # google or sqlite
+    SQLITE_DB_PATH: str = os.getenv("SQLITE_DB_PATH", "calendar.db")
+    DISCOVERY_CACHE_PATH: str = os.getenv("DISCOVERY_CACHE_PATH", "calendar_v3_discovery.json")
+    MIRROR_DB_PATH: str = os.getenv("MIRROR_DB_PATH", "")  # persist the event mirror here when set
     DEFAULT_TIMEZONE: str = "UTC"
     DEFAULT_EVENT_DURATION: int = 60  # minutes
     MIN_EVENT_DURATION: int = 15  # minutes
     MAX_EVENT_DURATION: int = 480  # minutes (8 hours)
+    WORKING_HOURS_START: str = os.getenv("WORKING_HOURS_START", "09:00")
+    WORKING_HOURS_END: str = os.getenv("WORKING_HOURS_END", "17:00")
+    WORKING_DAYS: list = [0, 1, 2, 3, 4]  # Monday to Friday
+    MEETING_BUFFER_MINUTES: int = int(os.getenv("MEETING_BUFFER_MINUTES", "0"))
+    MEETING_GRID_MINUTES: int = 5  # slot size of the multi-person availability grid
+    CALENDAR_PAGE_SIZE: int = 250  # events per list page
+    CALENDAR_BATCH_SIZE: int = 50  # operations per batch HTTP request
+    MIRROR_REFRESH_SECONDS: int = int(os.getenv("MIRROR_REFRESH_SECONDS", "60"))
     
     # NLP Settings
     MODEL_NAME: str = "gemini-1.5-flash"
     MAX_TOKENS: int = 2000
     TEMPERATURE: float = 0.7
+    GEMINI_API_BASE: str = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "4"))  # deadline per Gemini call
+    LLM_BATCH_SIZE: int = int(os.getenv("LLM_BATCH_SIZE", "20"))  # utterances per multi-item prompt
+    LLM_BATCH_TIMEOUT_SECONDS: float = float(os.getenv("LLM_BATCH_TIMEOUT_SECONDS", "20"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))  # Gemini calls in flight at once
+    RULE_PARSER_MIN_CONFIDENCE: float = float(os.getenv("RULE_PARSER_MIN_CONFIDENCE", "0.8"))  # below this, ask Gemini
+    PROMPT_TIME_QUANTUM_MINUTES: int = 15  # reference time granularity in prompts
+    LLM_BREAKER_WINDOW: int = 20  # recent Gemini calls the circuit breaker judges
+    LLM_BREAKER_MIN_CALLS: int = 5
+    LLM_BREAKER_FAILURE_RATE: float = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))  # failed or slow share that opens it
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "3"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))  # open time before probing
+    PARSE_CACHE_SIZE: int = int(os.getenv("PARSE_CACHE_SIZE", "1024"))  # parsed utterances kept
+    PARSE_CACHE_TTL_SECONDS: int = int(os.getenv("PARSE_CACHE_TTL_SECONDS", "86400"))
+    PARSE_CACHE_BUCKET_MINUTES: int = 60  # reference-time granularity of cache keys
+    SIMILAR_CACHE_SIZE: int = int(os.getenv("SIMILAR_CACHE_SIZE", "1024"))  # parses kept for near-duplicate reuse
+    SIMILAR_CACHE_THRESHOLD: float = float(os.getenv("SIMILAR_CACHE_THRESHOLD", "0.8"))  # trigram Jaccard to reuse
+    INTENT_LOG_PATH: str = os.getenv("INTENT_LOG_PATH", "")  # log LLM parses here as training data when set
+    INTENT_MODEL_PATH: str = os.getenv("INTENT_MODEL_PATH", "")  # distilled intent model, tried before Gemini
+    INTENT_MODEL_MIN_CONFIDENCE: float = float(os.getenv("INTENT_MODEL_MIN_CONFIDENCE", "0.9"))
     
     # Priority Levels
     PRIORITY_LEVELS: list = ["low", "medium", "high", "urgent"]
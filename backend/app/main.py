@@ -1,25 +1,48 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
 from dotenv import load_dotenv
+from app.config import get_settings
+from app.models.intent import EventIntent
 from app.services.nlp import NLPService
 from app.services.calendar import CalendarService
+from app.services.async_calendar import create_async_calendar_service
+from app.services.intent_executor import IntentExecutor, intent_to_event_data
+from app.services.query_answerer import QueryAnswerer
 import traceback
 
 # Initialize services
 nlp_service = NLPService()
 calendar_service = CalendarService()
+async_calendar_service = create_async_calendar_service(calendar_service)
+intent_executor = IntentExecutor(calendar_service)
+query_answerer = QueryAnswerer(calendar_service, nlp_service)
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the local event mirror current so agenda reads skip the Google round trip
+    calendar_service.mirror.start_background_refresh(get_settings().MIRROR_REFRESH_SECONDS)
+    yield
+    calendar_service.mirror.stop_background_refresh()
+    await async_calendar_service.aclose()
+    await nlp_service.aclose()
+
 app = FastAPI(
     title="Personal Calendar Assistant",
     description="An intelligent calendar management system with natural language processing",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -44,6 +67,57 @@ class Event(BaseModel):
 class UserInput(BaseModel):
     text: str
 
+class BatchUserInput(BaseModel):
+    texts: List[str]
+
+class EventUpdate(BaseModel):
+    event_id: str
+    title: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    description: Optional[str] = None
+    location: Optional[str] = None
+
+class BatchEventRequest(BaseModel):
+    create: List[Event] = []
+    update: List[EventUpdate] = []
+
+class BatchDeleteRequest(BaseModel):
+    event_ids: List[str]
+
+def summarize_batch(results: List[dict]) -> dict:
+    failed = [result for result in results if not result['success']]
+    return {
+        "message": f"{len(results) - len(failed)} of {len(results)} operations succeeded",
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed)
+    }
+
+async def cancel_on_disconnect(request: Request, awaitable, poll_seconds: float = 0.1):
+    """Await awaitable, cancelling it as soon as the client hangs up."""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_seconds)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        # No-op once the task has finished
+        task.cancel()
+
+async def execute_intents(event_intents: List[EventIntent], texts: List[str], reference_time: datetime) -> List[dict]:
+    """Run intents as one batch through the IntentExecutor, answering the queries among them."""
+    results = await run_in_threadpool(intent_executor.execute, event_intents, reference_time)
+    for result, event_intent, text in zip(results, event_intents, texts):
+        if event_intent.action == 'query':
+            result.pop('error', None)
+            result.update(success=True, **await run_in_threadpool(
+                query_answerer.answer_intent, text, event_intent, reference_time
+            ))
+    return results
+
 # Routes
 @app.get("/")
 async def root():
@@ -81,28 +155,68 @@ async def root():
 #         raise HTTPException(status_code=500, detail=str(e))
     
 @app.post("/events/natural")
-async def create_event_natural(user_input: UserInput):
+async def create_event_natural(user_input: UserInput, request: Request):
     try:
-        # Parse natural language into structured event data
-        event_intent = nlp_service.parse_event_intent(user_input.text)
-        
-        # Create the calendar event
-        event_data = {
-            'title': event_intent.title,
-            'start_time': event_intent.start_time,
-            'end_time': event_intent.end_time,
-            'description': event_intent.description,
-            'location': event_intent.location,
-            'attendees': event_intent.attendees,
-            'priority': event_intent.priority
-        }
-        
-        created_event = calendar_service.create_event(event_data)
-        return {"message": "Event created successfully", "event": created_event}
+        reference_time = datetime.now()
+        # Plain calendar questions ("what do I have friday?") are answered from the event
+        # mirror without asking the LLM; anything else is parsed, and answered only if
+        # it parses as a query
+        answer = await run_in_threadpool(query_answerer.answer_text, user_input.text, reference_time)
+        if answer is not None:
+            return answer
+
+        # Parse natural language into one intent per requested action; the LLM call must
+        # not block the event loop, and is abandoned if the client goes away
+        event_intents = await cancel_on_disconnect(
+            request, nlp_service.aparse_actions(user_input.text, reference_time)
+        )
+
+        if len(event_intents) == 1 and event_intents[0].action == 'query':
+            return await run_in_threadpool(query_answerer.answer_intent, user_input.text, event_intents[0], reference_time)
+
+        if len(event_intents) == 1 and event_intents[0].action == 'create':
+            # Create the calendar event
+            created_event = await async_calendar_service.create_event(intent_to_event_data(event_intents[0]))
+            return {"message": "Event created successfully", "event": created_event}
+
+        # Several actions, or an update or deletion: resolve their targets and run them as one batch
+        results = await execute_intents(event_intents, [user_input.text] * len(event_intents), reference_time)
+        events = [result['event'] for result in results if result.get('event')]
+        return {**summarize_batch(results), "event": events[0] if events else None, "results": results}
+    except HTTPException:
+        raise
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/events/natural/batch")
+async def create_events_natural_batch(user_input: BatchUserInput, request: Request):
+    try:
+        # Utterances the LLM has to see share multi-item prompts instead of one call each
+        reference_time = datetime.now()
+        event_intents = await cancel_on_disconnect(
+            request, nlp_service.aparse_event_intents(user_input.texts, reference_time)
+        )
+        # Creations go out as one batch; updates and deletions find their event first
+        results = await execute_intents(event_intents, user_input.texts, reference_time)
+        for text, result in zip(user_input.texts, results):
+            result['text'] = text
+        return {**summarize_batch(results), "results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/nlp/stats")
+async def get_nlp_stats():
+    return {
+        "parse_cache": nlp_service.cache.stats(),
+        "similar_cache": nlp_service.similar_cache.stats(),
+        "circuit_breaker": nlp_service.breaker.stats(),
+        "llm_usage": nlp_service.gemini.usage.stats()
+    }
+
 @app.get("/events/daily")
 async def get_daily_agenda(date: Optional[str] = None):
     try:
@@ -116,17 +230,83 @@ async def get_daily_agenda(date: Optional[str] = None):
         else:
             parsed_date = datetime.now()
         
-        events = calendar_service.get_daily_agenda(parsed_date)
+        events = await async_calendar_service.get_daily_agenda(parsed_date)
         return {"message": "Daily agenda retrieved", "events": events, "date": parsed_date.isoformat()}
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/events/range")
+async def get_range_agenda(start: datetime, end: datetime):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    async def stream_events():
+        # One JSON event per line, flushed as each upstream page arrives
+        try:
+            async for event in async_calendar_service.iter_events(start, end):
+                yield json.dumps(event) + "\n"
+        except Exception:
+            # Headers are already sent, so the only thing left to do is log and end the stream
+            traceback.print_exc()
+
+    return StreamingResponse(stream_events(), media_type="application/x-ndjson")
+
 @app.get("/events/conflicts")
-async def check_conflicts(start_time: datetime, end_time: datetime):
+async def check_conflicts(start_time: datetime, end_time: datetime, calendar_ids: Optional[List[str]] = Query(None)):
+    try:
+        busy = await async_calendar_service.get_busy_intervals(start_time, end_time, calendar_ids)
+        has_conflicts = any(busy.values())
+        return {
+            "message": "Conflicts found" if has_conflicts else "No conflicts",
+            "has_conflicts": has_conflicts,
+            "busy": busy,
+            "start_time": start_time,
+            "end_time": end_time
+        }
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/events/meeting-times")
+async def find_meeting_times(start_time: datetime, end_time: datetime, duration_minutes: int,
+                             calendar_ids: List[str] = Query(...), min_attendees: Optional[int] = None):
+    try:
+        settings = get_settings()
+        slots = await run_in_threadpool(
+            calendar_service.find_meeting_times, calendar_ids, start_time, end_time, duration_minutes,
+            (datetime.strptime(settings.WORKING_HOURS_START, "%H:%M").time(),
+             datetime.strptime(settings.WORKING_HOURS_END, "%H:%M").time()),
+            settings.WORKING_DAYS, min_attendees
+        )
+        return {"message": f"{len(slots)} meeting times found", "slots": slots}
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/events/batch")
+async def batch_events(request: BatchEventRequest):
+    try:
+        # Batch calls go through the blocking client, so keep them off the event loop
+        created = await run_in_threadpool(
+            calendar_service.batch_create_events,
+            [event.model_dump() for event in request.create]
+        )
+        updated = await run_in_threadpool(
+            calendar_service.batch_update_events,
+            [update.model_dump(exclude_none=True) for update in request.update]
+        )
+        return {**summarize_batch(created + updated), "created": created, "updated": updated}
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Declared before /events/{event_id} so "batch" is not taken for an event id
+@app.delete("/events/batch")
+async def batch_delete_events(request: BatchDeleteRequest):
     try:
-        # TODO: Implement conflict detection
-        return {"message": "Checking for conflicts", "start_time": start_time, "end_time": end_time}
+        deleted = await run_in_threadpool(calendar_service.batch_delete_events, request.event_ids)
+        return {**summarize_batch(deleted), "deleted": deleted}
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -134,7 +314,7 @@ async def check_conflicts(start_time: datetime, end_time: datetime):
 @app.delete("/events/{event_id}")
 async def delete_event(event_id: str):
     try:
-        calendar_service.delete_event(event_id)
+        await async_calendar_service.delete_event(event_id)
         return {"message": "Event deleted successfully"}
     except Exception as e:
         traceback.print_exc()
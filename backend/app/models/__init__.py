@@ -0,0 +1 @@
+from .intent import EventIntent
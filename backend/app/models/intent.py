@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class EventIntent(BaseModel):
+    """Schema for parsed event intent from natural language."""
+    action: str = Field(description="The action to perform (create, update, delete, query)")
+    title: Optional[str] = Field(default=None, description="The title of the event")
+    start_time: Optional[datetime] = Field(default=None, description="The start time of the event")
+    end_time: Optional[datetime] = Field(default=None, description="The end time of the event")
+    description: Optional[str] = Field(default=None, description="The description of the event")
+    location: Optional[str] = Field(default=None, description="The location of the event")
+    attendees: Optional[List[str]] = Field(default=None, description="List of attendees' email addresses")
+    priority: Optional[str] = Field(default="medium", description="Priority level of the event")
+    duration_minutes: Optional[int] = Field(default=None, description="Duration of the event in minutes, if known")
+    confidence: Optional[float] = Field(default=None, description="How sure the parser is of this reading, from 0 to 1")
@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta
+import asyncio
+import itertools
+import httpx
+from urllib.parse import quote
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+from ..config import get_settings
+from .calendar import CalendarService, build_event_body, busy_from_events, merge_event_update
+from .backends.google_backend import (
+    FREEBUSY_MAX_CALENDARS, GoogleCalendarBackend, build_freebusy_query, parse_freebusy_response
+)
+from .event_mirror import EventMirror
+from ..utils.event_times import to_rfc3339
+
+CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
+
+class AsyncCalendarService:
+    """Non-blocking counterpart of CalendarService for use inside async request handlers.
+
+    All requests share one httpx.AsyncClient, so connections to Google are pooled and
+    kept alive, and concurrent handlers overlap their upstream waits instead of
+    stalling the event loop on googleapiclient's blocking execute().
+    """
+
+    def __init__(self, credentials_provider: Optional[Callable[[], Any]] = None,
+                 mirror: Optional[EventMirror] = None, base_url: str = CALENDAR_API_BASE,
+                 calendar_id: str = 'primary'):
+        self.settings = get_settings()
+        self.calendar_id = calendar_id
+        # Credentials are resolved on the first request, which may have to run the OAuth flow
+        self._credentials_provider = credentials_provider
+        self.creds = None
+        self.mirror = mirror
+        self._refresh_lock = asyncio.Lock()
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=self.settings.HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=self.settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.HTTP_MAX_CONNECTIONS
+            )
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if self._credentials_provider is None:
+            return {}
+        async with self._refresh_lock:
+            # Another request may have loaded or refreshed the token while we waited
+            if self.creds is None:
+                self.creds = await asyncio.to_thread(self._credentials_provider)
+            if not self.creds.valid:
+                from google.auth.transport.requests import Request
+                await asyncio.to_thread(self.creds.refresh, Request())
+        return {'Authorization': f'Bearer {self.creds.token}'}
+
+    def _events_path(self, event_id: Optional[str] = None) -> str:
+        path = f'/calendars/{quote(self.calendar_id, safe="")}/events'
+        return f'{path}/{quote(event_id, safe="")}' if event_id is not None else path
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        response = await self._client.request(method, path, headers=await self._auth_headers(), **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def iter_events(self, start_time: datetime, end_time: datetime) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every event overlapping [start_time, end_time) in start order, page by page."""
+        if self.mirror and self.mirror.is_warm:
+            for event in self.mirror.events_between(start_time, end_time):
+                yield event
+            return
+
+        params = {
+            'timeMin': to_rfc3339(start_time),
+            'timeMax': to_rfc3339(end_time),
+            'singleEvents': 'true',
+            'orderBy': 'startTime',
+            'maxResults': self.settings.CALENDAR_PAGE_SIZE
+        }
+        while True:
+            response = await self._request('GET', self._events_path(), params=params)
+            events_result = response.json()
+
+            for event in events_result.get('items', []):
+                yield event
+
+            if not events_result.get('nextPageToken'):
+                break
+            params['pageToken'] = events_result['nextPageToken']
+
+    async def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new calendar event in Google Calendar."""
+        event = build_event_body(event_data, self.settings)
+        response = await self._request('POST', self._events_path(), json=event)
+        created_event = response.json()
+        if self.mirror:
+            self.mirror.upsert(created_event)
+        return created_event
+
+    async def get_daily_agenda(self, date: datetime) -> List[Dict[str, Any]]:
+        """Get all events for a specific day from Google Calendar."""
+        start_time = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_time = start_time + timedelta(days=1)
+
+        return [event async for event in self.iter_events(start_time, end_time)]
+
+    async def check_conflicts(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        """Check for conflicting events in the given time range."""
+        return [event async for event in self.iter_events(start_time, end_time)]
+
+    async def get_busy_intervals(self, start_time: datetime, end_time: datetime,
+                                 calendar_ids: Optional[Sequence[str]] = None) -> Dict[str, List[Dict[str, datetime]]]:
+        """Get busy intervals per calendar without downloading event bodies."""
+        calendar_ids = list(calendar_ids or ['primary'])
+        if calendar_ids == ['primary'] and self.mirror and self.mirror.is_warm:
+            return {'primary': busy_from_events(self.mirror.events_between(start_time, end_time))}
+
+        # freeBusy takes FREEBUSY_MAX_CALENDARS per query; larger teams go out as concurrent queries
+        responses = await asyncio.gather(*(
+            self._request('POST', '/freeBusy', json=build_freebusy_query(
+                start_time, end_time, calendar_ids[offset:offset + FREEBUSY_MAX_CALENDARS], self.settings
+            ))
+            for offset in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS)
+        ))
+        busy = {}
+        for response in responses:
+            busy.update(parse_freebusy_response(response.json()))
+        return busy
+
+    async def get_event(self, event_id: str) -> Dict[str, Any]:
+        """Get a single calendar event, preferring the local mirror."""
+        event = self.mirror.get(event_id) if self.mirror else None
+        if event is None:
+            response = await self._request('GET', self._events_path(event_id))
+            event = response.json()
+        return event
+
+    async def update_event(self, event_id: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update an existing calendar event."""
+        response = await self._request('GET', self._events_path(event_id))
+        event = merge_event_update(response.json(), event_data, self.settings)
+
+        response = await self._request('PUT', self._events_path(event_id), json=event)
+        updated_event = response.json()
+        if self.mirror:
+            self.mirror.upsert(updated_event)
+        return updated_event
+
+    async def delete_event(self, event_id: str) -> None:
+        """Delete a calendar event from Google Calendar."""
+        await self._request('DELETE', self._events_path(event_id))
+        if self.mirror:
+            self.mirror.remove(event_id)
+
+
+class ThreadedCalendarService:
+    """Async surface over a CalendarService whose backend has no async client (e.g. SQLite).
+
+    Calls run in worker threads so they never block the event loop.
+    """
+
+    def __init__(self, calendar_service: CalendarService):
+        self.calendar_service = calendar_service
+        self.mirror = calendar_service.mirror
+        self.settings = calendar_service.settings
+
+    async def aclose(self) -> None:
+        pass
+
+    async def iter_events(self, start_time: datetime, end_time: datetime) -> AsyncIterator[Dict[str, Any]]:
+        events = self.calendar_service.iter_events(start_time, end_time)
+        while True:
+            page = await asyncio.to_thread(list, itertools.islice(events, self.settings.CALENDAR_PAGE_SIZE))
+            for event in page:
+                yield event
+            if len(page) < self.settings.CALENDAR_PAGE_SIZE:
+                break
+
+    async def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.calendar_service.create_event, event_data)
+
+    async def get_daily_agenda(self, date: datetime) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.calendar_service.get_daily_agenda, date)
+
+    async def check_conflicts(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.calendar_service.check_conflicts, start_time, end_time)
+
+    async def get_busy_intervals(self, start_time: datetime, end_time: datetime,
+                                 calendar_ids: Optional[Sequence[str]] = None) -> Dict[str, List[Dict[str, datetime]]]:
+        return await asyncio.to_thread(self.calendar_service.get_busy_intervals, start_time, end_time, calendar_ids)
+
+    async def get_event(self, event_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.calendar_service.get_event, event_id)
+
+    async def update_event(self, event_id: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.calendar_service.update_event, event_id, event_data)
+
+    async def delete_event(self, event_id: str) -> None:
+        await asyncio.to_thread(self.calendar_service.delete_event, event_id)
+
+
+def create_async_calendar_service(calendar_service: CalendarService):
+    """Pick the async client for calendar_service's backend: pooled HTTP for Google, threads otherwise."""
+    backend = calendar_service.backend
+    if isinstance(backend, GoogleCalendarBackend):
+        return AsyncCalendarService(lambda: backend.creds, mirror=calendar_service.mirror, calendar_id=backend.calendar_id)
+    return ThreadedCalendarService(calendar_service)
@@ -0,0 +1,17 @@
+from typing import Optional
+from .base import BatchOperation, CalendarBackend, SyncTokenExpired
+from ...config import get_settings
+
+
+def create_backend(backend: Optional[str] = None) -> CalendarBackend:
+    """Create the calendar backend named by CALENDAR_BACKEND ('google' or 'sqlite')."""
+    settings = get_settings()
+    backend = backend or settings.CALENDAR_BACKEND
+
+    if backend == 'google':
+        from .google_backend import GoogleCalendarBackend
+        return GoogleCalendarBackend()
+    if backend == 'sqlite':
+        from .sqlite_backend import SQLiteCalendarBackend
+        return SQLiteCalendarBackend(settings.SQLITE_DB_PATH)
+    raise ValueError(f"Unknown calendar backend: {backend}")
@@ -0,0 +1,89 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# A batch operation: ('insert', body), ('patch', event_id, body) or ('delete', event_id)
+BatchOperation = Tuple[Any, ...]
+
+
+class SyncTokenExpired(Exception):
+    """Raised by list_changes when the sync token is no longer valid and a full sync is needed."""
+
+
+class CalendarBackend(ABC):
+    """Storage operations CalendarService needs from a calendar provider.
+
+    Events are passed around as Google Calendar v3 event resources (plain dicts) whatever
+    the backend, so services and the frontend never see a backend-specific shape.
+    """
+
+    calendar_id: str = 'primary'
+
+    @abstractmethod
+    def insert_event(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a new event and return it with its assigned id."""
+
+    @abstractmethod
+    def get_event(self, event_id: str) -> Dict[str, Any]:
+        """Return a single event."""
+
+    @abstractmethod
+    def update_event(self, event_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace an event with body."""
+
+    @abstractmethod
+    def patch_event(self, event_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Update only the fields present in patch."""
+
+    @abstractmethod
+    def delete_event(self, event_id: str) -> None:
+        """Delete an event."""
+
+    @abstractmethod
+    def list_events(self, start_time: datetime, end_time: datetime, page_size: int,
+                    page_token: Optional[str] = None) -> Dict[str, Any]:
+        """Return one page of events overlapping [start_time, end_time) in start order.
+
+        The page is a dict with 'items' and, when more follow, 'nextPageToken'.
+        """
+
+    @abstractmethod
+    def list_changes(self, sync_token: Optional[str] = None, page_token: Optional[str] = None) -> Dict[str, Any]:
+        """Return one page of events changed since sync_token, or of every event when it is None.
+
+        Deleted events come back with status 'cancelled'. The last page carries
+        'nextSyncToken'; raise SyncTokenExpired when sync_token can no longer be used.
+        """
+
+    @abstractmethod
+    def query_busy(self, start_time: datetime, end_time: datetime,
+                   calendar_ids: Sequence[str]) -> Dict[str, List[Dict[str, datetime]]]:
+        """Return merged busy intervals per calendar id inside [start_time, end_time)."""
+
+    def can_sync_unattended(self) -> bool:
+        """Whether calls can run off the request path, without any interactive step such as a login."""
+        return True
+
+    def execute_batch(self, operations: List[BatchOperation]) -> List[Dict[str, Any]]:
+        """Run operations and report each outcome as {'index', 'success', 'event' | 'error'}.
+
+        A failing operation never aborts the others. Backends with a native batch
+        protocol override this; the default runs the operations one by one.
+        """
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                results.append({'index': index, 'success': True, 'event': self._run_operation(operation)})
+            except Exception as e:
+                results.append({'index': index, 'success': False, 'error': str(e)})
+        return results
+
+    def _run_operation(self, operation: BatchOperation) -> Optional[Dict[str, Any]]:
+        kind = operation[0]
+        if kind == 'insert':
+            return self.insert_event(operation[1])
+        if kind == 'patch':
+            return self.patch_event(operation[1], operation[2])
+        if kind == 'delete':
+            return self.delete_event(operation[1])
+        raise ValueError(f"Unknown batch operation: {kind}")
@@ -0,0 +1,257 @@
+from datetime import datetime
+from functools import partial
+import json
+import os.path
+import pickle
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+from ...config import get_settings
+from ...utils.event_times import parse_event_time, to_rfc3339
+from .base import BatchOperation, CalendarBackend, SyncTokenExpired
+
+# googleapiclient and google_auth_oauthlib are imported where they are used: together
+# they take a few hundred milliseconds to import, which every worker would otherwise
+# pay at boot before serving anything.
+
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+# freeBusy answers at most this many calendars per query
+FREEBUSY_MAX_CALENDARS = 50
+
+
+def build_freebusy_query(start_time: datetime, end_time: datetime, calendar_ids: Sequence[str], settings) -> Dict[str, Any]:
+    """Build the request body for freebusy().query."""
+    return {
+        'timeMin': to_rfc3339(start_time),
+        'timeMax': to_rfc3339(end_time),
+        'timeZone': settings.DEFAULT_TIMEZONE,
+        'items': [{'id': calendar_id} for calendar_id in calendar_ids]
+    }
+
+
+def parse_freebusy_response(result: Dict[str, Any]) -> Dict[str, List[Dict[str, datetime]]]:
+    """Turn a freebusy().query response into busy intervals per calendar id."""
+    busy = {}
+    for calendar_id, calendar in result.get('calendars', {}).items():
+        if calendar.get('errors'):
+            reasons = ', '.join(error.get('reason', 'unknown') for error in calendar['errors'])
+            raise ValueError(f"Free/busy lookup failed for {calendar_id}: {reasons}")
+        busy[calendar_id] = [
+            {'start': parse_event_time({'dateTime': period['start']}), 'end': parse_event_time({'dateTime': period['end']})}
+            for period in calendar.get('busy', [])
+        ]
+    return busy
+
+
+def load_discovery_document(cache_path: str) -> Dict[str, Any]:
+    """Load the Calendar v3 discovery document without a network round trip when possible.
+
+    Prefers the copy bundled with googleapiclient, then an on-disk cache, and only
+    fetches from Google (saving the result to the cache) when neither exists.
+    """
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = get_static_doc('calendar', 'v3')
+    if document is None and cache_path and os.path.exists(cache_path):
+        with open(cache_path) as cache:
+            document = cache.read()
+
+    if document is None:
+        import httplib2
+        response, document = httplib2.Http().request('https://www.googleapis.com/discovery/v1/apis/calendar/v3/rest')
+        if response.status != 200:
+            raise Exception(f"Could not fetch the Calendar discovery document (HTTP {response.status})")
+        document = document.decode()
+        if cache_path:
+            with open(cache_path, 'w') as cache:
+                cache.write(document)
+
+    return json.loads(document)
+
+
+def _load_token():
+    """The credentials saved by a previous OAuth login, or None."""
+    if not os.path.exists('token.pickle'):
+        return None
+    with open('token.pickle', 'rb') as token:
+        return pickle.load(token)
+
+
+class GoogleCalendarBackend(CalendarBackend):
+    """Google Calendar v3 through googleapiclient.
+
+    Authentication and client construction happen on first use rather than in
+    __init__, so importing the app never waits on OAuth or the discovery document.
+    """
+
+    def __init__(self, calendar_id: str = 'primary'):
+        self.settings = get_settings()
+        self.calendar_id = calendar_id
+        self._creds = None
+        self._service = None
+        self._init_lock = threading.Lock()
+
+    @property
+    def creds(self):
+        if self._creds is None:
+            with self._init_lock:
+                if self._creds is None:
+                    self._creds = self._authenticate()
+        return self._creds
+
+    @property
+    def service(self):
+        if self._service is None:
+            creds = self.creds
+            with self._init_lock:
+                if self._service is None:
+                    from googleapiclient.discovery import build_from_document
+                    self._service = build_from_document(
+                        load_discovery_document(self.settings.DISCOVERY_CACHE_PATH),
+                        credentials=creds
+                    )
+        return self._service
+
+    def can_sync_unattended(self) -> bool:
+        """True once credentials are loaded, or a stored token is valid or refreshable.
+
+        Without one the first call would run the interactive OAuth flow, which must not
+        start from a background thread.
+        """
+        if self._creds is not None:
+            return True
+        creds = _load_token()
+        return creds is not None and (creds.valid or bool(creds.expired and creds.refresh_token))
+
+    def _authenticate(self):
+        """Handle Google Calendar authentication and return the credentials."""
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+
+        # Check if we have valid credentials
+        creds = _load_token()
+
+        # If there are no (valid) credentials available, let the user log in
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                # Check if we have client credentials
+                if not self.settings.GOOGLE_CLIENT_ID or not self.settings.GOOGLE_CLIENT_SECRET:
+                    raise Exception("Google Calendar credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in your .env file.")
+
+                flow = InstalledAppFlow.from_client_config(
+                    {
+                        "installed": {
+                            "client_id": self.settings.GOOGLE_CLIENT_ID,
+                            "client_secret": self.settings.GOOGLE_CLIENT_SECRET,
+                            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                            "token_uri": "https://oauth2.googleapis.com/token",
+                            "redirect_uris": ["http://localhost:8080"]
+                        }
+                    },
+                    SCOPES
+                )
+                creds = flow.run_local_server(port=8080)
+
+            # Save the credentials for the next run
+            with open('token.pickle', 'wb') as token:
+                pickle.dump(creds, token)
+
+        return creds
+
+    def insert_event(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return self.service.events().insert(calendarId=self.calendar_id, body=body).execute()
+
+    def get_event(self, event_id: str) -> Dict[str, Any]:
+        return self.service.events().get(calendarId=self.calendar_id, eventId=event_id).execute()
+
+    def update_event(self, event_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return self.service.events().update(calendarId=self.calendar_id, eventId=event_id, body=body).execute()
+
+    def patch_event(self, event_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        return self.service.events().patch(calendarId=self.calendar_id, eventId=event_id, body=patch).execute()
+
+    def delete_event(self, event_id: str) -> None:
+        self.service.events().delete(calendarId=self.calendar_id, eventId=event_id).execute()
+
+    def list_events(self, start_time: datetime, end_time: datetime, page_size: int,
+                    page_token: Optional[str] = None) -> Dict[str, Any]:
+        return self.service.events().list(
+            calendarId=self.calendar_id,
+            timeMin=to_rfc3339(start_time),
+            timeMax=to_rfc3339(end_time),
+            singleEvents=True,
+            orderBy='startTime',
+            maxResults=page_size,
+            pageToken=page_token
+        ).execute()
+
+    def list_changes(self, sync_token: Optional[str] = None, page_token: Optional[str] = None) -> Dict[str, Any]:
+        from googleapiclient.errors import HttpError
+
+        params = {'calendarId': self.calendar_id, 'singleEvents': True}
+        if sync_token:
+            params['syncToken'] = sync_token
+        if page_token:
+            params['pageToken'] = page_token
+
+        try:
+            return self.service.events().list(**params).execute()
+        except HttpError as e:
+            # 410 Gone means the sync token expired
+            if e.resp.status == 410:
+                raise SyncTokenExpired() from e
+            raise
+
+    def query_busy(self, start_time: datetime, end_time: datetime,
+                   calendar_ids: Sequence[str]) -> Dict[str, List[Dict[str, datetime]]]:
+        calendar_ids = list(calendar_ids)
+        busy = {}
+        for offset in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+            result = self.service.freebusy().query(body=build_freebusy_query(
+                start_time, end_time, calendar_ids[offset:offset + FREEBUSY_MAX_CALENDARS], self.settings
+            )).execute()
+            busy.update(parse_freebusy_response(result))
+        return busy
+
+    def execute_batch(self, operations: List[BatchOperation]) -> List[Dict[str, Any]]:
+        """Send operations in batch HTTP calls of CALENDAR_BATCH_SIZE and report each item's outcome.
+
+        A failing item never aborts the batch; its result carries the error instead of the event.
+        If a batch call itself fails partway, the items it already answered keep their
+        outcome and only the unanswered ones are reported as failed.
+        """
+        requests = [self._build_request(operation) for operation in operations]
+        results: List[Dict[str, Any]] = [{} for _ in requests]
+
+        def record(index, request_id, response, exception):
+            if exception is not None:
+                results[index] = {'index': index, 'success': False, 'error': str(exception)}
+            else:
+                results[index] = {'index': index, 'success': True, 'event': response}
+
+        batch_size = self.settings.CALENDAR_BATCH_SIZE
+        for offset in range(0, len(requests), batch_size):
+            chunk = range(offset, min(offset + batch_size, len(requests)))
+            batch = self.service.new_batch_http_request()
+            for index in chunk:
+                batch.add(requests[index], callback=partial(record, index))
+            try:
+                batch.execute()
+            except Exception as e:
+                for index in chunk:
+                    if not results[index]:
+                        results[index] = {'index': index, 'success': False, 'error': str(e)}
+
+        return results
+
+    def _build_request(self, operation: BatchOperation):
+        events = self.service.events()
+        kind = operation[0]
+        if kind == 'insert':
+            return events.insert(calendarId=self.calendar_id, body=operation[1])
+        if kind == 'patch':
+            return events.patch(calendarId=self.calendar_id, eventId=operation[1], body=operation[2])
+        if kind == 'delete':
+            return events.delete(calendarId=self.calendar_id, eventId=operation[1])
+        raise ValueError(f"Unknown batch operation: {kind}")
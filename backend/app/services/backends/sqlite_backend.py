@@ -0,0 +1,234 @@
+from datetime import datetime, timezone
+import json
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from ...utils.event_times import event_bounds, to_utc
+from ...utils.free_slots import merge_intervals
+from .base import BatchOperation, CalendarBackend, SyncTokenExpired
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    transparent INTEGER NOT NULL DEFAULT 0,
+    cancelled INTEGER NOT NULL DEFAULT 0,
+    seq INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS events_by_start ON events (calendar_id, start_ts);
+CREATE INDEX IF NOT EXISTS events_by_seq ON events (calendar_id, seq);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+# Sequence number of a calendar's last clear(); sync tokens from before it are expired
+CLEARED_SEQ_KEY = 'cleared_seq:{}'
+
+
+class SQLiteCalendarBackend(CalendarBackend):
+    """Local calendar store in SQLite, for offline use, load tests and persisting the event mirror.
+
+    Range queries use the (calendar_id, start_ts) index. Because an event can start
+    before the window and still overlap it, the scan starts at window start minus the
+    longest event duration seen so far, which keeps it bounded without an R-tree.
+    Every write bumps a sequence number and deletes leave a tombstone, so the sequence
+    doubles as the sync token for incremental syncs.
+    """
+
+    def __init__(self, path: str = ':memory:', calendar_id: str = 'primary'):
+        self.calendar_id = calendar_id
+        self._lock = threading.RLock()
+        self._in_batch = False
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        # A clear() can delete the newest rows, so its recorded sequence counts towards the high-water mark
+        self._seq = self._conn.execute(
+            "SELECT MAX(COALESCE((SELECT MAX(seq) FROM events), 0), "
+            "COALESCE((SELECT MAX(CAST(value AS INTEGER)) FROM meta WHERE key LIKE 'cleared_seq:%'), 0))"
+        ).fetchone()[0]
+        self._max_span = self._conn.execute(
+            "SELECT COALESCE(MAX(end_ts - start_ts), 0) FROM events WHERE cancelled = 0"
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _commit(self) -> None:
+        if not self._in_batch:
+            self._conn.commit()
+
+    def _write(self, event: Dict[str, Any], calendar_id: Optional[str] = None) -> Dict[str, Any]:
+        """Upsert an event resource (or a tombstone for a cancelled one) under a new sequence number."""
+        self._seq += 1
+        if event.get('status') == 'cancelled':
+            self._conn.execute(
+                "UPDATE events SET cancelled = 1, seq = ?, body = ? WHERE calendar_id = ? AND id = ?",
+                (self._seq, json.dumps({'id': event['id'], 'status': 'cancelled'}), calendar_id or self.calendar_id, event['id'])
+            )
+            return event
+
+        start, end = event_bounds(event)
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        self._max_span = max(self._max_span, end_ts - start_ts)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO events (calendar_id, id, start_ts, end_ts, transparent, cancelled, seq, body) "
+            "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+            (
+                calendar_id or self.calendar_id, event['id'], start_ts, end_ts,
+                int(event.get('transparency') == 'transparent'), self._seq, json.dumps(event)
+            )
+        )
+        return event
+
+    def insert_event(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        event = dict(body, id=body.get('id') or uuid.uuid4().hex, status='confirmed',
+                     updated=datetime.now(timezone.utc).isoformat())
+        with self._lock:
+            self._write(event)
+            self._commit()
+        return event
+
+    def get_event(self, event_id: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM events WHERE calendar_id = ? AND id = ? AND cancelled = 0",
+                (self.calendar_id, event_id)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Event {event_id} not found")
+        return json.loads(row[0])
+
+    def update_event(self, event_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.get_event(event_id)
+            event = dict(body, id=event_id, status='confirmed', updated=datetime.now(timezone.utc).isoformat())
+            self._write(event)
+            self._commit()
+        return event
+
+    def patch_event(self, event_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            event = dict(self.get_event(event_id), **patch)
+            event['updated'] = datetime.now(timezone.utc).isoformat()
+            self._write(event)
+            self._commit()
+        return event
+
+    def delete_event(self, event_id: str) -> None:
+        with self._lock:
+            self.get_event(event_id)
+            self._write({'id': event_id, 'status': 'cancelled'})
+            self._commit()
+
+    def _range_rows(self, calendar_id: str, start_time: datetime, end_time: datetime, columns: str,
+                    limit: int = -1, offset: int = 0) -> List[tuple]:
+        start_ts, end_ts = to_utc(start_time).timestamp(), to_utc(end_time).timestamp()
+        return self._conn.execute(
+            f"SELECT {columns} FROM events "
+            "WHERE calendar_id = ? AND start_ts >= ? AND start_ts < ? AND end_ts > ? AND cancelled = 0 "
+            "ORDER BY start_ts LIMIT ? OFFSET ?",
+            (calendar_id, start_ts - self._max_span, end_ts, start_ts, limit, offset)
+        ).fetchall()
+
+    def list_events(self, start_time: datetime, end_time: datetime, page_size: int,
+                    page_token: Optional[str] = None) -> Dict[str, Any]:
+        offset = int(page_token or 0)
+        with self._lock:
+            # Fetch one extra row to learn whether another page follows
+            rows = self._range_rows(self.calendar_id, start_time, end_time, 'body', page_size + 1, offset)
+
+        page = {'items': [json.loads(row[0]) for row in rows[:page_size]]}
+        if len(rows) > page_size:
+            page['nextPageToken'] = str(offset + page_size)
+        return page
+
+    def list_changes(self, sync_token: Optional[str] = None, page_token: Optional[str] = None,
+                     page_size: int = 1000) -> Dict[str, Any]:
+        after = int(page_token or sync_token or 0)
+        with self._lock:
+            cleared_seq = int(self.get_meta(CLEARED_SEQ_KEY.format(self.calendar_id)) or 0)
+            # A token from before the last clear would miss the events it dropped without tombstones
+            if sync_token is not None and not cleared_seq <= int(sync_token) <= self._seq:
+                raise SyncTokenExpired()
+            # A full sync skips tombstones; an incremental one must report them
+            rows = self._conn.execute(
+                "SELECT seq, body FROM events WHERE calendar_id = ? AND seq > ? "
+                + ("" if sync_token else "AND cancelled = 0 ")
+                + "ORDER BY seq LIMIT ?",
+                (self.calendar_id, after, page_size + 1)
+            ).fetchall()
+            current_seq = self._seq
+
+        page = {'items': [json.loads(row[1]) for row in rows[:page_size]]}
+        if len(rows) > page_size:
+            page['nextPageToken'] = str(rows[page_size - 1][0])
+        else:
+            page['nextSyncToken'] = str(current_seq)
+        return page
+
+    def query_busy(self, start_time: datetime, end_time: datetime,
+                   calendar_ids: Sequence[str]) -> Dict[str, List[Dict[str, datetime]]]:
+        busy = {}
+        with self._lock:
+            for calendar_id in calendar_ids:
+                rows = self._range_rows(calendar_id, start_time, end_time, 'start_ts, end_ts, transparent')
+                intervals = [
+                    (datetime.fromtimestamp(start_ts, timezone.utc), datetime.fromtimestamp(end_ts, timezone.utc))
+                    for start_ts, end_ts, transparent in rows if not transparent
+                ]
+                busy[calendar_id] = [{'start': start, 'end': end} for start, end in merge_intervals(intervals)]
+        return busy
+
+    def execute_batch(self, operations: List[BatchOperation]) -> List[Dict[str, Any]]:
+        """Run every operation inside a single transaction."""
+        with self._lock:
+            self._in_batch = True
+            try:
+                results = super().execute_batch(operations)
+            finally:
+                self._in_batch = False
+                self._conn.commit()
+        return results
+
+    def put_events(self, events: Iterable[Dict[str, Any]], calendar_id: Optional[str] = None) -> None:
+        """Store events exactly as given (ids included), e.g. changes pulled from another backend."""
+        with self._lock:
+            for event in events:
+                self._write(event, calendar_id)
+            self._conn.commit()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]) -> None:
+        with self._lock:
+            if value is None:
+                self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+            else:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def clear(self, calendar_id: Optional[str] = None) -> None:
+        """Drop every event of a calendar.
+
+        The current sequence number is recorded in meta, so the counter stays monotonic
+        across restarts and sync tokens issued before the clear raise SyncTokenExpired.
+        """
+        calendar_id = calendar_id or self.calendar_id
+        with self._lock:
+            # Its own sequence number tells tokens issued before the clear from those after it
+            self._seq += 1
+            self._conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (CLEARED_SEQ_KEY.format(calendar_id), str(self._seq))
+            )
+            self._conn.commit()
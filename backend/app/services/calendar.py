@@ -1,189 +1,307 @@
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from datetime import datetime, timedelta
-import os.path
-import pickle
-from typing import List, Optional, Dict, Any
+from datetime import datetime, time, timedelta
+from typing import Iterator, List, Optional, Dict, Any, Sequence, Tuple
+from zoneinfo import ZoneInfo
 from ..config import get_settings
+from .event_mirror import EventMirror
+from .backends import BatchOperation, CalendarBackend, create_backend
+from .backends.sqlite_backend import SQLiteCalendarBackend
+from ..utils.event_times import event_bounds
+from ..utils.availability import Availability
+from ..utils.availability_grid import find_common_free
+from ..utils.free_slots import find_free_intervals, merge_intervals
+
+
+def build_event_body(event_data: Dict[str, Any], settings) -> Dict[str, Any]:
+    """Build a Google Calendar event resource from our flat event data."""
+    # Ensure we have required fields
+    if not event_data.get('title'):
+        event_data['title'] = "Untitled Event"
+    
+    if not event_data.get('start_time'):
+        event_data['start_time'] = datetime.now()
+        
+    if not event_data.get('end_time'):
+        event_data['end_time'] = event_data['start_time'] + timedelta(minutes=60)
+
+    event = {
+        'summary': event_data['title'],
+        'start': {
+            'dateTime': event_data['start_time'].isoformat(),
+            'timeZone': settings.DEFAULT_TIMEZONE,
+        },
+        'end': {
+            'dateTime': event_data['end_time'].isoformat(),
+            'timeZone': settings.DEFAULT_TIMEZONE,
+        },
+        'description': event_data.get('description', ''),
+        'location': event_data.get('location', ''),
+        'attendees': [{'email': email} for email in (event_data.get('attendees') or [])],
+        'reminders': {
+            'useDefault': False,
+            'overrides': [
+                {'method': 'email', 'minutes': settings.DEFAULT_REMINDER_MINUTES},
+                {'method': 'popup', 'minutes': settings.DEFAULT_REMINDER_MINUTES},
+            ],
+        },
+    }
+
+    return event
+
+
+def merge_event_update(event: Dict[str, Any], event_data: Dict[str, Any], settings) -> Dict[str, Any]:
+    """Apply our flat update fields (title, start_time, end_time) to an event resource."""
+    start_time = event_data.get('start_time', event['start']['dateTime'])
+    end_time = event_data.get('end_time', event['end']['dateTime'])
+
+    # Update event fields
+    event.update({
+        'summary': event_data.get('title', event['summary']),
+        'start': {
+            'dateTime': start_time.isoformat() if isinstance(start_time, datetime) else start_time,
+            'timeZone': settings.DEFAULT_TIMEZONE,
+        },
+        'end': {
+            'dateTime': end_time.isoformat() if isinstance(end_time, datetime) else end_time,
+            'timeZone': settings.DEFAULT_TIMEZONE,
+        },
+    })
+
+    return event
+
+
+def build_event_patch(event_data: Dict[str, Any], settings) -> Dict[str, Any]:
+    """Build a partial event resource holding only the fields present in event_data."""
+    patch = {}
+    if event_data.get('title'):
+        patch['summary'] = event_data['title']
+    for field, key in (('start_time', 'start'), ('end_time', 'end')):
+        if event_data.get(field):
+            value = event_data[field]
+            patch[key] = {
+                'dateTime': value.isoformat() if isinstance(value, datetime) else value,
+                'timeZone': settings.DEFAULT_TIMEZONE,
+            }
+    for field in ('description', 'location'):
+        if event_data.get(field) is not None:
+            patch[field] = event_data[field]
+    return patch
+
+
+def busy_from_events(events: List[Dict[str, Any]]) -> List[Dict[str, datetime]]:
+    """Merge the blocking events of a listing into free/busy-style intervals."""
+    intervals = [event_bounds(event) for event in events if event.get('transparency') != 'transparent']
+    return [{'start': start, 'end': end} for start, end in merge_intervals(intervals)]
 
-SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 class CalendarService:
-    def __init__(self):
+    def __init__(self, backend: Optional[CalendarBackend] = None):
         self.settings = get_settings()
-        self.creds = None
-        self.service = None
-        self._authenticate()
-
-    def _authenticate(self):
-        """Handle Google Calendar authentication."""
-        # Check if we have valid credentials
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                self.creds = pickle.load(token)
-
-        # If there are no (valid) credentials available, let the user log in
-        if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
-            else:
-                # Check if we have client credentials
-                if not self.settings.GOOGLE_CLIENT_ID or not self.settings.GOOGLE_CLIENT_SECRET:
-                    raise Exception("Google Calendar credentials not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in your .env file.")
-                
-                flow = InstalledAppFlow.from_client_config(
-                    {
-                        "installed": {
-                            "client_id": self.settings.GOOGLE_CLIENT_ID,
-                            "client_secret": self.settings.GOOGLE_CLIENT_SECRET,
-                            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                            "token_uri": "https://oauth2.googleapis.com/token",
-                            "redirect_uris": ["http://localhost:8080"]
-                        }
-                    },
-                    SCOPES
-                )
-                self.creds = flow.run_local_server(port=8080)
-
-            # Save the credentials for the next run
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(self.creds, token)
-
-        self.service = build('calendar', 'v3', credentials=self.creds)
+        self.backend = backend or create_backend()
+        store = None
+        if self.settings.MIRROR_DB_PATH:
+            store = SQLiteCalendarBackend(self.settings.MIRROR_DB_PATH, calendar_id=self.backend.calendar_id)
+        self.mirror = EventMirror(self.backend, store=store)
 
     def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new calendar event in Google Calendar."""
-        # Ensure we have required fields
-        if not event_data.get('title'):
-            event_data['title'] = "Untitled Event"
-        
-        if not event_data.get('start_time'):
-            event_data['start_time'] = datetime.now()
-            
-        if not event_data.get('end_time'):
-            event_data['end_time'] = event_data['start_time'] + timedelta(minutes=60)
-
-        event = {
-            'summary': event_data['title'],
-            'start': {
-                'dateTime': event_data['start_time'].isoformat(),
-                'timeZone': self.settings.DEFAULT_TIMEZONE,
-            },
-            'end': {
-                'dateTime': event_data['end_time'].isoformat(),
-                'timeZone': self.settings.DEFAULT_TIMEZONE,
-            },
-            'description': event_data.get('description', ''),
-            'location': event_data.get('location', ''),
-            'attendees': [{'email': email} for email in (event_data.get('attendees') or [])],
-            'reminders': {
-                'useDefault': False,
-                'overrides': [
-                    {'method': 'email', 'minutes': self.settings.DEFAULT_REMINDER_MINUTES},
-                    {'method': 'popup', 'minutes': self.settings.DEFAULT_REMINDER_MINUTES},
-                ],
-            },
-        }
-
-        created_event = self.service.events().insert(calendarId='primary', body=event).execute()
+        """Create a new calendar event."""
+        event = build_event_body(event_data, self.settings)
+        created_event = self.backend.insert_event(event)
+        self.mirror.upsert(created_event)
         return created_event
 
+    def iter_events(self, start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
+        """Yield every event overlapping [start_time, end_time) in start order.
+
+        Follows nextPageToken, yielding each page as it arrives so callers can stream
+        long ranges without holding them in memory.
+        """
+        if self.mirror.is_warm:
+            yield from self.mirror.events_between(start_time, end_time)
+            return
+
+        page_token = None
+        while True:
+            events_result = self.backend.list_events(
+                start_time,
+                end_time,
+                self.settings.CALENDAR_PAGE_SIZE,
+                page_token
+            )
+
+            yield from events_result.get('items', [])
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
+
     def get_daily_agenda(self, date: datetime) -> List[Dict[str, Any]]:
-        """Get all events for a specific day from Google Calendar."""
+        """Get all events for a specific day."""
         start_time = date.replace(hour=0, minute=0, second=0, microsecond=0)
         end_time = start_time + timedelta(days=1)
 
-        events_result = self.service.events().list(
-            calendarId='primary',
-            timeMin=start_time.isoformat() + 'Z',
-            timeMax=end_time.isoformat() + 'Z',
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-
-        return events_result.get('items', [])
+        return list(self.iter_events(start_time, end_time))
 
     def check_conflicts(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """Check for conflicting events in the given time range."""
-        events_result = self.service.events().list(
-            calendarId='primary',
-            timeMin=start_time.isoformat() + 'Z',
-            timeMax=end_time.isoformat() + 'Z',
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+        return list(self.iter_events(start_time, end_time))
+
+    def get_busy_intervals(self, start_time: datetime, end_time: datetime,
+                           calendar_ids: Optional[Sequence[str]] = None) -> Dict[str, List[Dict[str, datetime]]]:
+        """Get busy intervals per calendar without downloading event bodies.
 
-        return events_result.get('items', [])
+        The primary calendar is answered from the mirror when it is warm; anything else
+        goes through one backend free/busy query covering every requested calendar.
+        """
+        calendar_ids = list(calendar_ids or ['primary'])
+        if calendar_ids == ['primary'] and self.mirror.is_warm:
+            return {'primary': busy_from_events(self.mirror.events_between(start_time, end_time))}
+
+        return self.backend.query_busy(start_time, end_time, calendar_ids)
+
+    def get_event(self, event_id: str) -> Dict[str, Any]:
+        """Get a single calendar event, preferring the local mirror."""
+        event = self.mirror.get(event_id)
+        if event is None:
+            event = self.backend.get_event(event_id)
+        return event
 
     def update_event(self, event_id: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing calendar event."""
-        event = self.service.events().get(calendarId='primary', eventId=event_id).execute()
+        event = self.backend.get_event(event_id)
         
-        # Update event fields
-        event.update({
-            'summary': event_data.get('title', event['summary']),
-            'start': {
-                'dateTime': event_data.get('start_time', event['start']['dateTime']),
-                'timeZone': self.settings.DEFAULT_TIMEZONE,
-            },
-            'end': {
-                'dateTime': event_data.get('end_time', event['end']['dateTime']),
-                'timeZone': self.settings.DEFAULT_TIMEZONE,
-            },
-        })
-
-        updated_event = self.service.events().update(
-            calendarId='primary',
-            eventId=event_id,
-            body=event
-        ).execute()
+        event = merge_event_update(event, event_data, self.settings)
+
+        updated_event = self.backend.update_event(event_id, event)
 
+        self.mirror.upsert(updated_event)
         return updated_event
 
     def delete_event(self, event_id: str) -> None:
-        """Delete a calendar event from Google Calendar."""
-        self.service.events().delete(calendarId='primary', eventId=event_id).execute()
+        """Delete a calendar event."""
+        self.backend.delete_event(event_id)
+        self.mirror.remove(event_id)
+
+    def batch_create_events(self, events_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many events using the backend's batch support (Google batch HTTP requests)."""
+        results = self.backend.execute_batch([
+            ('insert', build_event_body(event_data, self.settings))
+            for event_data in events_data
+        ])
+        for result in results:
+            if result['success']:
+                self.mirror.upsert(result['event'])
+        return results
+
+    def batch_update_events(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Patch many events in batches. Each update carries an 'event_id' plus the fields to change."""
+        results = self.backend.execute_batch([
+            ('patch', update['event_id'], build_event_patch(update, self.settings))
+            for update in updates
+        ])
+        for update, result in zip(updates, results):
+            result['event_id'] = update['event_id']
+            if result['success']:
+                self.mirror.upsert(result['event'])
+        return results
+
+    def batch_delete_events(self, event_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete many events in batches."""
+        results = self.backend.execute_batch([('delete', event_id) for event_id in event_ids])
+        for event_id, result in zip(event_ids, results):
+            result['event_id'] = event_id
+            result.pop('event', None)
+            if result['success']:
+                self.mirror.remove(event_id)
+        return results
+
+    def execute_batch(self, operations: List[BatchOperation]) -> List[Dict[str, Any]]:
+        """Run a mix of insert, patch and delete operations in batches and mirror the outcome."""
+        results = self.backend.execute_batch(operations)
+        for operation, result in zip(operations, results):
+            if not result['success']:
+                continue
+            if operation[0] == 'delete':
+                result.pop('event', None)
+                self.mirror.remove(operation[1])
+            else:
+                self.mirror.upsert(result['event'])
+        return results
+
+    def find_free_intervals(self, start_time: datetime, end_time: datetime, duration_minutes: int,
+                            working_hours: Optional[Tuple[time, time]] = None,
+                            working_days: Optional[Sequence[int]] = None,
+                            buffer_minutes: int = 0,
+                            ignore_event_ids: Sequence[str] = ()) -> List[Dict[str, datetime]]:
+        """Find every free gap of at least duration_minutes across a multi-day window.
+
+        Working hours are wall-clock times in DEFAULT_TIMEZONE. All-day events count as
+        busy; events marked transparent ("free") and those in ignore_event_ids do not.
+        """
+        return find_free_intervals(
+            self._busy_bounds(start_time, end_time, buffer_minutes, ignore_event_ids),
+            start_time, end_time, duration_minutes,
+            working_hours=working_hours,
+            working_days=working_days,
+            buffer_minutes=buffer_minutes,
+            tz=ZoneInfo(self.settings.DEFAULT_TIMEZONE)
+        )
+
+    def free_time(self, start_time: datetime, end_time: datetime,
+                  working_hours: Optional[Tuple[time, time]] = None,
+                  working_days: Optional[Sequence[int]] = None,
+                  buffer_minutes: int = 0,
+                  ignore_event_ids: Sequence[str] = ()) -> Availability:
+        """The free time in [start_time, end_time) as an Availability, under the rules of find_free_intervals."""
+        return Availability.from_busy(
+            self._busy_bounds(start_time, end_time, buffer_minutes, ignore_event_ids),
+            start_time, end_time,
+            working_hours=working_hours,
+            working_days=working_days,
+            buffer_minutes=buffer_minutes,
+            tz=ZoneInfo(self.settings.DEFAULT_TIMEZONE)
+        )
+
+    def _busy_bounds(self, start_time: datetime, end_time: datetime, buffer_minutes: int,
+                     ignore_event_ids: Sequence[str]) -> List[Tuple[datetime, datetime]]:
+        buffer = timedelta(minutes=buffer_minutes)
+        return [
+            event_bounds(event)
+            for event in self.iter_events(start_time - buffer, end_time + buffer)
+            if event.get('transparency') != 'transparent' and event.get('id') not in ignore_event_ids
+        ]
+
+    def find_meeting_times(self, calendar_ids: Sequence[str], start_time: datetime, end_time: datetime,
+                           duration_minutes: int, working_hours: Optional[Tuple[time, time]] = None,
+                           working_days: Optional[Sequence[int]] = None,
+                           min_attendees: Optional[int] = None) -> List[Dict[str, datetime]]:
+        """Find gaps of at least duration_minutes when every calendar (or min_attendees of them) is free.
+
+        Busy time comes from one free/busy query for all calendars (the primary calendar
+        alone is answered by the mirror). When everyone must attend, the intervals are
+        merged and swept like find_free_intervals; a quorum of min_attendees is counted
+        on a MEETING_GRID_MINUTES grid instead, since merging cannot express it.
+        """
+        busy = self.get_busy_intervals(start_time, end_time, calendar_ids)
+        if min_attendees is None or min_attendees >= len(busy):
+            return find_free_intervals(
+                [(interval['start'], interval['end']) for intervals in busy.values() for interval in intervals],
+                start_time, end_time, duration_minutes,
+                working_hours=working_hours,
+                working_days=working_days,
+                tz=ZoneInfo(self.settings.DEFAULT_TIMEZONE)
+            )
+        return find_common_free(
+            busy, start_time, end_time, duration_minutes,
+            resolution_minutes=self.settings.MEETING_GRID_MINUTES,
+            working_hours=working_hours,
+            working_days=working_days,
+            tz=ZoneInfo(self.settings.DEFAULT_TIMEZONE),
+            min_attendees=min_attendees
+        )
 
     def find_free_slots(self, date: datetime, duration_minutes: int) -> List[Dict[str, datetime]]:
-        """Find free time slots for a given duration on a specific date."""
+        """Find free gaps of at least duration_minutes on a specific date."""
         start_time = date.replace(hour=0, minute=0, second=0, microsecond=0)
         end_time = start_time + timedelta(days=1)
-        
-        # Get all events for the day
-        events = self.get_daily_agenda(date)
-        
-        # Convert events to time slots
-        busy_slots = []
-        for event in events:
-            start = datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(event['end']['dateTime'].replace('Z', '+00:00'))
-            busy_slots.append((start, end))
-        
-        # Find free slots
-        free_slots = []
-        current_time = start_time
-        
-        while current_time < end_time:
-            slot_end = current_time + timedelta(minutes=duration_minutes)
-            if slot_end > end_time:
-                break
-                
-            is_free = True
-            for busy_start, busy_end in busy_slots:
-                if (current_time < busy_end and slot_end > busy_start):
-                    is_free = False
-                    current_time = busy_end
-                    break
-            
-            if is_free:
-                free_slots.append({
-                    'start': current_time,
-                    'end': slot_end
-                })
-                current_time = slot_end
-            else:
-                current_time += timedelta(minutes=15)
-        
-        return free_slots 
\ No newline at end of file
+
+        return self.find_free_intervals(start_time, end_time, duration_minutes)
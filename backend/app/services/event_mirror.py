@@ -0,0 +1,172 @@
+from datetime import datetime
+import threading
+import logging
+from typing import List, Optional, Dict, Any
+from ..utils.event_times import event_bounds
+from ..utils.interval_index import IntervalIndex
+from .backends.base import CalendarBackend, SyncTokenExpired
+
+SYNC_TOKEN_KEY = 'mirror_sync_token:{}'
+
+logger = logging.getLogger(__name__)
+
+
+class EventMirror:
+    """In-memory copy of a calendar kept current through incremental sync.
+
+    The first sync lists every event and stores the returned nextSyncToken.
+    Subsequent syncs pass that token so the backend only returns what changed
+    since the previous call, including cancelled (deleted) events.
+
+    With a store (a SQLite backend) the mirrored events and sync token are persisted,
+    so a restarted process starts warm and resumes with an incremental sync.
+    """
+
+    def __init__(self, backend: CalendarBackend, store=None):
+        self._backend = backend
+        self._store = store
+        self.calendar_id = backend.calendar_id
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self._sync_token: Optional[str] = None
+        self._index: Optional[IntervalIndex] = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.last_synced: Optional[datetime] = None
+        if store is not None:
+            self._load_from_store()
+
+    @property
+    def is_warm(self) -> bool:
+        """True once a full sync has completed and reads can be served locally."""
+        return self._sync_token is not None
+
+    def sync(self) -> int:
+        """Pull changes since the last sync and return the number of events applied."""
+        try:
+            return self._sync(self._sync_token)
+        except SyncTokenExpired:
+            logger.info("Sync token for %s expired, running full sync", self.calendar_id)
+            return self._sync(None)
+
+    def _sync(self, sync_token: Optional[str]) -> int:
+        changes: List[Dict[str, Any]] = []
+        page_token = None
+
+        while True:
+            result = self._backend.list_changes(sync_token, page_token)
+            changes.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                next_sync_token = result.get('nextSyncToken')
+                break
+
+        with self._lock:
+            if sync_token is None:
+                self._events = {}
+            for event in changes:
+                self._apply(event)
+            self._index = None
+            self._sync_token = next_sync_token
+            self.last_synced = datetime.now()
+
+        if self._store is not None:
+            self._save_to_store(changes, full=sync_token is None)
+
+        return len(changes)
+
+    def _load_from_store(self) -> None:
+        sync_token = self._store.get_meta(SYNC_TOKEN_KEY.format(self.calendar_id))
+        if sync_token is None:
+            return
+
+        events: Dict[str, Dict[str, Any]] = {}
+        page_token = None
+        while True:
+            result = self._store.list_changes(None, page_token)
+            events.update((event['id'], event) for event in result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
+
+        with self._lock:
+            self._events = events
+            self._index = None
+            self._sync_token = sync_token
+
+    def _save_to_store(self, changes: List[Dict[str, Any]], full: bool) -> None:
+        if full:
+            self._store.clear()
+        self._store.put_events(changes)
+        self._store.set_meta(SYNC_TOKEN_KEY.format(self.calendar_id), self._sync_token)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        if event.get('status') == 'cancelled':
+            self._events.pop(event['id'], None)
+        elif 'start' in event and 'end' in event:
+            self._events[event['id']] = event
+
+    def upsert(self, event: Dict[str, Any]) -> None:
+        """Record an event we just wrote upstream so reads see it before the next sync."""
+        with self._lock:
+            self._apply(event)
+            self._index = None
+
+    def remove(self, event_id: str) -> None:
+        """Forget an event we just deleted upstream."""
+        with self._lock:
+            self._events.pop(event_id, None)
+            self._index = None
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._events.get(event_id)
+
+    def index(self) -> IntervalIndex:
+        """Return the interval index over mirrored events, rebuilding it after changes."""
+        with self._lock:
+            if self._index is None:
+                self._index = IntervalIndex(
+                    (*event_bounds(event), event) for event in self._events.values()
+                )
+            return self._index
+
+    def events_between(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        """Return events overlapping [start_time, end_time), ordered by start time."""
+        return self.index().overlapping(start_time, end_time)
+
+    def start_background_refresh(self, interval_seconds: int) -> None:
+        """Sync once immediately, then every interval_seconds on a daemon thread."""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval_seconds,),
+            name=f"event-mirror-{self.calendar_id}",
+            daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def _refresh_loop(self, interval_seconds: int) -> None:
+        waiting = False
+        while not self._stop.is_set():
+            if not self._backend.can_sync_unattended():
+                # Signing in is left to the first request; keep checking until it has happened
+                if not waiting:
+                    logger.info("Background sync of %s waiting for calendar credentials", self.calendar_id)
+                    waiting = True
+            else:
+                waiting = False
+                try:
+                    self.sync()
+                except Exception:
+                    logger.exception("Background sync of %s failed", self.calendar_id)
+            self._stop.wait(interval_seconds)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+from typing import Any, AsyncIterator, Dict, Optional
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class UsageStats:
+    """Running token and latency totals for LLM calls, as reported by the API's usage metadata."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+        self.latency_seconds = 0.0
+
+    def record(self, prompt_tokens: int, cached_tokens: int, output_tokens: int, latency_seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.output_tokens += output_tokens
+            self.latency_seconds += latency_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.requests or 1
+            return {
+                'requests': self.requests,
+                'prompt_tokens': self.prompt_tokens,
+                'cached_prompt_tokens': self.cached_tokens,
+                'output_tokens': self.output_tokens,
+                'prompt_tokens_per_request': round(self.prompt_tokens / requests, 1),
+                'uncached_prompt_tokens_per_request': round((self.prompt_tokens - self.cached_tokens) / requests, 1),
+                'output_tokens_per_request': round(self.output_tokens / requests, 1),
+                'cached_share': round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+                'mean_latency_ms': round(self.latency_seconds / requests * 1000, 1)
+            }
+
+
+class AsyncGeminiClient:
+    """Calls Gemini's streamGenerateContent REST endpoint over a pooled httpx.AsyncClient.
+
+    A semaphore caps how many calls are in flight at once, so a burst of requests queues
+    here instead of piling onto the API. Cancelling a call (e.g. because its deadline
+    passed or the HTTP client went away) closes the upstream request and frees its slot.
+    The system instruction is sent unchanged with every call so the provider can cache
+    it as a shared prefix; token usage of each call is added to usage.
+    """
+
+    def __init__(self, api_key: str, model_name: str, base_url: str = GEMINI_API_BASE,
+                 max_concurrency: int = 16, timeout: Optional[float] = None,
+                 generation_config: Optional[Dict[str, Any]] = None,
+                 system_instruction: Optional[str] = None):
+        self.model_name = model_name
+        self.generation_config = generation_config or {}
+        self.system_instruction = system_instruction
+        self.usage = UsageStats()
+        self._api_key = api_key
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _body(self, prompt: str, generation_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        body = {
+            'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+            'generationConfig': {**self.generation_config, **(generation_config or {})}
+        }
+        if self.system_instruction:
+            body['systemInstruction'] = {'parts': [{'text': self.system_instruction}]}
+        return body
+
+    def _record_usage(self, usage: Dict[str, Any], latency: float) -> None:
+        self.usage.record(
+            usage.get('promptTokenCount', 0), usage.get('cachedContentTokenCount', 0),
+            usage.get('candidatesTokenCount', 0), latency
+        )
+
+    @staticmethod
+    def _candidate_text(result: Dict[str, Any]) -> str:
+        candidates = result.get('candidates') or []
+        if not candidates:
+            return ''
+        return ''.join(part.get('text', '') for part in candidates[0].get('content', {}).get('parts', []))
+
+    async def stream(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Yield the first candidate's text piece by piece as streamGenerateContent produces it.
+
+        Closing the iterator early (wrap it in contextlib.aclosing) closes the connection,
+        which stops the generation and frees the concurrency slot.
+        """
+        async with self._semaphore:
+            started = time.perf_counter()
+            usage: Dict[str, Any] = {}
+            try:
+                async with self._client.stream(
+                    'POST', f'/models/{self.model_name}:streamGenerateContent',
+                    params={'key': self._api_key, 'alt': 'sse'},
+                    json=self._body(prompt, generation_config)
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith('data:'):
+                            continue
+                        event = json.loads(line[len('data:'):])
+                        usage = event.get('usageMetadata', usage)
+                        text = self._candidate_text(event)
+                        if text:
+                            yield text
+            finally:
+                self._record_usage(usage, time.perf_counter() - started)
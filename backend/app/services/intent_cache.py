@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from datetime import datetime
+import re
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s.!?]+$')
+
+# Dates spelled out in full ("2025-03-04", "3/4", "march 4th", "4 march") pin an utterance
+# to a calendar day, so its parse does not depend on when it was typed.
+_MONTHS = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*'
+_EXPLICIT_DATE = re.compile(
+    r'\b\d{4}-\d{1,2}-\d{1,2}\b'
+    r'|\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b'
+    rf'|\b{_MONTHS}\.? \d{{1,2}}(?:st|nd|rd|th)?\b'
+    rf'|\b\d{{1,2}}(?:st|nd|rd|th)? (?:of )?{_MONTHS}\b'
+)
+
+_TIME_FIELDS = ('start_time', 'end_time')
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different spellings share a cache entry."""
+    return _TRAILING_PUNCTUATION.sub('', _WHITESPACE.sub(' ', text.strip().lower()))
+
+
+def has_explicit_date(text: str) -> bool:
+    return _EXPLICIT_DATE.search(text) is not None
+
+
+class IntentCache:
+    """Bounded LRU cache of parsed intents with a time-to-live.
+
+    Entries are keyed by the normalized utterance plus the reference time quantized to
+    (weekday, bucket of the day), which is what relative phrases like "next friday" or
+    "this afternoon" depend on. Unless the utterance names an explicit date, start and
+    end times are stored as offsets from the reference day's midnight and re-anchored
+    to the day of each hit, so "standup tomorrow at 9am" parsed on one Tuesday is still
+    correct on the next one.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 86400, bucket_minutes: int = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.bucket_minutes = bucket_minutes
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, text: str, reference_time: datetime) -> Hashable:
+        normalized = normalize_text(text)
+        if has_explicit_date(normalized):
+            return (normalized,)
+        minute_of_day = reference_time.hour * 60 + reference_time.minute
+        return (normalized, reference_time.weekday(), minute_of_day // self.bucket_minutes)
+
+    def get(self, text: str, reference_time: datetime) -> Optional[Dict[str, Any]]:
+        """Return the cached intent fields re-anchored to reference_time, or None on a miss."""
+        key = self.key(text, reference_time)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            stored = entry[1]
+        return self._anchor(stored, reference_time) if len(key) > 1 else dict(stored)
+
+    def put(self, text: str, reference_time: datetime, fields: Dict[str, Any]) -> None:
+        key = self.key(text, reference_time)
+        stored = self._relativize(fields, reference_time) if len(key) > 1 else dict(fields)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    @staticmethod
+    def _midnight(reference_time: datetime) -> datetime:
+        return reference_time.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+    def _relativize(self, fields: Dict[str, Any], reference_time: datetime) -> Dict[str, Any]:
+        """Replace absolute times by (wall-clock offset from the reference midnight, tzinfo)."""
+        stored = dict(fields)
+        midnight = self._midnight(reference_time)
+        for name in _TIME_FIELDS:
+            value = stored.get(name)
+            if isinstance(value, datetime):
+                stored[name] = (value.replace(tzinfo=None) - midnight, value.tzinfo)
+        return stored
+
+    def _anchor(self, stored: Dict[str, Any], reference_time: datetime) -> Dict[str, Any]:
+        fields = dict(stored)
+        midnight = self._midnight(reference_time)
+        for name in _TIME_FIELDS:
+            value = fields.get(name)
+            if isinstance(value, tuple):
+                offset, tzinfo = value
+                fields[name] = (midnight + offset).replace(tzinfo=tzinfo)
+        return fields
@@ -0,0 +1,171 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import get_settings
+from ..models.intent import EventIntent
+from ..utils.event_times import event_bounds, to_utc
+from .backends import BatchOperation
+from .calendar import CalendarService, build_event_body, build_event_patch
+
+# How far ahead "move standup" or "cancel the review" looks for the event meant
+TARGET_SEARCH_DAYS = 14
+_WORD = re.compile(r'\w+')
+_TARGET_STOPWORDS = {'the', 'a', 'an', 'my', 'our', 'meeting', 'event'}
+
+
+def intent_to_event_data(event_intent: EventIntent) -> Dict[str, Any]:
+    return {
+        'title': event_intent.title,
+        'start_time': event_intent.start_time,
+        'end_time': event_intent.end_time,
+        'description': event_intent.description,
+        'location': event_intent.location,
+        'attendees': event_intent.attendees,
+        'priority': event_intent.priority
+    }
+
+
+def _title_words(text: Optional[str]) -> set:
+    return {word for word in _WORD.findall((text or '').lower())} - _TARGET_STOPWORDS
+
+
+def _in_zone(value: datetime, reference_time: datetime) -> datetime:
+    """value converted to reference_time's timezone; naive times on either side count as UTC."""
+    value = to_utc(value)
+    if reference_time.tzinfo is None:
+        return value.replace(tzinfo=None)
+    return value.astimezone(reference_time.tzinfo)
+
+
+class IntentExecutor:
+    """Carries out parsed intents against a CalendarService as batched operations.
+
+    Updates and deletions name their event by title (and, for deletions, optionally by
+    its time); the candidates all come from one listing of the next TARGET_SEARCH_DAYS,
+    answered by the event mirror when it is warm. The writes then go out as a single
+    batch request. Operations that touch the same event run in order, in successive
+    batches, so "move standup to 10 and cancel standup" cannot be reordered.
+    """
+
+    def __init__(self, calendar_service: CalendarService):
+        self.settings = get_settings()
+        self.calendar_service = calendar_service
+
+    def execute(self, intents: List[EventIntent], reference_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Run intents and report each as {'action', 'success', 'event' | 'error'[, 'event_id']}.
+
+        Updates and deletions from a low-confidence parse (the rule-based fallback when
+        Gemini is unavailable) are not run; they come back with 'needs_clarification'.
+        """
+        reference_time = reference_time or datetime.now()
+        results: List[Dict[str, Any]] = [{'action': intent.action} for intent in intents]
+        candidates = self._candidates(intents, reference_time)
+
+        # Wave n holds each event's n-th operation, so operations on one event stay ordered
+        waves: Dict[int, List[Tuple[int, BatchOperation]]] = defaultdict(list)
+        operations_per_event: Dict[str, int] = defaultdict(int)
+        for index, intent in enumerate(intents):
+            if intent.action in ('update', 'delete') and not self._confident(intent):
+                # A fallback parse must not pick an event to change by title words alone
+                results[index].update(
+                    success=False, needs_clarification=True,
+                    error=f"Not sure which event to {intent.action}; please say it again"
+                )
+                continue
+            try:
+                operation = self._operation(intent, candidates, reference_time)
+            except LookupError as e:
+                results[index].update(success=False, error=str(e))
+                continue
+            if operation is None:
+                results[index].update(success=False, error=f"'{intent.action}' requests are not executed")
+                continue
+            wave = 0
+            if operation[0] != 'insert':
+                event_id = operation[1]
+                results[index]['event_id'] = event_id
+                wave = operations_per_event[event_id]
+                operations_per_event[event_id] += 1
+            waves[wave].append((index, operation))
+
+        for wave in sorted(waves):
+            indexes, operations = zip(*waves[wave])
+            for index, outcome in zip(indexes, self.calendar_service.execute_batch(list(operations))):
+                outcome.pop('index', None)
+                results[index].update(outcome)
+        return results
+
+    def _confident(self, intent: EventIntent) -> bool:
+        """LLM parses carry no confidence; the local parsers' must reach the fast-path threshold."""
+        return intent.confidence is None or intent.confidence >= self.settings.RULE_PARSER_MIN_CONFIDENCE
+
+    def _candidates(self, intents: List[EventIntent], reference_time: datetime) -> List[Dict[str, Any]]:
+        """Every event an update or deletion could mean, from one range listing."""
+        targeted = [intent for intent in intents if intent.action in ('update', 'delete')]
+        if not targeted:
+            return []
+        start = reference_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=TARGET_SEARCH_DAYS)
+        for intent in targeted:
+            if intent.start_time is not None:
+                wanted = _in_zone(intent.start_time, reference_time)
+                start = min(start, wanted.replace(hour=0, minute=0, second=0, microsecond=0))
+                end = max(end, wanted + timedelta(days=1))
+        return list(self.calendar_service.iter_events(start, end))
+
+    def _operation(self, intent: EventIntent, candidates: List[Dict[str, Any]],
+                   reference_time: datetime) -> Optional[BatchOperation]:
+        if intent.action == 'create':
+            return ('insert', build_event_body(intent_to_event_data(intent), self.settings))
+        if intent.action == 'delete':
+            return ('delete', self._find_target(intent, candidates, reference_time, at_time=True)['id'])
+        if intent.action == 'update':
+            event = self._find_target(intent, candidates, reference_time, at_time=False)
+            return ('patch', event['id'], build_event_patch(self._moved(event, intent), self.settings))
+        return None
+
+    def _moved(self, event: Dict[str, Any], intent: EventIntent) -> Dict[str, Any]:
+        """The fields an update changes: the new time, keeping the event's length unless one was given."""
+        changes = {'description': intent.description, 'location': intent.location}
+        if intent.start_time is not None:
+            start, end = event_bounds(event)
+            changes['start_time'] = intent.start_time
+            if intent.end_time is not None:
+                changes['end_time'] = intent.end_time
+            elif intent.duration_minutes is not None:
+                changes['end_time'] = intent.start_time + timedelta(minutes=intent.duration_minutes)
+            else:
+                changes['end_time'] = intent.start_time + (end - start)
+        return changes
+
+    def _find_target(self, intent: EventIntent, candidates: List[Dict[str, Any]], reference_time: datetime,
+                     at_time: bool) -> Dict[str, Any]:
+        """The event an update or deletion refers to.
+
+        Every word of the intent's title must appear in the event's. A deletion's time
+        identifies the event ("cancel the 3pm review"); an update's time is where it is
+        going, so the event on that day wins. Otherwise the next upcoming match is taken.
+        """
+        words = _title_words(intent.title)
+        if not words:
+            raise LookupError(f"No event named in '{intent.action}' request")
+        matches = sorted(
+            (event for event in candidates if event.get('id') and words <= _title_words(event.get('summary'))),
+            key=lambda event: event_bounds(event)[0]
+        )
+        if not matches:
+            raise LookupError(f"No event matching '{intent.title}' found")
+
+        if intent.start_time is not None:
+            wanted = to_utc(intent.start_time)
+            for event in matches:
+                if at_time and event_bounds(event)[0] == wanted:
+                    return event
+            # "The same day" is the reference time's calendar day, whatever zone the event is in
+            wanted_day = _in_zone(wanted, reference_time).date()
+            for event in matches:
+                if _in_zone(event_bounds(event)[0], reference_time).date() == wanted_day:
+                    return event
+        upcoming = [event for event in matches if event_bounds(event)[1] >= to_utc(reference_time)]
+        return (upcoming or matches)[0]
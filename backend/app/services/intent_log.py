@@ -0,0 +1,41 @@
+from datetime import datetime
+import json
+import threading
+from typing import Any, Dict, Iterator
+from ..models.intent import EventIntent
+
+
+class IntentLog:
+    """Append-only JSONL log of (utterance, reference time, LLM intent) triples.
+
+    These are the training data for the local intent model: the LLM acts as the teacher
+    and every answer it gives is one labelled example.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, text: str, reference_time: datetime, event_intent: EventIntent) -> None:
+        record = {
+            'text': text,
+            'reference_time': reference_time.isoformat(),
+            'intent': event_intent.model_dump(mode='json', exclude={'confidence'})
+        }
+        line = json.dumps(record) + '\n'
+        with self._lock, open(self.path, 'a') as log:
+            log.write(line)
+
+
+def read_intent_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield logged examples with reference_time as a datetime and intent as an EventIntent."""
+    with open(path) as log:
+        for line in log:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield {
+                'text': record['text'],
+                'reference_time': datetime.fromisoformat(record['reference_time']),
+                'intent': EventIntent(**record['intent'])
+            }
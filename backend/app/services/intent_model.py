@@ -0,0 +1,440 @@
+"""Small CPU-only intent model distilled from logged Gemini parses.
+
+The model stacks on top of the rule parser rather than replacing it. Averaged
+perceptrons pick the action, priority, start day, start time and duration. For the
+time fields, "=rule" (keep what the grammar found) is one of the classes, so the model
+only has to learn where the grammar is wrong or silent. A greedy perceptron tagger
+marks which tokens form the title and the location. Confidence is the weakest head's
+softmax probability, mapped through histogram-binning calibration fitted on held-out
+examples, so 0.9 means about nine in ten such parses matched the LLM exactly.
+
+Train and evaluate offline from an IntentLog file:
+
+    python -m app.services.intent_model train intent_log.jsonl intent_model.json
+    python -m app.services.intent_model evaluate intent_log.jsonl intent_model.json
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+import argparse
+import json
+import math
+import random
+import re
+import time as clock
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from ..models.intent import EventIntent
+from .rule_parser import EMAIL, parse_event_text
+
+TOKEN = re.compile(
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+|\d{1,2}(?::\d{2})?(?:am|pm)?|\w+(?:'\w+)?|[^\w\s]", re.IGNORECASE
+)
+RULE = '=rule'
+NONE = 'none'
+OTHER = 'other'
+MAX_DAY_OFFSET = 31
+HEADS = ('action', 'priority', 'day', 'time', 'duration')
+SPAN_TAGS = ('T', 'L', 'O')  # title, location, outside
+
+
+class AveragedPerceptron:
+    """Multiclass perceptron with weight averaging, stored sparsely as feature -> {label: weight}."""
+
+    def __init__(self, weights: Optional[Dict[str, Dict[str, float]]] = None, labels: Iterable[str] = ()):
+        self.weights = weights or {}
+        self.labels = set(labels)
+        self._totals: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._stamps: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._updates = 0
+
+    def scores(self, features: Sequence[str]) -> Dict[str, float]:
+        scores = dict.fromkeys(self.labels, 0.0)
+        for feature in features:
+            for label, weight in self.weights.get(feature, {}).items():
+                scores[label] += weight
+        return scores
+
+    def predict(self, features: Sequence[str]) -> Tuple[str, float]:
+        """Return the best label and its softmax probability."""
+        scores = self.scores(features)
+        best = max(scores, key=lambda label: (scores[label], label))
+        total = sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, 1.0 / total
+
+    def update(self, truth: str, features: Sequence[str]) -> None:
+        self.labels.add(truth)
+        self._updates += 1
+        guess = max(self.scores(features).items(), key=lambda item: (item[1], item[0]))[0]
+        if guess == truth:
+            return
+        for feature in features:
+            weights = self.weights.setdefault(feature, {})
+            for label, delta in ((truth, 1.0), (guess, -1.0)):
+                key = (feature, label)
+                weight = weights.get(label, 0.0)
+                self._totals[key] += (self._updates - self._stamps[key]) * weight
+                self._stamps[key] = self._updates
+                weights[label] = weight + delta
+
+    def average(self) -> None:
+        """Replace each weight by its average over all updates, dropping the ones that end near zero."""
+        averaged = {}
+        for feature, weights in self.weights.items():
+            kept = {}
+            for label, weight in weights.items():
+                key = (feature, label)
+                total = self._totals[key] + (self._updates - self._stamps[key]) * weight
+                value = round(total / max(self._updates, 1), 4)
+                if value:
+                    kept[label] = value
+            if kept:
+                averaged[feature] = kept
+        self.weights = averaged
+        self._totals.clear()
+        self._stamps.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'labels': sorted(self.labels), 'weights': self.weights}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AveragedPerceptron':
+        return cls(data['weights'], data['labels'])
+
+
+def tokenize(text: str) -> List[re.Match]:
+    return list(TOKEN.finditer(text))
+
+
+def _normalize(value: Optional[str]) -> str:
+    return ' '.join((value or '').lower().split())
+
+
+def _sentence_features(words: List[str], rule_intent: EventIntent, reference_time: datetime) -> List[str]:
+    features = ['bias', f'first={words[0] if words else ""}', f'ref_hour={reference_time.hour // 3}']
+    lexical = [f'w={word}' for word in words] + [f'b={a}_{b}' for a, b in zip(words, words[1:])]
+    features += lexical
+    # Weekday words only mean a day offset relative to today's weekday
+    weekday = reference_time.weekday()
+    features += [f'{feature}|wd={weekday}' for feature in lexical]
+    features += [
+        f'rule_start={rule_intent.start_time is not None}',
+        f'rule_conf={round(rule_intent.confidence or 0, 1)}'
+    ]
+    return features
+
+
+def _token_features(words: List[str], index: int, previous_tag: str, rule_title: set, rule_location: set) -> List[str]:
+    word = words[index]
+    shape = re.sub(r'[a-z]+', 'a', re.sub(r'[A-Z]+', 'A', re.sub(r'\d+', '0', word)))
+    lower = word.lower()
+
+    def at(offset: int) -> str:
+        position = index + offset
+        return words[position].lower() if 0 <= position < len(words) else '<s>' if position < 0 else '</s>'
+
+    return [
+        'bias', f'w={lower}', f'suf={lower[-3:]}', f'shape={shape}', f'prev_tag={previous_tag}',
+        f'w-1={at(-1)}', f'w+1={at(1)}', f'w-2={at(-2)}', f'w+2={at(2)}',
+        f'w-1_w={at(-1)}_{lower}', f'prev_tag_w={previous_tag}_{lower}',
+        f'in_rule_title={lower in rule_title}', f'in_rule_location={lower in rule_location}',
+        f'first={index == 0}'
+    ]
+
+
+def _words(value: Optional[str]) -> set:
+    return {match.group().lower() for match in TOKEN.finditer(value or '')}
+
+
+def _span_text(text: str, tokens: List[re.Match], tags: List[str], tag: str) -> Optional[str]:
+    """Join the tokens carrying tag, keeping the original spacing between neighbours."""
+    pieces = []
+    previous = None
+    for index, (token, token_tag) in enumerate(zip(tokens, tags)):
+        if token_tag != tag:
+            continue
+        if previous is not None:
+            gap = text[tokens[previous].end():token.start()]
+            pieces.append(gap if previous == index - 1 and not gap.strip() else ' ')
+        pieces.append(token.group())
+        previous = index
+    return ''.join(pieces) or None
+
+
+class IntentModel:
+    def __init__(self):
+        self.heads = {name: AveragedPerceptron() for name in HEADS}
+        self.tagger = AveragedPerceptron()
+        # Upper raw-score edge of each calibration bin and the accuracy observed in it
+        self.calibration_edges: List[float] = []
+        self.calibration_accuracy: List[float] = []
+
+    # Targets -------------------------------------------------------------
+
+    @staticmethod
+    def _targets(rule_intent: EventIntent, intent: EventIntent, reference_time: datetime) -> Dict[str, str]:
+        start, end = intent.start_time, intent.end_time
+        rule_start, rule_end = rule_intent.start_time, rule_intent.end_time
+        targets = {'action': intent.action, 'priority': intent.priority or 'medium'}
+
+        if start is None:
+            targets['day'] = targets['time'] = targets['duration'] = NONE
+            return targets
+
+        if rule_start is not None and start.date() == rule_start.date():
+            targets['day'] = RULE
+        else:
+            offset = (start.date() - reference_time.date()).days
+            targets['day'] = str(offset) if 0 <= offset <= MAX_DAY_OFFSET else OTHER
+
+        if rule_start is not None and start.time() == rule_start.time():
+            targets['time'] = RULE
+        else:
+            targets['time'] = start.strftime('%H:%M')
+
+        minutes = int((end - start).total_seconds() // 60) if end else intent.duration_minutes
+        rule_minutes = int((rule_end - rule_start).total_seconds() // 60) if rule_start and rule_end else None
+        # An update naming no length has none (it keeps the event's); NONE says so where the grammar found one
+        targets['duration'] = RULE if minutes == rule_minutes else NONE if minutes is None else str(minutes)
+        return targets
+
+    @staticmethod
+    def _span_tags(words: List[str], intent: EventIntent) -> List[str]:
+        title_words, location_words = _words(intent.title), _words(intent.location)
+        tags = []
+        for word in words:
+            lower = word.lower()
+            if EMAIL.fullmatch(word):
+                tags.append('O')
+            elif lower in location_words and lower not in title_words:
+                tags.append('L')
+            elif lower in title_words:
+                tags.append('T')
+            else:
+                tags.append('O')
+        return tags
+
+    # Training ------------------------------------------------------------
+
+    def _train_pass(self, examples: List[Dict[str, Any]], rng: random.Random) -> None:
+        rng.shuffle(examples)
+        for example in examples:
+            text, reference_time, intent = example['text'], example['reference_time'], example['intent']
+            rule_intent = parse_event_text(text, reference_time)
+            words = [token.group() for token in tokenize(text)]
+            features = _sentence_features([word.lower() for word in words], rule_intent, reference_time)
+            for name, target in self._targets(rule_intent, intent, reference_time).items():
+                self.heads[name].update(target, features)
+
+            rule_title, rule_location = _words(rule_intent.title), _words(rule_intent.location)
+            previous_tag = '<s>'
+            for index, tag in enumerate(self._span_tags(words, intent)):
+                self.tagger.update(tag, _token_features(words, index, previous_tag, rule_title, rule_location))
+                previous_tag = tag
+
+    def fit(self, examples: Sequence[Dict[str, Any]], epochs: int = 8, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        examples = list(examples)
+        for _ in range(epochs):
+            self._train_pass(examples, rng)
+        for head in self.heads.values():
+            head.average()
+        self.tagger.average()
+
+    def calibrate(self, examples: Sequence[Dict[str, Any]], bins: int = 10) -> None:
+        """Fit histogram-binning calibration: raw score -> share of exact matches in its bin."""
+        self.calibration_edges, self.calibration_accuracy = [], []
+        scored = []
+        for example in examples:
+            intent, score = self._predict(example['text'], example['reference_time'])
+            scored.append((score, exact_match(intent, example['intent'])))
+        scored.sort()
+        if not scored:
+            return
+        size = math.ceil(len(scored) / bins)
+        best = 0.0
+        for offset in range(0, len(scored), size):
+            chunk = scored[offset:offset + size]
+            # Laplace smoothing keeps small bins away from 0 and 1; the running max keeps the map monotone
+            best = max(best, (sum(correct for _, correct in chunk) + 1) / (len(chunk) + 2))
+            self.calibration_edges.append(chunk[-1][0])
+            self.calibration_accuracy.append(best)
+        self.calibration_edges[-1] = 1.0
+
+    def train(self, examples: Sequence[Dict[str, Any]], calibration_fraction: float = 0.2,
+              evaluation_fraction: float = 0.2, epochs: int = 8, seed: int = 0) -> Dict[str, Any]:
+        """Fit on most examples, calibrate on one held-out split and evaluate on another.
+
+        The evaluation split is kept apart from calibration so the reported coverage and
+        accuracy at the threshold are not scored on the examples the bins were fitted to.
+        """
+        examples = list(examples)
+        random.Random(seed).shuffle(examples)
+        calibration_end = int(len(examples) * calibration_fraction)
+        evaluation_end = calibration_end + int(len(examples) * evaluation_fraction)
+        calibration = examples[:calibration_end]
+        evaluation = examples[calibration_end:evaluation_end]
+        training = examples[evaluation_end:]
+        self.fit(training, epochs, seed)
+        self.calibrate(calibration)
+        return evaluate(self, evaluation)
+
+    # Prediction ----------------------------------------------------------
+
+    def _predict(self, text: str, reference_time: datetime) -> Tuple[EventIntent, float]:
+        """Return the intent and its raw (uncalibrated) score."""
+        rule_intent = parse_event_text(text, reference_time)
+        tokens = tokenize(text)
+        words = [token.group() for token in tokens]
+        features = _sentence_features([word.lower() for word in words], rule_intent, reference_time)
+        predicted = {name: head.predict(features) for name, head in self.heads.items()}
+        score = min(probability for _, probability in predicted.values())
+
+        rule_title, rule_location = _words(rule_intent.title), _words(rule_intent.location)
+        tags, previous_tag = [], '<s>'
+        for index in range(len(words)):
+            tag, probability = self.tagger.predict(_token_features(words, index, previous_tag, rule_title, rule_location))
+            tags.append(tag)
+            score = min(score, probability)
+            previous_tag = tag
+
+        start = end = None
+        day, time_label, duration = predicted['day'][0], predicted['time'][0], predicted['duration'][0]
+        if day == OTHER or NONE in (day, time_label):
+            # Only a timeless intent has no start: a day without a time (or the reverse) is a miss
+            if (day, time_label) != (NONE, NONE):
+                score = 0.0
+        else:
+            start_date = rule_intent.start_time.date() if day == RULE and rule_intent.start_time else None
+            start_clock = rule_intent.start_time.time() if time_label == RULE and rule_intent.start_time else None
+            if day != RULE:
+                start_date = reference_time.date() + timedelta(days=int(day))
+            if time_label != RULE:
+                start_clock = time.fromisoformat(time_label)
+            if start_date is None or start_clock is None:
+                # "=rule" predicted where the grammar found nothing
+                score = 0.0
+            else:
+                start = datetime.combine(start_date, start_clock, reference_time.tzinfo)
+                if duration == RULE and rule_intent.start_time and rule_intent.end_time:
+                    end = start + (rule_intent.end_time - rule_intent.start_time)
+                elif duration not in (RULE, NONE):
+                    end = start + timedelta(minutes=int(duration))
+                elif predicted['action'][0] != 'update':
+                    end = start + timedelta(minutes=60)
+
+        title = _span_text(text, tokens, tags, 'T')
+        if title:
+            title = title[0].upper() + title[1:]
+        intent = EventIntent(
+            action=predicted['action'][0],
+            title=title,
+            start_time=start,
+            end_time=end,
+            location=_span_text(text, tokens, tags, 'L'),
+            attendees=rule_intent.attendees,
+            priority=predicted['priority'][0],
+            duration_minutes=int((end - start).total_seconds() // 60) if start and end else None
+        )
+        return intent, score
+
+    def predict(self, text: str, reference_time: Optional[datetime] = None) -> EventIntent:
+        """Parse text; the intent's confidence is the calibrated chance that it matches the LLM's."""
+        intent, score = self._predict(text, reference_time or datetime.now())
+        confidence = score
+        if self.calibration_edges:
+            bin_index = min(bisect_left(self.calibration_edges, score), len(self.calibration_edges) - 1)
+            confidence = self.calibration_accuracy[bin_index] if score > 0 else 0.0
+        intent.confidence = round(confidence, 3)
+        return intent
+
+    # Persistence ---------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as model_file:
+            json.dump({
+                'heads': {name: head.to_dict() for name, head in self.heads.items()},
+                'tagger': self.tagger.to_dict(),
+                'calibration': {'edges': self.calibration_edges, 'accuracy': self.calibration_accuracy}
+            }, model_file)
+
+    @classmethod
+    def load(cls, path: str) -> 'IntentModel':
+        with open(path) as model_file:
+            data = json.load(model_file)
+        model = cls()
+        model.heads = {name: AveragedPerceptron.from_dict(head) for name, head in data['heads'].items()}
+        model.tagger = AveragedPerceptron.from_dict(data['tagger'])
+        model.calibration_edges = data['calibration']['edges']
+        model.calibration_accuracy = data['calibration']['accuracy']
+        return model
+
+
+def exact_match(predicted: EventIntent, expected: EventIntent) -> bool:
+    return all(field_matches(predicted, expected).values())
+
+
+def field_matches(predicted: EventIntent, expected: EventIntent) -> Dict[str, bool]:
+    return {
+        'action': predicted.action == expected.action,
+        'title': _normalize(predicted.title) == _normalize(expected.title),
+        'start_time': predicted.start_time == expected.start_time,
+        'end_time': predicted.end_time == expected.end_time,
+        'location': _normalize(predicted.location) == _normalize(expected.location)
+    }
+
+
+def evaluate(model: IntentModel, examples: Sequence[Dict[str, Any]], threshold: float = 0.9) -> Dict[str, Any]:
+    """Per-field and exact-match accuracy, calibration error, coverage at threshold and latency."""
+    if not examples:
+        return {'examples': 0}
+    field_hits: Dict[str, int] = defaultdict(int)
+    exact = covered = covered_exact = 0
+    calibration_gap = 0.0
+    started = clock.perf_counter()
+    for example in examples:
+        predicted = model.predict(example['text'], example['reference_time'])
+        matches = field_matches(predicted, example['intent'])
+        correct = all(matches.values())
+        for field, hit in matches.items():
+            field_hits[field] += hit
+        exact += correct
+        calibration_gap += predicted.confidence - correct
+        if predicted.confidence >= threshold:
+            covered += 1
+            covered_exact += correct
+    elapsed = clock.perf_counter() - started
+
+    count = len(examples)
+    return {
+        'examples': count,
+        'field_accuracy': {field: round(hits / count, 3) for field, hits in field_hits.items()},
+        'exact_match': round(exact / count, 3),
+        'mean_confidence_minus_accuracy': round(calibration_gap / count, 3),
+        'threshold': threshold,
+        'coverage': round(covered / count, 3),
+        'accuracy_when_covered': round(covered_exact / covered, 3) if covered else None,
+        'mean_latency_us': round(elapsed / count * 1e6, 1)
+    }
+
+
+def main(args):
+    from .intent_log import read_intent_log
+
+    examples = list(read_intent_log(args.log))
+    if args.command == 'train':
+        model = IntentModel()
+        report = model.train(examples, epochs=args.epochs)
+        model.save(args.model)
+    else:
+        report = evaluate(IntentModel.load(args.model), examples, args.threshold)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or evaluate the distilled intent model.")
+    parser.add_argument('command', choices=['train', 'evaluate'])
+    parser.add_argument('log', help="IntentLog JSONL file")
+    parser.add_argument('model', help="model JSON file to write (train) or read (evaluate)")
+    parser.add_argument('--epochs', type=int, default=8)
+    parser.add_argument('--threshold', type=float, default=0.9)
+    main(parser.parse_args())
@@ -1,37 +1,29 @@
-import google.generativeai as genai
-from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import datetime, timedelta
-import re
+from typing import Any, List, Optional, Tuple
+from contextlib import aclosing
+from datetime import datetime
+import asyncio
 import json
+import time
+from zoneinfo import ZoneInfo
 from ..config import get_settings
+from ..models.intent import EventIntent
+from ..utils.availability import Availability
+from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.event_times import event_bounds, local_event_bounds
+from ..utils.json_stream import JsonStreamParser
+from .gemini_client import AsyncGeminiClient
+from .intent_cache import IntentCache
+from .intent_log import IntentLog
+from .intent_model import IntentModel
+from .rule_parser import parse_event_text, split_actions
+from .similar_intent_cache import SimilarIntentCache
 
-class EventIntent(BaseModel):
-    """Schema for parsed event intent from natural language."""
-    action: str = Field(description="The action to perform (create, update, delete, query)")
-    title: Optional[str] = Field(default=None, description="The title of the event")
-    start_time: Optional[datetime] = Field(default=None, description="The start time of the event")
-    end_time: Optional[datetime] = Field(default=None, description="The end time of the event")
-    description: Optional[str] = Field(default=None, description="The description of the event")
-    location: Optional[str] = Field(default=None, description="The location of the event")
-    attendees: Optional[List[str]] = Field(default=None, description="List of attendees' email addresses")
-    priority: Optional[str] = Field(default="medium", description="Priority level of the event")
-    duration_minutes: Optional[int] = Field(default=60, description="Duration of the event in minutes")
+# Sent as the system instruction of every call and never varies between requests, so
+# the provider can cache it as a common prefix; only the short per-request part changes.
+SYSTEM_INSTRUCTION = """You are a calendar assistant that helps parse natural language into structured event data.
 
-class NLPService:
-    def __init__(self):
-        self.settings = get_settings()
-        genai.configure(api_key=self.settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(self.settings.MODEL_NAME)
-        self.model.temperature = self.settings.TEMPERATURE
-
-    def _create_prompt_template(self, user_input: str) -> str:
-        """Create the prompt template for event parsing."""
-        current_time = datetime.now()
-        
-        prompt = f"""You are a calendar assistant that helps parse natural language into structured event data.
-        
-Extract the following information from the user's input and return it as a JSON object:
+Each request gives the current time and either one user input or a numbered list of user inputs.
+For every input, extract the following information into a JSON object:
 - action: The action to perform (create, update, delete, query)
 - title: The title of the event
 - start_time: The start time of the event (ISO format)
@@ -42,141 +34,330 @@ Extract the following information from the user's input and return it as a JSON
 - priority: Priority level of the event (low, medium, high, urgent)
 - duration_minutes: Duration of the event in minutes
 
-User input: {user_input}
-
-Current time: {current_time.isoformat()}
-
 Remember to:
-1. Convert relative time references (e.g., "tomorrow", "next week") to actual dates
+1. Convert relative time references (e.g., "tomorrow", "next week") to actual dates, relative to the current time given
 2. Extract email addresses for attendees
 3. Determine the appropriate action based on the user's intent
-4. Set default duration to 60 minutes if not specified
+4. Set default duration to 60 minutes if not specified, except for updates: leave end_time and duration_minutes null unless the input gives an end time or a length
 5. Set default priority to "medium" if not specified
 6. Return only valid JSON format
 
 Make sure that relative time phrases like "today", "tomorrow", "next week" are fully converted into ISO 8601 formatted timestamps, and NOT left as words.
 Do NOT include date keywords like "today" or "tomorrow" in the event title.
 
-Return the response as a JSON object with the extracted information."""
-        
-        return prompt
+For a single user input, return one JSON object.
+For a numbered list, return a JSON array with exactly one object per input, in input order, each with an "index" field holding the input's number."""
+
+class NLPService:
+    def __init__(self):
+        self.settings = get_settings()
+        self._model = None
+        self.cache = IntentCache(
+            max_size=self.settings.PARSE_CACHE_SIZE,
+            ttl_seconds=self.settings.PARSE_CACHE_TTL_SECONDS,
+            bucket_minutes=self.settings.PARSE_CACHE_BUCKET_MINUTES
+        )
+        self.similar_cache = SimilarIntentCache(
+            max_size=self.settings.SIMILAR_CACHE_SIZE,
+            threshold=self.settings.SIMILAR_CACHE_THRESHOLD,
+            ttl_seconds=self.settings.PARSE_CACHE_TTL_SECONDS
+        )
+        self.gemini = AsyncGeminiClient(
+            api_key=self.settings.GEMINI_API_KEY,
+            model_name=self.settings.MODEL_NAME,
+            base_url=self.settings.GEMINI_API_BASE,
+            max_concurrency=self.settings.LLM_MAX_CONCURRENCY,
+            generation_config={
+                'temperature': self.settings.TEMPERATURE,
+                'maxOutputTokens': self.settings.MAX_TOKENS,
+                'responseMimeType': 'application/json'
+            },
+            system_instruction=SYSTEM_INSTRUCTION
+        )
+        self.intent_log = IntentLog(self.settings.INTENT_LOG_PATH) if self.settings.INTENT_LOG_PATH else None
+        self.intent_model = IntentModel.load(self.settings.INTENT_MODEL_PATH) if self.settings.INTENT_MODEL_PATH else None
+        # Shared by the sync and async paths: during an outage both go straight to the rule parser
+        self.breaker = CircuitBreaker(
+            'gemini',
+            window_size=self.settings.LLM_BREAKER_WINDOW,
+            min_calls=self.settings.LLM_BREAKER_MIN_CALLS,
+            failure_rate=self.settings.LLM_BREAKER_FAILURE_RATE,
+            slow_call_seconds=self.settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+            reset_seconds=self.settings.LLM_BREAKER_RESET_SECONDS
+        )
+
+    async def aclose(self) -> None:
+        await self.gemini.aclose()
+
+    @property
+    def model(self):
+        """The Gemini model, configured on first use.
+
+        google.generativeai takes most of a second to import, so it is only loaded once
+        a request actually needs the LLM.
+        """
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.settings.GEMINI_API_KEY)
+            self._model = genai.GenerativeModel(self.settings.MODEL_NAME, system_instruction=SYSTEM_INSTRUCTION)
+            self._model.temperature = self.settings.TEMPERATURE
+        return self._model
+
+    def _reference_line(self, current_time: Optional[datetime]) -> str:
+        """The current time, floored to PROMPT_TIME_QUANTUM_MINUTES so nearby requests read the same."""
+        current_time = current_time or datetime.now()
+        quantum = self.settings.PROMPT_TIME_QUANTUM_MINUTES
+        current_time = current_time.replace(
+            minute=current_time.minute - current_time.minute % quantum, second=0, microsecond=0
+        )
+        return f"Current time: {current_time.isoformat(timespec='minutes')} ({current_time:%A})"
+
+    def _create_prompt_template(self, user_input: str, current_time: Optional[datetime] = None) -> str:
+        """Create the per-request part of the prompt; the instructions live in SYSTEM_INSTRUCTION."""
+        return f"{self._reference_line(current_time)}\nUser input: {user_input}"
+
+    def _create_batch_prompt_template(self, user_inputs: List[str], current_time: Optional[datetime] = None) -> str:
+        """Create the per-request part of a prompt that parses several inputs at once."""
+        numbered = "\n".join(f"{index}. {json.dumps(user_input)}" for index, user_input in enumerate(user_inputs))
+        return f"{self._reference_line(current_time)}\nUser inputs:\n{numbered}"
+
+    def _fast_path(self, user_input: str, reference_time: datetime) -> Tuple[EventIntent, Optional[EventIntent]]:
+        """Return the rule-based parse, plus the final answer if no LLM call is needed.
+
+        The tiers are tried cheapest first: the rule parser, the cache of earlier LLM
+        answers, earlier LLM answers to near-duplicate utterances, then the distilled
+        intent model when one is configured.
+        """
+        rule_intent = parse_event_text(user_input, reference_time, self.settings.DEFAULT_EVENT_DURATION)
+        if rule_intent.confidence >= self.settings.RULE_PARSER_MIN_CONFIDENCE:
+            return rule_intent, rule_intent
+
+        cached = self.cache.get(user_input, reference_time)
+        if cached is not None:
+            return rule_intent, EventIntent(**cached)
+
+        similar = self.similar_cache.get(user_input, reference_time, self.settings.DEFAULT_EVENT_DURATION)
+        if similar is not None:
+            return rule_intent, similar
+
+        if self.intent_model is not None:
+            model_intent = self.intent_model.predict(user_input, reference_time)
+            if model_intent.confidence >= self.settings.INTENT_MODEL_MIN_CONFIDENCE:
+                return rule_intent, model_intent
+        return rule_intent, None
 
-    def parse_event_intent(self, user_input: str) -> EventIntent:
-        """Parse natural language input into structured event data."""
-        prompt = self._create_prompt_template(user_input)
+    def _remember(self, user_input: str, reference_time: datetime, event_intent: EventIntent) -> None:
+        """Cache an LLM parse and, when INTENT_LOG_PATH is set, log it as a training example."""
+        self.cache.put(user_input, reference_time, event_intent.model_dump())
+        self.similar_cache.put(user_input, event_intent)
+        if self.intent_log is not None:
+            self.intent_log.append(user_input, reference_time, event_intent)
+
+    def parse_event_intent(self, user_input: str, reference_time: Optional[datetime] = None) -> EventIntent:
+        """Parse natural language input into structured event data.
+
+        The rule-based parser answers first; Gemini is only asked when it is not confident
+        enough. Parses that came from the LLM are cached, so a repeated utterance is
+        answered without another Gemini round trip.
+        """
+        reference_time = reference_time or datetime.now()
+        rule_intent, answer = self._fast_path(user_input, reference_time)
+        if answer is not None:
+            return answer
+
+        event_intent = self._parse_with_model(user_input, reference_time)
+        if event_intent is None:
+            # The best rule-based reading is still better than nothing. It is not cached,
+            # so a transient API failure is not remembered.
+            return rule_intent
+
+        self._remember(user_input, reference_time, event_intent)
+        return event_intent
+
+    async def aparse_event_intent(self, user_input: str, reference_time: Optional[datetime] = None) -> EventIntent:
+        """Non-blocking parse_event_intent for request handlers.
+
+        The Gemini call, including any wait for a free concurrency slot, must finish within
+        LLM_TIMEOUT_SECONDS; otherwise the rule-based parse is returned. The answer is
+        streamed and read only until its JSON object is complete. Cancelling the caller
+        (e.g. when the client disconnects) cancels the upstream request too.
+        """
+        reference_time = reference_time or datetime.now()
+        rule_intent, answer = self._fast_path(user_input, reference_time)
+        if answer is not None:
+            return answer
+
+        prompt = self._create_prompt_template(user_input, reference_time)
+        value = await self._generate(prompt, self.settings.LLM_TIMEOUT_SECONDS, '{')
+        event_intent = self._intent_from_value(value)
+        if event_intent is None:
+            return rule_intent
+
+        self._remember(user_input, reference_time, event_intent)
+        return event_intent
+
+    async def aparse_event_intents(self, user_inputs: List[str],
+                                   reference_time: Optional[datetime] = None) -> List[EventIntent]:
+        """Parse many inputs, packing the ones that need the LLM into as few calls as possible.
+
+        Inputs go to Gemini LLM_BATCH_SIZE per prompt, with the chunks in flight
+        concurrently. Any item the model leaves out or answers badly, and every item of
+        a chunk that misses LLM_BATCH_TIMEOUT_SECONDS, gets its rule-based parse instead.
+        """
+        reference_time = reference_time or datetime.now()
+        intents: List[Optional[EventIntent]] = []
+        rule_intents: List[EventIntent] = []
+        pending: List[int] = []
+        for index, user_input in enumerate(user_inputs):
+            rule_intent, answer = self._fast_path(user_input, reference_time)
+            intents.append(answer)
+            rule_intents.append(rule_intent)
+            if answer is None:
+                pending.append(index)
+
+        batch_size = self.settings.LLM_BATCH_SIZE
+        chunks = [pending[offset:offset + batch_size] for offset in range(0, len(pending), batch_size)]
+
+        async def parse_chunk(chunk: List[int]) -> None:
+            prompt = self._create_batch_prompt_template([user_inputs[index] for index in chunk], reference_time)
+            value = await self._generate(
+                prompt, self.settings.LLM_BATCH_TIMEOUT_SECONDS, '[',
+                # An intent object is well under 200 tokens
+                {'maxOutputTokens': max(self.settings.MAX_TOKENS, 200 * len(chunk))},
+                batch=True
+            )
+            parsed = self._intents_from_batch_value(value, len(chunk))
+            for index, event_intent in zip(chunk, parsed):
+                if event_intent is not None:
+                    self._remember(user_inputs[index], reference_time, event_intent)
+                intents[index] = event_intent
+
+        await asyncio.gather(*(parse_chunk(chunk) for chunk in chunks))
+        return [intent if intent is not None else rule_intent for intent, rule_intent in zip(intents, rule_intents)]
+
+    async def aparse_actions(self, user_input: str, reference_time: Optional[datetime] = None) -> List[EventIntent]:
+        """Parse a request that may ask for several actions into one intent per action.
+
+        The request is split into clauses locally; clauses that need the LLM share a
+        single multi-item prompt, so "move standup to 10 and cancel the 3pm review"
+        costs at most one Gemini call.
+        """
+        clauses = split_actions(user_input) or [user_input]
+        if len(clauses) == 1:
+            return [await self.aparse_event_intent(clauses[0], reference_time)]
+        return await self.aparse_event_intents(clauses, reference_time)
+
+    async def _generate(self, prompt: str, timeout: float, openers: str, generation_config: Optional[dict] = None,
+                        batch: bool = False) -> Optional[Any]:
+        """Call Gemini through the circuit breaker and return the first JSON value it streams back.
+
+        None when the breaker is open, the call fails, or the answer holds no usable JSON.
+        A missed deadline counts as a failure; an answer that is merely malformed does not.
+        Batch calls are expected to be slow, so only single calls are judged by their latency.
+        """
+        if not self.breaker.allow_request():
+            return None
+        started = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(self._stream_json(prompt, openers, generation_config), timeout=timeout)
+        except Exception:
+            self.breaker.record_failure()
+            return None
+        self.breaker.record_success(0.0 if batch else time.perf_counter() - started)
+        return value
+
+    async def _stream_json(self, prompt: str, openers: str, generation_config: Optional[dict]) -> Optional[Any]:
+        """Feed streamed text to a JsonStreamParser and hang up once the value is complete."""
+        parser = JsonStreamParser(openers)
+        # aclosing makes an early return close the stream, which stops the generation upstream
+        async with aclosing(self.gemini.stream(prompt, generation_config)) as chunks:
+            async for chunk in chunks:
+                try:
+                    value = parser.feed(chunk)
+                except ValueError:
+                    return None
+                if parser.done:
+                    return value
+        return None
+
+    def _parse_with_model(self, user_input: str, reference_time: datetime) -> Optional[EventIntent]:
+        """Ask Gemini for the intent; None when the call fails or returns something unusable."""
+        if not self.breaker.allow_request():
+            # Gemini is failing; skip straight to the fallback instead of waiting on it
+            return None
+        prompt = self._create_prompt_template(user_input, reference_time)
         
-        # Get response from Gemini
+        # Stream the response from Gemini and stop reading once the JSON object is complete
+        parser = JsonStreamParser('{')
+        started = time.perf_counter()
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text
-            
-            # Parse the response into EventIntent
-            try:
-                # Try to parse as JSON first
-                if response_text.strip().startswith('{'):
-                    json_data = json.loads(response_text)
-                    return EventIntent(**json_data)
-                else:
-                    # Fallback to basic parsing if structured parsing fails
-                    return self._fallback_parsing(user_input)
-            except Exception as e:
-                # Fallback to basic parsing if structured parsing fails
-                return self._fallback_parsing(user_input)
-        except Exception as e:
+            response = self.model.generate_content(prompt, stream=True)
+            for chunk in response:
+                parser.feed(chunk.text)
+                if parser.done:
+                    break
+        except ValueError:
+            # Malformed JSON is the model's formatting, not an outage
+            self.breaker.record_success(time.perf_counter() - started)
+            return None
+        except Exception:
             # Fallback to basic parsing if API call fails
-            return self._fallback_parsing(user_input)
-
-    def _fallback_parsing(self, user_input: str) -> EventIntent:
-        """Fallback method for basic event parsing when structured parsing fails."""
-        # Basic regex patterns for common time expressions
-        time_patterns = {
-            r'tomorrow at (\d{1,2}(?::\d{2})? ?(?:AM|PM|am|pm)?)': lambda m: self._parse_time_tomorrow(m.group(1)),
-            r'next (\w+) at (\d{1,2}(?::\d{2})? ?(?:AM|PM|am|pm)?)': lambda m: self._parse_time_next_weekday(m.group(1), m.group(2)),
-            r'(\d{1,2}(?::\d{2})? ?(?:AM|PM|am|pm)?)': lambda m: self._parse_time_today(m.group(1))
-        }
-
-        # Extract time
-        start_time = None
-        for pattern, parser in time_patterns.items():
-            match = re.search(pattern, user_input, re.IGNORECASE)
-            if match:
-                start_time = parser(match)
-                break
-
-        # Default duration if not specified
-        duration_minutes = self.settings.DEFAULT_EVENT_DURATION
-
-        # Create basic event intent
-        return EventIntent(
-            action="create",
-            title=user_input.split(" at ")[0].strip(),
-            start_time=start_time,
-            end_time=start_time + timedelta(minutes=duration_minutes) if start_time else None,
-            priority="medium"
-        )
+            self.breaker.record_failure()
+            return None
+        latency = time.perf_counter() - started
+        self.breaker.record_success(latency)
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is not None:
+            self.gemini.usage.record(
+                usage.prompt_token_count, getattr(usage, 'cached_content_token_count', 0),
+                usage.candidates_token_count, latency
+            )
+        return self._intent_from_value(parser.value)
 
-    def _parse_time_tomorrow(self, time_str: str) -> datetime:
-        """Parse time string for tomorrow."""
-        return self._parse_time(time_str, days_ahead=1)
-
-    def _parse_time_next_weekday(self, weekday: str, time_str: str) -> datetime:
-        """Parse time string for next weekday."""
-        weekdays = {
-            'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-            'friday': 4, 'saturday': 5, 'sunday': 6
-        }
-        days_ahead = (weekdays[weekday.lower()] - datetime.now().weekday()) % 7
-        if days_ahead == 0:
-            days_ahead = 7
-        return self._parse_time(time_str, days_ahead=days_ahead)
-
-    def _parse_time_today(self, time_str: str) -> datetime:
-        """Parse time string for today."""
-        return self._parse_time(time_str, days_ahead=0)
-
-    def _parse_time(self, time_str: str, days_ahead: int) -> datetime:
-        """Parse time string into datetime object."""
-        # Remove any extra spaces and convert to lowercase
-        time_str = time_str.strip().lower()
-        
-        # Handle different time formats
-        if ':' in time_str:
-            hour, minute = map(int, time_str.replace('am', '').replace('pm', '').split(':'))
-        else:
-            hour = int(time_str.replace('am', '').replace('pm', ''))
-            minute = 0
-
-        # Handle AM/PM
-        if 'pm' in time_str and hour < 12:
-            hour += 12
-        elif 'am' in time_str and hour == 12:
-            hour = 0
-
-        # Create datetime object
-        now = datetime.now()
-        return datetime(
-            year=now.year,
-            month=now.month,
-            day=now.day,
-            hour=hour,
-            minute=minute
-        ) + timedelta(days=days_ahead)
-
-    def generate_agenda_summary(self, events: List[dict]) -> str:
-        """Generate a natural language summary of the daily agenda."""
+    @staticmethod
+    def _intent_from_value(value: Any) -> Optional[EventIntent]:
+        """Build an EventIntent from the model's decoded JSON object, or None if it is not usable."""
+        if not isinstance(value, dict):
+            return None
+        try:
+            return EventIntent(**value)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _intents_from_batch_value(items: Any, count: int) -> List[Optional[EventIntent]]:
+        """Map the model's decoded JSON array back onto count inputs; unusable items come back as None."""
+        intents: List[Optional[EventIntent]] = [None] * count
+        if not isinstance(items, list):
+            return intents
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            index = item.pop('index', position)
+            if not isinstance(index, int) or not 0 <= index < count or intents[index] is not None:
+                continue
+            try:
+                intents[index] = EventIntent(**item)
+            except Exception:
+                pass
+        return intents
+
+    def generate_agenda_summary(self, events: List[dict], period: str = "today") -> str:
+        """Generate a natural language summary of the agenda for period."""
         if not events:
-            return "You have no events scheduled for today."
+            return f"You have no events scheduled for {period}."
 
         # Sort events by start time
-        sorted_events = sorted(events, key=lambda x: x['start']['dateTime'])
+        sorted_events = sorted(events, key=event_bounds)
 
         # Generate summary
-        summary = "Here's your agenda for today:\n\n"
+        summary = f"Here's your agenda for {period}:\n\n"
+        default_tz = ZoneInfo(self.settings.DEFAULT_TIMEZONE)
         for event in sorted_events:
-            start_time = datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(event['end']['dateTime'].replace('Z', '+00:00'))
+            # Show each event at its own clock time rather than in UTC
+            start_time, end_time = local_event_bounds(event, default_tz)
             
-            summary += f"• {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}: {event['summary']}\n"
+            summary += f"• {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}: {event.get('summary', '(no title)')}\n"
             if event.get('location'):
                 summary += f"  Location: {event['location']}\n"
             if event.get('description'):
@@ -185,32 +366,17 @@ Return the response as a JSON object with the extracted information."""
 
         return summary
 
-    def suggest_time_slots(self, busy_slots: List[dict], duration_minutes: int) -> str:
-        """Generate natural language suggestions for available time slots."""
-        if not busy_slots:
-            return "You have no events scheduled for this time period."
-
-        # Find gaps between events
-        gaps = []
-        for i in range(len(busy_slots) - 1):
-            current_end = busy_slots[i]['end']
-            next_start = busy_slots[i + 1]['start']
-            gap_duration = (next_start - current_end).total_seconds() / 60
-
-            if gap_duration >= duration_minutes:
-                gaps.append({
-                    'start': current_end,
-                    'end': next_start,
-                    'duration': gap_duration
-                })
-
+    def suggest_time_slots(self, free: Availability, duration_minutes: int) -> str:
+        """Generate natural language suggestions for the free runs of at least duration_minutes."""
+        gaps = free.slots(duration_minutes)
         if not gaps:
             return "There are no suitable time slots available for the requested duration."
 
         # Generate suggestions
         suggestions = "Here are some available time slots:\n\n"
         for gap in gaps:
+            gap_duration = (gap['end'] - gap['start']).total_seconds() / 60
             suggestions += f"• {gap['start'].strftime('%I:%M %p')} - {gap['end'].strftime('%I:%M %p')} "
-            suggestions += f"(Duration: {int(gap['duration'])} minutes)\n"
+            suggestions += f"(Duration: {int(gap_duration)} minutes)\n"
 
-        return suggestions 
\ No newline at end of file
+        return suggestions
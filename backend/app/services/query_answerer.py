@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from ..config import get_settings
+from ..models.intent import EventIntent
+from ..utils.availability import Availability
+from .calendar import CalendarService, busy_from_events
+from .nlp import NLPService
+from .rule_parser import FREE_QUESTION, query_window
+
+
+class QueryAnswerer:
+    """Answers questions about the calendar ("what do I have friday afternoon", "am I free at 3").
+
+    The time window comes from the rule parser when it can read one, so most questions
+    never reach the LLM; otherwise the window of the parsed query intent is used. Events
+    are read from the event mirror when it is warm, and the reply is written by
+    NLPService.generate_agenda_summary or suggest_time_slots, without another LLM call.
+    """
+
+    def __init__(self, calendar_service: CalendarService, nlp_service: NLPService):
+        self.settings = get_settings()
+        self.calendar_service = calendar_service
+        self.nlp_service = nlp_service
+
+    def answer_text(self, user_input: str, reference_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Answer user_input if it is a question the rule parser can place in time, else None."""
+        reference_time = reference_time or datetime.now()
+        window = query_window(user_input, reference_time, self.settings.DEFAULT_EVENT_DURATION)
+        if window is None:
+            return None
+        return self.answer(user_input, *window, reference_time)
+
+    def answer_intent(self, user_input: str, event_intent: EventIntent,
+                      reference_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Answer a query intent parsed by the LLM; with no time given it asks about the rest of today."""
+        reference_time = reference_time or datetime.now()
+        start, end = event_intent.start_time, event_intent.end_time
+        if start is None:
+            start = reference_time
+            end = reference_time.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        elif end is None or end <= start:
+            end = start + timedelta(minutes=event_intent.duration_minutes or self.settings.DEFAULT_EVENT_DURATION)
+        return self.answer(user_input, start, end, reference_time)
+
+    def answer(self, user_input: str, start: datetime, end: datetime, reference_time: datetime) -> Dict[str, Any]:
+        events = list(self.calendar_service.iter_events(start, end))
+        period = self._period(start, end, reference_time)
+        query = {'start': start, 'end': end}
+
+        if FREE_QUESTION.search(user_input):
+            busy = busy_from_events(events)
+            window = Availability.window(start, end)
+            free = window - Availability.from_intervals(busy)
+            duration = min(self.settings.DEFAULT_EVENT_DURATION, window.total_minutes())
+            answer = self.nlp_service.suggest_time_slots(free, duration)
+            if busy:
+                answer += "\n\n" + self.nlp_service.generate_agenda_summary(events, period)
+            return {'message': answer, 'answer': answer, 'query': {**query, 'kind': 'free'},
+                    'free': not busy, 'busy': busy, 'event': None}
+
+        answer = self.nlp_service.generate_agenda_summary(events, period)
+        return {'message': answer, 'answer': answer, 'query': {**query, 'kind': 'agenda'},
+                'events': events, 'event': None}
+
+    @staticmethod
+    def _period(start: datetime, end: datetime, reference_time: datetime) -> str:
+        """How the window reads in a reply: "today", "Friday, October 16", "Friday, October 16 12:00 PM-05:00 PM"."""
+        day = start.date()
+        if day == reference_time.date():
+            label = 'today'
+        elif day == reference_time.date() + timedelta(days=1):
+            label = 'tomorrow'
+        else:
+            label = start.strftime('%A, %B %d')
+        if end - start > timedelta(days=1):
+            return f"{label} to {(end - timedelta(minutes=1)).strftime('%A, %B %d')}"
+        if start.time() == end.time() or start == reference_time:
+            return label
+        return f"{label} {start.strftime('%I:%M %p')}-{end.strftime('%I:%M %p')}"
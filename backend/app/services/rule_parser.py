@@ -0,0 +1,419 @@
+from datetime import date, datetime, time, timedelta
+import re
+from typing import List, Optional, Tuple
+from ..models.intent import EventIntent
+
+# A deterministic parser for the phrasings most requests use ("standup tomorrow at 9am",
+# "lunch with bob@example.com on March 3 12-1pm at Cafe Rio"). Each recognized piece is
+# cut out of the text and whatever is left becomes the title; the confidence score
+# drops for anything the grammar could not account for, so callers know when to fall
+# back to the LLM.
+
+WEEKDAYS = {
+    'monday': 0, 'mon': 0, 'tuesday': 1, 'tue': 1, 'tues': 1, 'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3, 'friday': 4, 'fri': 4,
+    'saturday': 5, 'sat': 5, 'sunday': 6, 'sun': 6
+}
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+# Chat shorthand for relative days
+DAY_SHORTHAND = {'tmrw': 'tomorrow', 'tmr': 'tomorrow', 'tmrow': 'tomorrow', '2moro': 'tomorrow',
+                 'tdy': 'today', 'tonite': 'tonight', '2nite': 'tonight'}
+NUMBER_WORDS = {'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4}
+PRIORITY_WORDS = {'urgent': 'urgent', 'urgently': 'urgent', 'asap': 'urgent'}
+
+_MONTH = r'(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_WEEKDAY = r'(?P<weekday>' + '|'.join(sorted(WEEKDAYS, key=len, reverse=True)) + r')'
+_YEAR = r'(?:,? (?P<year>\d{4}))?'
+
+
+def _clock(prefix: str) -> str:
+    return (rf'(?P<{prefix}h>\d{{1,2}})(?::(?P<{prefix}m>\d{{2}}))?'
+            rf'(?:\s*(?P<{prefix}ap>[ap])\.?m\b\.?)?')
+
+
+def _compile(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+EMAIL = _compile(r'(?:\b(?:with|and|invite|inviting)\s+|,\s*)?(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)')
+# "book", "plan" and "make" also start titles ("book club"), so they are verbs only before an object
+_OBJECT = r'(?=\s+(?:a|an|the|my|our|some|another|time|me|us|him|her|them)\b)'
+LEADING_VERB = _compile(
+    rf'^\s*(?:please\s+)?(?:(?P<create>schedule|create|add|set up|put|arrange|(?:book|plan|make){_OBJECT})'
+    r'|(?P<delete>cancel|delete|remove|clear)'
+    r'|(?P<update>move|reschedule|change|push|update|shift)'
+    r'|(?P<query>what|when|show|list|do i|am i|how|is there|are there|find))\b'
+)
+ISO_DATE = _compile(r'\b(?:on\s+)?(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b')
+SLASH_DATE = _compile(r'\b(?:on\s+)?(?P<month>\d{1,2})/(?P<day>\d{1,2})(?:/(?P<year>\d{2}|\d{4}))?\b')
+MONTH_DAY = _compile(rf'\b(?:on\s+)?{_MONTH} (?P<day>\d{{1,2}})(?:st|nd|rd|th)?\b{_YEAR}')
+DAY_MONTH = _compile(rf'\b(?:on\s+)?(?:the\s+)?(?P<day>\d{{1,2}})(?:st|nd|rd|th)? (?:of )?{_MONTH}{_YEAR}')
+_RELATIVE_WORD = r'(?:tomorrow|today|tonight|' + '|'.join(DAY_SHORTHAND) + r')'
+RELATIVE_DAY = _compile(rf'\b(?P<word>(?:the\s+)?day after (?:tomorrow|tmrw|tmr)|{_RELATIVE_WORD})\b')
+IN_DAYS = _compile(r'\bin (?P<count>\d+) days?\b')
+WEEKDAY = _compile(rf'\b(?:(?P<qualifier>on|this|next)\s+)?{_WEEKDAY}\b')
+IN_DELTA = _compile(r'\bin (?P<count>\d+|an?|one|two|three|four) (?P<unit>hours?|hrs?|minutes?|mins?)\b')
+DURATION = _compile(
+    r'\bfor (?:(?P<half>half an hour)|(?P<count>\d+(?:\.\d+)?|an?|one|two|three|four)\s*'
+    r'(?P<unit>hours?|hrs?|h|minutes?|mins?|m)\b(?P<and_half> and a half)?)'
+)
+TIME_RANGE = _compile(
+    rf'\b(?P<prefix>from\s+|between\s+)?{_clock("a")}\s*(?:-|–|to|until|till|and)\s*{_clock("b")}(?![\w/:])'
+)
+NAMED_TIME = _compile(r'\b(?:at\s+)?(?P<name>noon|midday|midnight)\b')
+SINGLE_TIME = _compile(rf'(?:\b(?P<prefix>at|@|by)\s*)?\b{_clock("")}(?![\w/:])')
+PRIORITY = _compile(r'\b(?:(?P<level>low|medium|high)(?:\s+|-)priority|(?P<word>urgent|urgently|asap))\b')
+LOCATION = _compile(
+    r'\b(?P<prep>at|in)\s+(?P<place>(?:the|room|building)\b[^,;]*?|[A-Z][^,;]*?)'
+    r'(?=\s+(?:on|at|for|from|with|tomorrow|tmrw|tmr|today|tonight|next|this|between)\b|\s*[,;]|\s*$)'
+)
+PART_OF_DAY = _compile(r'\b(?:this\s+|in\s+the\s+)?(?P<part>morning|afternoon|evening|night)\b')
+WEEK = _compile(r'\b(?P<which>this|next)\s+week\b')
+# Verbs that ask for a change anywhere in the text ("can you schedule ...?", "find time to move ...")
+ACTION_VERB = _compile(
+    r'\b(?:schedule|create|add|book|set up|put|plan|arrange|make|cancel|delete|remove|clear'
+    r'|move|reschedule|change|push|update|shift)\b'
+)
+# The question forms that ask about the calendar itself, not about anything else
+_CALENDAR_WORDS = r'(?:schedule|agenda|calendar|plans?|meetings?|events?|appointments?|day|week)'
+CALENDAR_QUESTION = _compile(
+    r'^\s*(?:please\s+)?(?:'
+    r'what\s+(?:do\s+i\s+have|have\s+i\s+got|am\s+i\s+doing)'
+    r"|what(?:'s|\s+is|\s+are)\s+(?:on|happening|planned|scheduled|left|coming up)\b"
+    rf"|what(?:'s|\s+is|\s+are)\s+(?:my|the)\s+{_CALENDAR_WORDS}"
+    r'|what\s+(?:meetings|events|appointments)\b'
+    rf'|(?:show|list|give|tell)(?:\s+me)?\s+(?:my|the|all|today\'s|tomorrow\'s)?\s*{_CALENDAR_WORDS}\b'
+    r'|do\s+i\s+have\s+(?:anything|any|something|meetings|events|plans)\b'
+    r'|(?:is|are)\s+there\s+(?:anything|time|room|any\s+(?:time|meetings|events|appointments))\b'
+    r'|am\s+i\s+(?:free|busy|available|booked)\b'
+    r'|when\s+am\s+i\s+(?:free|busy|available)\b'
+    r'|how\s+(?:busy|free)\s+am\s+i\b'
+    rf'|how\s+(?:does|do)\s+(?:my|the)\s+(?:{_CALENDAR_WORDS}|morning|afternoon|evening)\s+look'
+    r')'
+)
+FREE_QUESTION = _compile(r'\b(?:free|available|availability|open|time for|room for)\b')
+# Wall-clock hours [start, end) each part of the day covers
+PARTS_OF_DAY = {'morning': (6, 12), 'afternoon': (12, 17), 'evening': (17, 22), 'night': (17, 24)}
+# Words that mean the text held more timing than the grammar resolved
+UNRESOLVED = _compile(
+    r'\b(?:morning|afternoon|evening|night|week|weekend|month|year|later|soon|early|late|'
+    r'end of|every|each|daily|weekly|monthly|before|after|until|next|last)\b|\d'
+)
+# Where a request for several actions may divide ("move standup to 10 and cancel the review")
+CLAUSE_BREAK = _compile(r'\s*;\s*|,?\s+(?:and\s+then|and\s+also|and|then|also)\s+|,\s*')
+# A title that may be a verb and its object after all ("Book lunch") or a name ("Book club")
+AMBIGUOUS_TITLE = _compile(r'^(?:book|plan|make)\s+\S+$')
+CONNECTORS = _compile(
+    r'^(?:[\s,-]+|(?:on|at|for|from|with|and|to|a|an|the|my)\b)+|(?:[\s,-]+|\b(?:on|at|for|from|with|and|to))+$'
+)
+
+
+class _Text:
+    """The input with every recognized span blanked out as parsing proceeds."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def take(self, pattern: re.Pattern, accept=None) -> Optional[re.Match]:
+        for match in pattern.finditer(self.text):
+            if accept is None or accept(match):
+                self.text = self.text[:match.start()] + ' ' + self.text[match.end():]
+                return match
+        return None
+
+    def take_all(self, pattern: re.Pattern) -> List[re.Match]:
+        matches = list(pattern.finditer(self.text))
+        for match in reversed(matches):
+            self.text = self.text[:match.start()] + ' ' + self.text[match.end():]
+        return matches
+
+
+def _number(word: str) -> float:
+    return NUMBER_WORDS.get(word.lower()) or float(word)
+
+
+def _unit_minutes(unit: str) -> int:
+    return 60 if unit.lower().startswith('h') else 1
+
+
+def _valid_clock(match: re.Match, prefix: str) -> bool:
+    hour, minute = int(match.group(f'{prefix}h')), match.group(f'{prefix}m')
+    return hour <= 23 and (minute is None or int(minute) <= 59)
+
+
+def _clock_time(match: re.Match, prefix: str, meridiem: Optional[str] = None) -> Tuple[time, bool]:
+    """Resolve a matched clock to a time; the flag says whether am/pm had to be guessed."""
+    hour, minute = int(match.group(f'{prefix}h')), int(match.group(f'{prefix}m') or 0)
+    meridiem = (match.group(f'{prefix}ap') or meridiem or '').lower()
+    guessed = False
+    if meridiem == 'p' and hour < 12:
+        hour += 12
+    elif meridiem == 'a' and hour == 12:
+        hour = 0
+    elif not meridiem and 1 <= hour <= 7 and match.group(f'{prefix}m') is None:
+        # "at 3" almost always means the afternoon
+        hour += 12
+        guessed = True
+    elif not meridiem and hour <= 12:
+        guessed = hour != 12
+    return time(hour, minute), guessed
+
+
+def _resolve_date(text: _Text, today: date) -> Optional[date]:
+    match = text.take(ISO_DATE)
+    if match:
+        return date(int(match.group('year')), int(match.group('month')), int(match.group('day')))
+
+    for pattern in (SLASH_DATE, MONTH_DAY, DAY_MONTH):
+        match = text.take(pattern)
+        if match:
+            month = match.group('month')
+            month = int(month) if month.isdigit() else MONTHS[month[:3].lower()]
+            year = match.group('year')
+            if year:
+                year = int(year) + (2000 if len(year) == 2 else 0)
+                return date(year, month, int(match.group('day')))
+            resolved = date(today.year, month, int(match.group('day')))
+            # A date without a year that already passed means next year's
+            return resolved if resolved >= today else resolved.replace(year=today.year + 1)
+
+    match = text.take(RELATIVE_DAY)
+    if match:
+        word = match.group('word').lower()
+        word = DAY_SHORTHAND.get(word, word)
+        return today + timedelta(days=2 if 'after' in word else 1 if word == 'tomorrow' else 0)
+
+    match = text.take(IN_DAYS)
+    if match:
+        return today + timedelta(days=int(match.group('count')))
+
+    match = text.take(WEEKDAY)
+    if match:
+        weekday = WEEKDAYS[match.group('weekday').lower()]
+        if (match.group('qualifier') or '').lower() == 'next':
+            # "next friday" is the Friday of next week, like "next week" is Monday to Monday
+            return today + timedelta(days=7 - today.weekday() + weekday)
+        return today + timedelta(days=(weekday - today.weekday()) % 7)
+    return None
+
+
+def parse_event_text(user_input: str, reference_time: Optional[datetime] = None,
+                     default_duration: int = 60) -> EventIntent:
+    """Parse common phrasings into an EventIntent whose confidence is in [0, 1].
+
+    Times come out in reference_time's timezone (naive if it is naive).
+    """
+    reference_time = reference_time or datetime.now()
+    text = _Text(user_input)
+    confidence = 1.0
+
+    attendees = [match.group('email') for match in text.take_all(EMAIL)] or None
+
+    action = 'create'
+    match = text.take(LEADING_VERB)
+    if match:
+        action = match.lastgroup
+    if action != 'create' or user_input.rstrip().endswith('?'):
+        # Updates, deletions and queries need the target event or the question resolved
+        action = 'query' if action == 'create' else action
+        confidence -= 0.6
+
+    priority = 'medium'
+    match = text.take(PRIORITY)
+    if match:
+        priority = (match.group('level') or PRIORITY_WORDS[match.group('word').lower()]).lower()
+
+    evening = re.search(r'\b(?:tonight|tonite|2nite)\b', text.text, re.IGNORECASE) is not None
+    try:
+        event_date = _resolve_date(text, reference_time.date())
+    except ValueError:
+        # Something date-shaped that is not a real date ("2/30")
+        event_date = None
+        confidence -= 0.6
+
+    start = None
+    match = text.take(IN_DELTA)
+    if match:
+        minutes = _number(match.group('count')) * _unit_minutes(match.group('unit'))
+        start = (reference_time + timedelta(minutes=minutes)).replace(second=0, microsecond=0)
+        event_date = start.date()
+
+    duration = None
+    match = text.take(DURATION)
+    if match:
+        if match.group('half'):
+            duration = 30
+        else:
+            amount = _number(match.group('count')) + (0.5 if match.group('and_half') else 0)
+            duration = int(amount * _unit_minutes(match.group('unit')))
+
+    start_clock = end_clock = None
+    match = text.take(TIME_RANGE, lambda m: _valid_clock(m, 'a') and _valid_clock(m, 'b') and (
+        m.group('prefix') or m.group('aap') or m.group('bap') or m.group('am') or m.group('bm')))
+    if match:
+        end_clock, end_guessed = _clock_time(match, 'b')
+        start_clock, start_guessed = _clock_time(match, 'a', match.group('bap'))
+        if start_clock > end_clock and not match.group('aap'):
+            # "11-1pm" runs from the morning into the afternoon
+            start_clock, start_guessed = _clock_time(match, 'a', 'a')
+        if start_guessed or end_guessed:
+            confidence -= 0.15
+    else:
+        match = text.take(NAMED_TIME)
+        if match:
+            start_clock = time(0) if match.group('name').lower() == 'midnight' else time(12)
+        else:
+            match = text.take(SINGLE_TIME, lambda m: _valid_clock(m, '') and bool(
+                m.group('prefix') or m.group('ap') or m.group('m')))
+            if match:
+                start_clock, guessed = _clock_time(match, '')
+                if guessed and evening and start_clock.hour < 12:
+                    start_clock = start_clock.replace(hour=start_clock.hour + 12)
+                elif guessed:
+                    confidence -= 0.15
+
+    if start is None and start_clock is not None:
+        explicit_date = event_date is not None
+        start = datetime.combine(event_date or reference_time.date(), start_clock, reference_time.tzinfo)
+        if not explicit_date and start < reference_time:
+            # "at 9am" said after 9am means tomorrow
+            start += timedelta(days=1)
+            confidence -= 0.1
+
+    end = None
+    if start is not None:
+        if end_clock is not None and duration is None:
+            end = datetime.combine(start.date(), end_clock, start.tzinfo)
+            if end <= start:
+                end += timedelta(days=1)
+        elif duration is not None or action != 'update':
+            # An update that names no end or length keeps the event's own, so it gets none here
+            end = start + timedelta(minutes=duration or default_duration)
+    else:
+        # Only the LLM can place an event nobody gave a time for
+        confidence -= 0.6
+
+    location = None
+    match = text.take(LOCATION)
+    if match:
+        location = match.group('place').strip()
+
+    title = CONNECTORS.sub('', re.sub(r'\s+', ' ', text.text).strip(' ,.!?')).strip(' ,.!?')
+    if not title:
+        confidence -= 0.5
+    else:
+        title = title[0].upper() + title[1:]
+        confidence -= 0.3 * len(UNRESOLVED.findall(title))
+        if len(title.split()) > 8:
+            confidence -= 0.2
+        if AMBIGUOUS_TITLE.match(title):
+            confidence -= 0.5
+
+    return EventIntent(
+        action=action,
+        title=title or None,
+        start_time=start,
+        end_time=end,
+        location=location,
+        attendees=attendees,
+        priority=priority,
+        duration_minutes=(int((end - start).total_seconds() // 60) if start and end
+                          else duration or (None if action == 'update' else default_duration)),
+        confidence=round(max(0.0, min(1.0, confidence)), 2)
+    )
+
+
+def split_actions(user_input: str) -> List[str]:
+    """Split a request for several actions into one clause per action.
+
+    Text only divides at "and", "then", commas or semicolons followed by an action verb,
+    so "lunch with bob and alice" stays whole.
+    """
+    clauses = []
+    start = 0
+    for match in CLAUSE_BREAK.finditer(user_input):
+        verb = LEADING_VERB.match(user_input[match.end():])
+        if verb and not verb.group('query') and user_input[start:match.start()].strip():
+            clauses.append(user_input[start:match.start()].strip())
+            start = match.end()
+    clauses.append(user_input[start:].strip())
+    return [clause for clause in clauses if clause]
+
+
+def query_window(user_input: str, reference_time: Optional[datetime] = None,
+                 default_duration: int = 60) -> Optional[Tuple[datetime, datetime]]:
+    """The [start, end) a calendar question asks about, or None if it is not one.
+
+    Only the CALENDAR_QUESTION forms count, and never with an action verb anywhere in
+    the text, so "can you book lunch friday?" or "what is the weather?" are left to
+    the full parse. "what do I have friday afternoon" covers Friday 12:00-17:00, "am I
+    free at 3" the hour from 3pm, "what's on next week" Monday to Monday; a question
+    naming no time at all is about the rest of today.
+    """
+    reference_time = reference_time or datetime.now()
+    text = _Text(user_input)
+    if not CALENDAR_QUESTION.match(user_input) or ACTION_VERB.search(user_input):
+        return None
+
+    today = reference_time.date()
+    match = text.take(WEEK)
+    if match:
+        monday = today - timedelta(days=today.weekday())
+        if match.group('which').lower() == 'next':
+            return _at(monday + timedelta(days=7), 0, reference_time), _at(monday + timedelta(days=14), 0, reference_time)
+        return reference_time, _at(monday + timedelta(days=7), 0, reference_time)
+
+    evening = re.search(r'\b(?:tonight|tonite|2nite)\b', text.text, re.IGNORECASE) is not None
+    try:
+        day = _resolve_date(text, today)
+    except ValueError:
+        return None
+
+    match = text.take(TIME_RANGE, lambda m: _valid_clock(m, 'a') and _valid_clock(m, 'b'))
+    if match:
+        end_clock, _ = _clock_time(match, 'b')
+        start_clock, _ = _clock_time(match, 'a', match.group('bap'))
+        if start_clock > end_clock and not match.group('aap'):
+            start_clock, _ = _clock_time(match, 'a', 'a')
+        start = datetime.combine(day or today, start_clock, reference_time.tzinfo)
+        end = datetime.combine(day or today, end_clock, reference_time.tzinfo)
+        return start, end if end > start else end + timedelta(days=1)
+
+    start_clock = None
+    match = text.take(NAMED_TIME)
+    if match:
+        start_clock = time(0) if match.group('name').lower() == 'midnight' else time(12)
+    else:
+        match = text.take(SINGLE_TIME, lambda m: _valid_clock(m, '') and bool(
+            m.group('prefix') or m.group('ap') or m.group('m')))
+        if match:
+            start_clock, guessed = _clock_time(match, '')
+            if guessed and evening and start_clock.hour < 12:
+                start_clock = start_clock.replace(hour=start_clock.hour + 12)
+    if start_clock is not None:
+        duration = default_duration
+        match = text.take(DURATION)
+        if match:
+            duration = 30 if match.group('half') else int(
+                (_number(match.group('count')) + (0.5 if match.group('and_half') else 0))
+                * _unit_minutes(match.group('unit')))
+        start = datetime.combine(day or today, start_clock, reference_time.tzinfo)
+        if day is None and start < reference_time:
+            start += timedelta(days=1)
+        return start, start + timedelta(minutes=duration)
+
+    match = text.take(PART_OF_DAY)
+    part = match.group('part').lower() if match else 'night' if evening else None
+    if part:
+        first_hour, last_hour = PARTS_OF_DAY[part]
+        return _at(day or today, first_hour, reference_time), _at(day or today, last_hour, reference_time)
+    if day is None or day == today:
+        return reference_time, _at(today + timedelta(days=1), 0, reference_time)
+    return _at(day, 0, reference_time), _at(day + timedelta(days=1), 0, reference_time)
+
+
+def _at(day: date, hour: int, reference_time: datetime) -> datetime:
+    return datetime.combine(day, time(0), reference_time.tzinfo) + timedelta(hours=hour)
@@ -1,14 +1,18 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
 from ..config import get_settings
 from .calendar import CalendarService
 from .nlp import NLPService
+from ..utils.event_times import event_bounds, to_utc
+from ..utils.availability import Availability
 
 class SchedulerService:
-    def __init__(self):
+    def __init__(self, calendar_service: Optional[CalendarService] = None, nlp_service: Optional[NLPService] = None):
         self.settings = get_settings()
-        self.calendar_service = CalendarService()
-        self.nlp_service = NLPService()
+        # Share the app's services when given so reads hit the same event mirror
+        self.calendar_service = calendar_service or CalendarService()
+        self.nlp_service = nlp_service or NLPService()
 
     def schedule_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Schedule a task in the calendar based on priority and available time."""
@@ -18,77 +22,156 @@ class SchedulerService:
         # Get the preferred date
         preferred_date = task.get('preferred_date', datetime.now().date())
         
-        # Find available time slots
-        free_slots = self.calendar_service.find_free_slots(
-            datetime.combine(preferred_date, datetime.min.time()),
-            duration_minutes
+        # Search the preferred date and the day after in a single read; the earliest
+        # fit only falls through to the next day if the preferred date has no room
+        window_start = datetime.combine(preferred_date, time.min)
+        free = self.calendar_service.free_time(
+            window_start,
+            window_start + timedelta(days=2),
+            working_hours=self._working_hours(),
+            buffer_minutes=self.settings.MEETING_BUFFER_MINUTES
         )
+        start_time = self._select_best_start(free, duration_minutes, task.get('priority', 'medium'), preferred_date)
         
-        if not free_slots:
-            # If no slots available on preferred date, try next day
-            next_date = preferred_date + timedelta(days=1)
-            free_slots = self.calendar_service.find_free_slots(
-                datetime.combine(next_date, datetime.min.time()),
-                duration_minutes
-            )
-        
-        if not free_slots:
+        if start_time is None:
             raise ValueError("No suitable time slots found for the task")
         
-        # Select the best time slot based on priority
-        selected_slot = self._select_best_slot(free_slots, task.get('priority', 'medium'))
-        
         # Create the calendar event
         event_data = {
             'title': task['title'],
-            'start_time': selected_slot['start'],
-            'end_time': selected_slot['end'],
+            'start_time': start_time,
+            'end_time': start_time + timedelta(minutes=duration_minutes),
             'description': task.get('description', ''),
             'priority': task.get('priority', 'medium')
         }
         
         return self.calendar_service.create_event(event_data)
 
-    def _select_best_slot(self, free_slots: List[Dict[str, datetime]], priority: str) -> Dict[str, datetime]:
-        """Select the best time slot based on priority and time of day."""
+    def _select_best_start(self, free: Availability, duration_minutes: int, priority: str,
+                           preferred_date) -> Optional[datetime]:
+        """Select the best start based on priority and time of day."""
         if priority == 'high' or priority == 'urgent':
-            # For high priority tasks, prefer morning slots
-            morning_slots = [slot for slot in free_slots if slot['start'].hour < 12]
-            if morning_slots:
-                return morning_slots[0]
-        
-        # For medium and low priority tasks, return the first available slot
-        return free_slots[0]
+            # For high priority tasks, prefer a morning start on the preferred date
+            tz = ZoneInfo(self.settings.DEFAULT_TIMEZONE)
+            morning_start = free.first_fit(
+                duration_minutes,
+                not_before=datetime.combine(preferred_date, time.min, tz),
+                before=datetime.combine(preferred_date, time(12), tz) + timedelta(minutes=duration_minutes)
+            )
+            if morning_start is not None:
+                return morning_start
+
+        # For medium and low priority tasks, take the first available start
+        return free.first_fit(duration_minutes)
+
+    def schedule_tasks(self, tasks: List[Dict[str, Any]], start: Optional[datetime] = None, horizon_days: int = 14,
+                       strategy: str = 'edf', commit: bool = True) -> List[Dict[str, Any]]:
+        """Place many tasks in one pass over a single snapshot of free time.
+
+        The free time of the whole horizon (extended to the latest deadline) is read once
+        as an Availability. Tasks are taken by priority, then deadline, then longest first,
+        and each goes into the earliest interval that fits ('edf') or the one it fills most
+        tightly ('best_fit'), never past its deadline nor before its preferred_date; the
+        placed task and its buffer are then taken out of the free time.
+        With commit the placed tasks are created in one batch insert. Results come back
+        in input order as {'task', 'scheduled', 'start_time', 'end_time'[, 'event' | 'error']}.
+        """
+        if strategy not in ('edf', 'best_fit'):
+            raise ValueError(f"Unknown scheduling strategy: {strategy}")
+        start = to_utc(start or datetime.now())
+        deadlines = [to_utc(task['deadline']) for task in tasks if task.get('deadline')]
+        end = max([start + timedelta(days=horizon_days)] + deadlines)
+        buffer_minutes = self.settings.MEETING_BUFFER_MINUTES
+
+        durations = [task.get('duration_minutes', self.settings.DEFAULT_EVENT_DURATION) for task in tasks]
+        free = self.calendar_service.free_time(
+            start, end,
+            working_hours=self._working_hours(),
+            working_days=self.settings.WORKING_DAYS,
+            buffer_minutes=buffer_minutes
+        )
+
+        priority_rank = {priority: i for i, priority in enumerate(self.settings.PRIORITY_LEVELS)}
+        order = sorted(range(len(tasks)), key=lambda i: (
+            -priority_rank.get(tasks[i].get('priority', 'medium'), 1),
+            to_utc(tasks[i]['deadline']) if tasks[i].get('deadline') else end,
+            -durations[i]
+        ))
+
+        results: List[Dict[str, Any]] = [{'task': task.get('title'), 'scheduled': False} for task in tasks]
+        placed = []
+        for i in order:
+            task, duration = tasks[i], durations[i]
+            release = start
+            if task.get('preferred_date'):
+                release = max(start, to_utc(datetime.combine(task['preferred_date'], time.min)))
+            deadline = to_utc(task['deadline']) if task.get('deadline') else end
+
+            fit = free.first_fit if strategy == 'edf' else free.best_fit
+            slot_start = fit(duration, not_before=release, before=deadline)
+            if slot_start is None:
+                results[i]['reason'] = "No free interval fits before the deadline"
+                continue
+
+            slot_end = slot_start + timedelta(minutes=duration)
+            free -= Availability.from_intervals([(slot_start, slot_end)], buffer_minutes)
+            results[i].update(scheduled=True, start_time=slot_start, end_time=slot_end)
+            placed.append(i)
+
+        if commit and placed:
+            placed.sort(key=lambda i: results[i]['start_time'])
+            created = self.calendar_service.batch_create_events([
+                {
+                    'title': tasks[i]['title'],
+                    'start_time': results[i]['start_time'],
+                    'end_time': results[i]['end_time'],
+                    'description': tasks[i].get('description', ''),
+                    'priority': tasks[i].get('priority', 'medium')
+                }
+                for i in placed
+            ])
+            for i, outcome in zip(placed, created):
+                results[i]['event' if outcome['success'] else 'error'] = outcome.get('event', outcome.get('error'))
+        return results
+
+    def _working_hours(self) -> Tuple[time, time]:
+        """Working hours from settings as (start, end) wall-clock times."""
+        return (
+            time.fromisoformat(self.settings.WORKING_HOURS_START),
+            time.fromisoformat(self.settings.WORKING_HOURS_END)
+        )
 
     def reschedule_conflicts(self, event_id: str, new_time: datetime) -> Dict[str, Any]:
         """Reschedule an event and handle any conflicts."""
         # Get the original event
-        original_event = self.calendar_service.service.events().get(
-            calendarId='primary',
-            eventId=event_id
-        ).execute()
+        original_event = self.calendar_service.get_event(event_id)
         
         # Calculate duration
-        start_time = datetime.fromisoformat(original_event['start']['dateTime'].replace('Z', '+00:00'))
-        end_time = datetime.fromisoformat(original_event['end']['dateTime'].replace('Z', '+00:00'))
+        start_time, end_time = event_bounds(original_event)
         duration = end_time - start_time
+        new_time = to_utc(new_time)
         
-        # Check for conflicts at new time
-        conflicts = self.calendar_service.check_conflicts(new_time, new_time + duration)
+        # Check for conflicts at new time, ignoring the event being moved
+        conflicts = [
+            event for event in self.calendar_service.check_conflicts(new_time, new_time + duration)
+            if event.get('id') != event_id
+        ]
         
         if conflicts:
-            # Find alternative time slots
-            free_slots = self.calendar_service.find_free_slots(
-                new_time.date(),
-                int(duration.total_seconds() / 60)
+            # Find alternative time slots on the requested day
+            day_start = new_time.replace(hour=0, minute=0, second=0, microsecond=0)
+            free = self.calendar_service.free_time(
+                day_start,
+                day_start + timedelta(days=1),
+                buffer_minutes=self.settings.MEETING_BUFFER_MINUTES,
+                ignore_event_ids=[event_id]
             )
             
-            if not free_slots:
+            # Select the closest start that still fits inside a free gap
+            nearest = free.nearest_fit(int(duration.total_seconds() // 60), new_time)
+            if nearest is None:
                 raise ValueError("No suitable alternative time slots found")
-            
-            # Select the closest available slot
-            selected_slot = min(free_slots, key=lambda x: abs(x['start'] - new_time))
-            new_time = selected_slot['start']
+            new_time = nearest
         
         # Update the event
         event_data = {
@@ -104,13 +187,13 @@ class SchedulerService:
         if 'start_time' not in block_data or 'end_time' not in block_data:
             raise ValueError("Start time and end time are required for time blocks")
         
-        # Check for conflicts
-        conflicts = self.calendar_service.check_conflicts(
+        # Check for conflicts using busy intervals only
+        busy = self.calendar_service.get_busy_intervals(
             block_data['start_time'],
             block_data['end_time']
         )
         
-        if conflicts:
+        if any(busy.values()):
             raise ValueError("Time block conflicts with existing events")
         
         # Create the time block event
@@ -125,88 +208,134 @@ class SchedulerService:
         return self.calendar_service.create_event(event_data)
 
     def suggest_routine_times(self, routine_data: Dict[str, Any]) -> List[Dict[str, datetime]]:
-        """Suggest optimal times for recurring routines based on existing schedule."""
+        """Suggest optimal times for recurring routines based on existing schedule.
+
+        One free-interval read covers the whole horizon (horizon_days, a week by default,
+        from start or today), so weeks or months cost the same single listing. Each
+        matching day gets the start closest to preferred_time that still fits in one of
+        its free intervals; without a preferred time, its earliest free start.
+        """
         duration_minutes = routine_data.get('duration_minutes', self.settings.DEFAULT_EVENT_DURATION)
         preferred_time = routine_data.get('preferred_time')
+        if isinstance(preferred_time, str):
+            preferred_time = time.fromisoformat(preferred_time)
         days_of_week = routine_data.get('days_of_week', [0, 1, 2, 3, 4])  # Monday to Friday by default
-        
+        horizon_days = routine_data.get('horizon_days', 7)
+        duration = timedelta(minutes=duration_minutes)
+        tz = ZoneInfo(self.settings.DEFAULT_TIMEZONE)
+
+        first_date = routine_data.get('start') or datetime.now(tz).date()
+        if isinstance(first_date, datetime):
+            first_date = first_date.date()
+        window_start = datetime.combine(first_date, time.min, tz)
+        free = self.calendar_service.free_time(
+            window_start,
+            window_start + timedelta(days=horizon_days),
+            working_days=days_of_week,
+            buffer_minutes=self.settings.MEETING_BUFFER_MINUTES
+        )
+
         suggestions = []
-        current_date = datetime.now().date()
-        
-        # Look ahead for the next 7 days
-        for _ in range(7):
-            if current_date.weekday() in days_of_week:
-                # Get free slots for the day
-                free_slots = self.calendar_service.find_free_slots(
-                    datetime.combine(current_date, datetime.min.time()),
-                    duration_minutes
-                )
-                
-                if free_slots:
-                    # If preferred time is specified, try to find the closest slot
-                    if preferred_time:
-                        best_slot = min(
-                            free_slots,
-                            key=lambda x: abs(x['start'].time() - preferred_time)
-                        )
-                    else:
-                        best_slot = free_slots[0]
-                    
-                    suggestions.append({
-                        'date': current_date,
-                        'start_time': best_slot['start'],
-                        'end_time': best_slot['end']
-                    })
-            
-            current_date += timedelta(days=1)
-        
+        for offset in range(horizon_days):
+            current_date = first_date + timedelta(days=offset)
+            if current_date.weekday() not in days_of_week:
+                continue
+            day_start = datetime.combine(current_date, time.min, tz)
+            day_end = datetime.combine(current_date + timedelta(days=1), time.min, tz)
+            if preferred_time:
+                target = datetime.combine(current_date, preferred_time, tz)
+                best_start = free.nearest_fit(duration_minutes, target, not_before=day_start, before=day_end)
+            else:
+                best_start = free.first_fit(duration_minutes, not_before=day_start, before=day_end)
+            if best_start is None:
+                continue
+
+            suggestions.append({
+                'date': current_date,
+                'start_time': best_start,
+                'end_time': best_start + duration
+            })
+
         return suggestions
 
-    def optimize_schedule(self, date: datetime) -> List[Dict[str, Any]]:
-        """Optimize the schedule for a given date based on priorities and preferences."""
-        # Get all events for the date
-        events = self.calendar_service.get_daily_agenda(date)
-        
-        # Sort events by priority
+    def optimize_schedule(self, date: datetime, apply: bool = False) -> Dict[str, Any]:
+        """Optimize the schedule for a given date based on priorities and preferences.
+
+        The whole plan is worked out in memory against one listing of the day: events
+        are kept in priority order (earlier first among equals), and each one that
+        overlaps an event already kept moves to the free start nearest its own, avoiding
+        the kept events and, where possible, the ones still to come. Nothing is written
+        unless apply is set; the returned plan is a dry run with 'moves' (the diff),
+        'unresolved' events and the resulting 'schedule'. Passing that plan to
+        apply_schedule_plan, or apply=True here, writes every move in one batch patch.
+        """
+        plan = self.plan_schedule(date)
+        if apply:
+            plan['applied'] = self.apply_schedule_plan(plan)
+        return plan
+
+    def plan_schedule(self, date: datetime) -> Dict[str, Any]:
+        """Work out optimize_schedule's plan for date without writing anything.
+
+        Returns {'date', 'moves', 'unresolved', 'schedule'}: each move is
+        {'event_id', 'title', 'from', 'to'} with 'from' and 'to' as {'start', 'end'};
+        each unresolved entry is {'event_id', 'title', 'reason'} for an event that
+        found no free time; 'schedule' lists every timed event of the day as
+        {'event_id', 'title', 'start_time', 'end_time'} after the moves, by start time.
+        """
+        events = [
+            event for event in self.calendar_service.get_daily_agenda(date)
+            if event.get('start', {}).get('dateTime') and event.get('transparency') != 'transparent'
+        ]
         priority_order = {priority: i for i, priority in enumerate(self.settings.PRIORITY_LEVELS)}
-        sorted_events = sorted(
+        bounds = {event['id']: event_bounds(event) for event in events}
+        ordered = sorted(
             events,
-            key=lambda x: priority_order.get(x.get('priority', 'medium'), 0)
+            key=lambda event: (-priority_order.get(event.get('priority', 'medium'), 1), bounds[event['id']][0])
         )
-        
-        # Check for conflicts and suggest rescheduling
-        optimized_schedule = []
-        for event in sorted_events:
-            start_time = datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(event['end']['dateTime'].replace('Z', '+00:00'))
-            
-            # Check for conflicts with already optimized events
-            conflicts = [
-                e for e in optimized_schedule
-                if (start_time < e['end_time'] and end_time > e['start_time'])
-            ]
-            
-            if conflicts:
-                # Try to reschedule the event
-                try:
-                    rescheduled = self.reschedule_conflicts(event['id'], start_time)
-                    optimized_schedule.append({
-                        'event': rescheduled,
-                        'start_time': datetime.fromisoformat(rescheduled['start']['dateTime'].replace('Z', '+00:00')),
-                        'end_time': datetime.fromisoformat(rescheduled['end']['dateTime'].replace('Z', '+00:00'))
-                    })
-                except ValueError:
-                    # If rescheduling fails, keep the original time
-                    optimized_schedule.append({
-                        'event': event,
-                        'start_time': start_time,
-                        'end_time': end_time
+        day_start = to_utc(date.replace(hour=0, minute=0, second=0, microsecond=0))
+        buffer_minutes = self.settings.MEETING_BUFFER_MINUTES
+
+        # pending[p] is the time taken by the events after position p, padded by the buffer
+        pending = [Availability()] * (len(ordered) + 1)
+        for position in range(len(ordered) - 1, -1, -1):
+            pending[position] = pending[position + 1] | Availability.from_intervals(
+                [bounds[ordered[position]['id']]], buffer_minutes)
+
+        kept: List[Tuple[datetime, datetime]] = []
+        free = Availability.window(day_start, day_start + timedelta(days=1))
+        moves, unresolved, schedule = [], [], []
+        for position, event in enumerate(ordered):
+            start_time, end_time = bounds[event['id']]
+            if any(start_time < kept_end and end_time > kept_start for kept_start, kept_end in kept):
+                minutes = int((end_time - start_time).total_seconds() // 60)
+                new_start = ((free - pending[position + 1]).nearest_fit(minutes, start_time)
+                             or free.nearest_fit(minutes, start_time))
+                if new_start is None:
+                    unresolved.append({'event_id': event['id'], 'title': event.get('summary'),
+                                       'reason': "No free time left on this day"})
+                else:
+                    new_end = new_start + (end_time - start_time)
+                    moves.append({
+                        'event_id': event['id'],
+                        'title': event.get('summary'),
+                        'from': {'start': start_time, 'end': end_time},
+                        'to': {'start': new_start, 'end': new_end}
                     })
-            else:
-                optimized_schedule.append({
-                    'event': event,
-                    'start_time': start_time,
-                    'end_time': end_time
-                })
-        
-        return optimized_schedule 
\ No newline at end of file
+                    start_time, end_time = new_start, new_end
+            kept.append((start_time, end_time))
+            free -= Availability.from_intervals([(start_time, end_time)], buffer_minutes)
+            schedule.append({'event_id': event['id'], 'title': event.get('summary'),
+                             'start_time': start_time, 'end_time': end_time})
+
+        schedule.sort(key=lambda item: item['start_time'])
+        return {'date': date, 'moves': moves, 'unresolved': unresolved, 'schedule': schedule}
+
+    def apply_schedule_plan(self, plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Write the moves of a plan from plan_schedule in one batch patch."""
+        if not plan['moves']:
+            return []
+        return self.calendar_service.batch_update_events([
+            {'event_id': move['event_id'], 'start_time': move['to']['start'], 'end_time': move['to']['end']}
+            for move in plan['moves']
+        ])
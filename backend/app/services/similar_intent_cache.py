@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from ..models.intent import EventIntent
+from . import rule_parser
+from .intent_cache import normalize_text
+
+# Everything the rule parser can re-extract from a new utterance is masked out before
+# comparing, so "team sync tmrw 10am" and "team sync tomorrow at 10" look identical.
+_TIME_PATTERNS = (
+    rule_parser.ISO_DATE, rule_parser.SLASH_DATE, rule_parser.MONTH_DAY, rule_parser.DAY_MONTH,
+    rule_parser.RELATIVE_DAY, rule_parser.IN_DAYS, rule_parser.WEEKDAY, rule_parser.IN_DELTA,
+    rule_parser.DURATION, rule_parser.TIME_RANGE, rule_parser.NAMED_TIME, rule_parser.SINGLE_TIME
+)
+_FILLER = re.compile(r'\b(?:at|on|for|from)\b|[^\w@.+-]+')
+_MERSENNE_PRIME = (1 << 61) - 1
+# Words whose presence or absence does not change what an utterance asks for
+_STOPWORDS = {'a', 'an', 'the', 'with', 'w', 'and', 'to', 'my', 'our', 'please', 'some', 'of', 'in', 'about'}
+# Spellings of one word are at least this similar (trigram Jaccard), e.g. "kickoff" and "kick-off"
+_SPELLING_SIMILARITY = 0.4
+
+
+def strip_time_tokens(text: str) -> str:
+    """The normalized utterance without the dates, times and durations the rule parser resolves."""
+    text = normalize_text(text)
+    for pattern in _TIME_PATTERNS:
+        text = pattern.sub(' ', text)
+    return ' '.join(_FILLER.sub(' ', text).split())
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    padded = f' {text} '
+    return {padded[index:index + size] for index in range(max(len(padded) - size + 1, 1))}
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    return len(first & second) / len(first | second) if first or second else 1.0
+
+
+def same_content(first: str, second: str) -> bool:
+    """Whether two masked utterances differ only in filler words and spelling.
+
+    Character similarity alone cannot tell "q1 roadmap review" from "q2 roadmap review",
+    so every content word of one must have a close spelling in the other.
+    """
+    first_words, second_words = set(first.split()) - _STOPWORDS, set(second.split()) - _STOPWORDS
+    for words, others in ((first_words - second_words, second_words), (second_words - first_words, first_words)):
+        for word in words:
+            if not any(jaccard(shingles(word), shingles(other)) >= _SPELLING_SIMILARITY for other in others):
+                return False
+    return True
+
+
+class SimilarIntentCache:
+    """LRU cache that reuses an earlier LLM parse for a near-duplicate utterance.
+
+    Utterances are compared with their time tokens masked out, by the Jaccard similarity
+    of their character trigrams, estimated with MinHash signatures; locality-sensitive
+    hashing over bands of the signature finds candidates without scanning every entry.
+    A candidate is only reused if no content word differs beyond a spelling variant.
+    A hit keeps the earlier parse's title, location, description, action and priority
+    and takes the times from the rule parser's reading of the new utterance, so only
+    utterances whose timing the rule parser fully resolves are answered here.
+    """
+
+    def __init__(self, max_size: int = 1024, threshold: float = 0.8, ttl_seconds: float = 86400,
+                 num_perm: int = 32, bands: int = 8, seed: int = 0):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(_MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+        # id -> (expires at, signature, masked text, stored fields)
+        self._entries: 'OrderedDict[int, Tuple[float, Tuple[int, ...], str, Dict[str, Any]]]' = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_seconds = 0.0
+
+    def signature(self, masked: str) -> Tuple[int, ...]:
+        hashes = [hash(shingle) & _MERSENNE_PRIME for shingle in shingles(masked)]
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in self._permutations
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def get(self, text: str, reference_time: datetime, default_duration: int = 60) -> Optional[EventIntent]:
+        """Return the intent of the most similar cached utterance with text's own times, or None."""
+        started = time.perf_counter()
+        try:
+            return self._get(text, reference_time, default_duration)
+        finally:
+            with self._lock:
+                self.lookup_seconds += time.perf_counter() - started
+
+    def _get(self, text: str, reference_time: datetime, default_duration: int) -> Optional[EventIntent]:
+        masked = strip_time_tokens(text)
+        if not masked or any(not match.group().isdigit() for match in rule_parser.UNRESOLVED.finditer(masked)):
+            # Timing the rule parser cannot re-extract ("next week", "morning") would be lost
+            with self._lock:
+                self.misses += 1
+            return None
+
+        signature = self.signature(masked)
+        with self._lock:
+            best, best_similarity = None, self.threshold
+            now = time.monotonic()
+            candidates = set().union(*(self._buckets.get(key, ()) for key in self._band_keys(signature)))
+            for entry_id in candidates:
+                expires, other, other_masked, _ = self._entries[entry_id]
+                if expires < now:
+                    self._evict(entry_id)
+                    continue
+                similarity = sum(a == b for a, b in zip(signature, other)) / len(signature)
+                if similarity >= best_similarity and same_content(masked, other_masked):
+                    best, best_similarity = entry_id, similarity
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best)
+            fields = dict(self._entries[best][3])
+
+        rule_intent = rule_parser.parse_event_text(text, reference_time, default_duration)
+        if rule_intent.start_time is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+
+        attendees = fields.pop('attendees')
+        stored_minutes = fields.pop('duration_minutes')
+        duration = None
+        if stored_minutes is not None or fields['action'] != 'update':
+            duration = timedelta(minutes=stored_minutes or default_duration)
+        if (rule_intent.end_time is not None
+                and rule_intent.end_time - rule_intent.start_time != timedelta(minutes=default_duration)):
+            # The new utterance gave its own duration or end time
+            duration = rule_intent.end_time - rule_intent.start_time
+        # duration stays None only for an update that keeps the event's own length
+        return EventIntent(
+            **fields,
+            start_time=rule_intent.start_time,
+            end_time=rule_intent.start_time + duration if duration else None,
+            attendees=rule_intent.attendees or attendees,
+            duration_minutes=int(duration.total_seconds() // 60) if duration else None
+        )
+
+    def put(self, text: str, event_intent: EventIntent) -> None:
+        masked = strip_time_tokens(text)
+        if not masked:
+            return
+        signature = self.signature(masked)
+        fields = event_intent.model_dump(include={'action', 'title', 'description', 'location', 'priority'})
+        fields['attendees'] = event_intent.attendees
+        fields['duration_minutes'] = (
+            int((event_intent.end_time - event_intent.start_time).total_seconds() // 60)
+            if event_intent.start_time and event_intent.end_time else event_intent.duration_minutes
+        )
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (time.monotonic() + self.ttl_seconds, signature, masked, fields)
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.max_size:
+                self._evict(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _evict(self, entry_id: int) -> None:
+        signature = self._entries.pop(entry_id)[1]
+        for key in self._band_keys(signature):
+            bucket = self._buckets[key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'mean_lookup_us': round(self.lookup_seconds / lookups * 1e6, 1) if lookups else 0.0
+            }
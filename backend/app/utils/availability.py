@@ -0,0 +1,271 @@
+from datetime import datetime, time, timedelta, timezone, tzinfo
+import math
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .event_times import to_utc
+from .free_slots import working_windows
+
+MINUTES_PER_DAY = 24 * 60
+_DAY_MASK = (1 << MINUTES_PER_DAY) - 1
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MINUTE = timedelta(minutes=1)
+# Per stored day: day number, leading zero bytes skipped, bytes kept
+_DAY_HEADER = struct.Struct('<iHH')
+
+
+def _minute(value: datetime, round_up: bool) -> int:
+    """Minutes since the epoch, rounded down or up to a whole minute."""
+    minutes = to_utc(value).timestamp() / 60
+    return math.ceil(minutes) if round_up else math.floor(minutes)
+
+
+def _at(minute: int) -> datetime:
+    return _EPOCH + minute * _MINUTE
+
+
+def _erode(bits: int, length: int) -> int:
+    """Keep bit i only where bits i to i + length - 1 are all set."""
+    span = 1
+    while span < length and bits:
+        step = span if span < length - span else length - span
+        bits &= bits >> step
+        span += step
+    return bits
+
+
+def _bounds(interval) -> Tuple[datetime, datetime]:
+    return (interval['start'], interval['end']) if isinstance(interval, dict) else interval
+
+
+class Availability:
+    """A set of free minutes, stored as one bitmap per UTC day.
+
+    Bit i of day d is set when minute i of that day is free, so a day costs at most
+    180 bytes however fragmented it is, and days without free time cost nothing. Union,
+    intersection and difference are bitwise operations on whole days, and first_fit
+    finds a run of set bits by eroding each day's bitmap. Runs of free time continue
+    across midnight.
+
+    Free windows keep only the whole minutes inside them, while busy intervals
+    (from_intervals, from_busy) take every minute they touch, so rounding never frees
+    time that is taken. to_bytes and from_bytes give a compact form for caching.
+    """
+
+    __slots__ = ('_days',)
+
+    def __init__(self, days: Optional[Dict[int, int]] = None):
+        self._days: Dict[int, int] = {day: bits for day, bits in (days or {}).items() if bits}
+
+    @classmethod
+    def _from_runs(cls, runs: Iterable[Tuple[int, int]]) -> 'Availability':
+        """Build from [first, last) minute runs, splitting them at midnight."""
+        days: Dict[int, int] = {}
+        for first, last in runs:
+            while first < last:
+                day, offset = divmod(first, MINUTES_PER_DAY)
+                stop = min(last - day * MINUTES_PER_DAY, MINUTES_PER_DAY)
+                days[day] = days.get(day, 0) | (((1 << (stop - offset)) - 1) << offset)
+                first = day * MINUTES_PER_DAY + stop
+        return cls(days)
+
+    @classmethod
+    def window(cls, start: datetime, end: datetime) -> 'Availability':
+        """Every whole minute inside [start, end)."""
+        return cls._from_runs([(_minute(start, round_up=True), _minute(end, round_up=False))])
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable, buffer_minutes: int = 0) -> 'Availability':
+        """Every minute touched by (start, end) pairs or {'start', 'end'} dicts, padded by buffer_minutes."""
+        runs = []
+        for interval in intervals:
+            start, end = _bounds(interval)
+            runs.append((_minute(start, round_up=False) - buffer_minutes, _minute(end, round_up=True) + buffer_minutes))
+        return cls._from_runs(runs)
+
+    @classmethod
+    def from_busy(cls, busy: Iterable, start: datetime, end: datetime,
+                  working_hours: Optional[Tuple[time, time]] = None, working_days: Optional[Sequence[int]] = None,
+                  buffer_minutes: int = 0, tz: tzinfo = timezone.utc) -> 'Availability':
+        """The free time in [start, end): working hours on working days, less busy padded by buffer_minutes.
+
+        Takes the same arguments as free_slots.find_free_intervals, without the duration.
+        """
+        free = cls._from_runs(
+            (_minute(window_start, round_up=True), _minute(window_end, round_up=False))
+            for window_start, window_end in working_windows(start, end, working_hours, working_days, tz)
+        )
+        return free - cls.from_intervals(busy, buffer_minutes)
+
+    def union(self, other: 'Availability') -> 'Availability':
+        days = dict(self._days)
+        for day, bits in other._days.items():
+            days[day] = days.get(day, 0) | bits
+        return Availability(days)
+
+    def intersection(self, other: 'Availability') -> 'Availability':
+        return Availability({
+            day: bits & other._days[day] for day, bits in self._days.items() if day in other._days
+        })
+
+    def difference(self, other: 'Availability') -> 'Availability':
+        # Only the days other touches change, so removing a single event stays cheap on a long horizon
+        result = Availability()
+        result._days = dict(self._days)
+        for day, bits in other._days.items():
+            if day in result._days:
+                remaining = result._days[day] & ~bits
+                if remaining:
+                    result._days[day] = remaining
+                else:
+                    del result._days[day]
+        return result
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def shift(self, delta: timedelta) -> 'Availability':
+        """The same free time moved by delta, which must be a whole number of minutes."""
+        minutes, rest = divmod(delta, _MINUTE)
+        if rest:
+            raise ValueError("Availability can only be shifted by whole minutes")
+        day_shift, offset = divmod(minutes, MINUTES_PER_DAY)
+        days: Dict[int, int] = {}
+        for day, bits in self._days.items():
+            moved = bits << offset
+            days[day + day_shift] = days.get(day + day_shift, 0) | (moved & _DAY_MASK)
+            if moved >> MINUTES_PER_DAY:
+                days[day + day_shift + 1] = days.get(day + day_shift + 1, 0) | (moved >> MINUTES_PER_DAY)
+        return Availability(days)
+
+    def runs(self, first_day: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """[first, last) minute runs of free time in order, joined across midnight.
+
+        With first_day, days before it are skipped, so a run reaching into that day
+        starts at its midnight.
+        """
+        current = None
+        for day in sorted(self._days):
+            if first_day is not None and day < first_day:
+                continue
+            bits, base = self._days[day], day * MINUTES_PER_DAY
+            while bits:
+                low = (bits & -bits).bit_length() - 1
+                shifted = bits >> low
+                length = (shifted ^ (shifted + 1)).bit_length() - 1
+                first, last = base + low, base + low + length
+                if current is not None and current[1] == first:
+                    current = (current[0], last)
+                else:
+                    if current is not None:
+                        yield current
+                    current = (first, last)
+                bits = (shifted >> length) << (low + length)
+        if current is not None:
+            yield current
+
+    def _clipped_runs(self, minutes: int, not_before: Optional[datetime],
+                      before: Optional[datetime]) -> Iterator[Tuple[int, int]]:
+        """Runs cut to [not_before, before) that still hold minutes."""
+        low = _minute(not_before, round_up=True) if not_before is not None else None
+        high = _minute(before, round_up=False) if before is not None else None
+        for first, last in self.runs(None if low is None else low // MINUTES_PER_DAY):
+            if high is not None and first >= high:
+                return
+            first = first if low is None else max(first, low)
+            last = last if high is None else min(last, high)
+            if last - first >= minutes:
+                yield first, last
+
+    def first_fit(self, minutes: int, not_before: Optional[datetime] = None,
+                  before: Optional[datetime] = None) -> Optional[datetime]:
+        """The earliest start of minutes free minutes inside [not_before, before), or None."""
+        low = _minute(not_before, round_up=True) if not_before is not None else None
+        high = _minute(before, round_up=False) if before is not None else None
+        # Start of a free run that reaches the end of the previous day
+        carry, previous_day = None, None
+        for day in sorted(self._days):
+            base = day * MINUTES_PER_DAY
+            if low is not None and base + MINUTES_PER_DAY <= low:
+                continue
+            if high is not None and base >= high:
+                break
+            bits = self._days[day]
+            if low is not None and low > base:
+                bits &= ~((1 << (low - base)) - 1)
+            if high is not None and high < base + MINUTES_PER_DAY:
+                bits &= (1 << (high - base)) - 1
+            if previous_day is None or day != previous_day + 1:
+                carry = None
+            previous_day = day
+
+            if carry is not None and base + (bits ^ (bits + 1)).bit_length() - 1 - carry >= minutes:
+                return _at(carry)
+            fits = _erode(bits, minutes)
+            if fits:
+                return _at(base + (fits & -fits).bit_length() - 1)
+            if bits >> (MINUTES_PER_DAY - 1):
+                busy = _DAY_MASK & ~bits
+                carry = carry if busy == 0 and carry is not None else base + busy.bit_length()
+            else:
+                carry = None
+        return None
+
+    def best_fit(self, minutes: int, not_before: Optional[datetime] = None,
+                 before: Optional[datetime] = None) -> Optional[datetime]:
+        """The start of the run minutes fills most tightly inside [not_before, before), or None."""
+        best = min(self._clipped_runs(minutes, not_before, before), key=lambda run: run[1] - run[0], default=None)
+        return None if best is None else _at(best[0])
+
+    def nearest_fit(self, minutes: int, target: datetime, not_before: Optional[datetime] = None,
+                    before: Optional[datetime] = None) -> Optional[datetime]:
+        """The start closest to target with minutes free minutes after it, or None."""
+        target = to_utc(target)
+        duration = minutes * _MINUTE
+        starts = [
+            min(max(target, _at(first)), _at(last) - duration)
+            for first, last in self._clipped_runs(minutes, not_before, before)
+        ]
+        return min(starts, key=lambda start: abs(start - target), default=None)
+
+    def slots(self, min_minutes: int = 0) -> List[Dict[str, datetime]]:
+        """Free runs of at least min_minutes as {'start', 'end'} dicts, the find_free_intervals shape."""
+        return [
+            {'start': _at(first), 'end': _at(last)}
+            for first, last in self.runs() if last - first >= max(min_minutes, 1)
+        ]
+
+    def total_minutes(self) -> int:
+        return sum(bin(bits).count('1') for bits in self._days.values())
+
+    def to_bytes(self) -> bytes:
+        """Each day with free time as its header and the bytes of its bitmap between the first and last free minute."""
+        parts = []
+        for day in sorted(self._days):
+            bits = self._days[day]
+            skip = ((bits & -bits).bit_length() - 1) // 8
+            kept = bits >> (skip * 8)
+            length = (kept.bit_length() + 7) // 8
+            parts.append(_DAY_HEADER.pack(day, skip, length) + kept.to_bytes(length, 'little'))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Availability':
+        days = {}
+        position = 0
+        while position < len(data):
+            day, skip, length = _DAY_HEADER.unpack_from(data, position)
+            position += _DAY_HEADER.size
+            days[day] = int.from_bytes(data[position:position + length], 'little') << (skip * 8)
+            position += length
+        return cls(days)
+
+    def __bool__(self) -> bool:
+        return bool(self._days)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Availability) and self._days == other._days
+
+    def __repr__(self) -> str:
+        runs = ', '.join(f"{_at(first).isoformat()}/{_at(last).isoformat()}" for first, last in self.runs())
+        return f"Availability([{runs}])"
@@ -0,0 +1,99 @@
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from .event_times import to_utc
+from .free_slots import working_windows
+
+Interval = Tuple[datetime, datetime]
+
+
+def _slot_index(values: Sequence[datetime], start: datetime, resolution: timedelta, round_up: bool) -> np.ndarray:
+    offsets = np.array([(to_utc(value) - start) / resolution for value in values], dtype=np.float64)
+    return (np.ceil(offsets) if round_up else np.floor(offsets)).astype(np.int64)
+
+
+def busy_matrix(busy: Mapping[str, Sequence], start: datetime, end: datetime,
+                resolution_minutes: int = 5) -> Tuple[List[str], np.ndarray]:
+    """Rasterize each participant's busy intervals onto a grid of resolution_minutes slots.
+
+    busy maps a participant to (start, end) pairs or {'start', 'end'} dicts (the shape
+    get_busy_intervals returns). Any slot a busy interval touches counts as busy. Returns
+    the participants in row order and a (participants x slots) boolean matrix.
+    """
+    start, end = to_utc(start), to_utc(end)
+    resolution = timedelta(minutes=resolution_minutes)
+    slots = int(np.ceil((end - start) / resolution))
+    people = list(busy)
+
+    rows, starts, ends = [], [], []
+    for row, person in enumerate(people):
+        for interval in busy[person]:
+            interval_start, interval_end = (
+                (interval['start'], interval['end']) if isinstance(interval, dict) else interval
+            )
+            rows.append(row)
+            starts.append(interval_start)
+            ends.append(interval_end)
+
+    # +1 where a busy run starts and -1 just past where it ends; the running sum is the busy depth
+    changes = np.zeros((len(people), slots + 1), dtype=np.int16)
+    if rows:
+        rows = np.array(rows)
+        first = np.clip(_slot_index(starts, start, resolution, round_up=False), 0, slots)
+        last = np.clip(_slot_index(ends, start, resolution, round_up=True), 0, slots)
+        keep = first < last
+        np.add.at(changes, (rows[keep], first[keep]), 1)
+        np.add.at(changes, (rows[keep], last[keep]), -1)
+    return people, np.cumsum(changes, axis=1)[:, :slots] > 0
+
+
+def window_mask(start: datetime, end: datetime, resolution_minutes: int = 5,
+                working_hours: Optional[Tuple[time, time]] = None,
+                working_days: Optional[Sequence[int]] = None, tz: tzinfo = timezone.utc) -> np.ndarray:
+    """Boolean slot mask of the parts of [start, end) inside working hours on working days."""
+    start, end = to_utc(start), to_utc(end)
+    resolution = timedelta(minutes=resolution_minutes)
+    slots = int(np.ceil((end - start) / resolution))
+    windows = working_windows(start, end, working_hours, working_days, tz)
+    changes = np.zeros(slots + 1, dtype=np.int32)
+    if windows:
+        # Only whole slots inside a window are usable
+        first = np.clip(_slot_index([w[0] for w in windows], start, resolution, round_up=True), 0, slots)
+        last = np.clip(_slot_index([w[1] for w in windows], start, resolution, round_up=False), 0, slots)
+        np.add.at(changes, first, 1)
+        np.add.at(changes, last, -1)
+    return np.cumsum(changes)[:slots] > 0
+
+
+def free_runs(free: np.ndarray, min_length: int) -> List[Tuple[int, int]]:
+    """[first, last) slot indexes of every run of True at least min_length long."""
+    edges = np.diff(np.concatenate(([0], free.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    long_enough = run_ends - run_starts >= max(min_length, 1)
+    return list(zip(run_starts[long_enough].tolist(), run_ends[long_enough].tolist()))
+
+
+def find_common_free(busy: Mapping[str, Sequence], start: datetime, end: datetime, duration_minutes: int,
+                     resolution_minutes: int = 5, working_hours: Optional[Tuple[time, time]] = None,
+                     working_days: Optional[Sequence[int]] = None, tz: tzinfo = timezone.utc,
+                     min_attendees: Optional[int] = None) -> List[Dict[str, datetime]]:
+    """Every gap of at least duration_minutes in which all participants (or min_attendees) are free.
+
+    Busy time is rounded out to whole slots, so a gap never overlaps anyone's meeting;
+    with 5-minute slots a 10:07 end frees the grid from 10:10.
+    """
+    start = to_utc(start)
+    resolution = timedelta(minutes=resolution_minutes)
+    _, matrix = busy_matrix(busy, start, end, resolution_minutes)
+    if min_attendees is None:
+        free = ~matrix.any(axis=0)
+    else:
+        free = (~matrix).sum(axis=0) >= min_attendees
+    free &= window_mask(start, end, resolution_minutes, working_hours, working_days, tz)
+
+    min_length = int(np.ceil(timedelta(minutes=duration_minutes) / resolution))
+    return [
+        {'start': start + first * resolution, 'end': start + last * resolution}
+        for first, last in free_runs(free, min_length)
+    ]
@@ -0,0 +1,118 @@
+from collections import deque
+import logging
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Stops calling a dependency that keeps failing or answering too slowly.
+
+    The breaker looks at the last window_size calls. Once at least min_calls have been
+    recorded and the share that failed or took longer than slow_call_seconds reaches
+    failure_rate, it opens: allow_request() returns False and callers should take their
+    fallback right away. After reset_seconds it goes half-open and lets up to
+    half_open_probes calls through; a good probe closes it again, a bad one reopens it.
+    A probe that never reports back (e.g. its caller was cancelled) stops counting after
+    another reset_seconds, so the breaker cannot get stuck half-open.
+    """
+
+    def __init__(self, name: str, window_size: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: Optional[float] = None, reset_seconds: float = 30,
+                 half_open_probes: int = 1):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes: List[float] = []
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.reset_seconds:
+            self._transition(HALF_OPEN)
+            self._probes = []
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            logger.warning("Circuit breaker %s: %s -> %s", self.name, self._state, state)
+            self._state = state
+
+    def allow_request(self) -> bool:
+        """Whether the caller may try the dependency now (counts as a probe when half-open)."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN:
+                self._probes = [started for started in self._probes if now - started < self.reset_seconds]
+                if len(self._probes) < self.half_open_probes:
+                    self._probes.append(now)
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float = 0.0) -> None:
+        if self.slow_call_seconds is not None and latency > self.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            if self._current_state(time.monotonic()) == HALF_OPEN:
+                self._outcomes.clear()
+                self._probes = []
+                self._transition(CLOSED)
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            self._outcomes.append(False)
+            if state == HALF_OPEN or (
+                state == CLOSED and len(self._outcomes) >= self.min_calls
+                and self._failure_rate() >= self.failure_rate
+            ):
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._probes = []
+        self.times_opened += 1
+        self._transition(OPEN)
+
+    def _failure_rate(self) -> float:
+        return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                'state': state,
+                'failure_rate': round(self._failure_rate(), 3),
+                'window_calls': len(self._outcomes),
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+                'retry_in_seconds': round(max(0.0, self.reset_seconds - (now - self._opened_at)), 1)
+                if state == OPEN else 0.0
+            }
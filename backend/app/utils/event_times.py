@@ -0,0 +1,55 @@
+from datetime import datetime, timezone, tzinfo
+from typing import Any, Dict, Tuple
+from zoneinfo import ZoneInfo
+from ..config import get_settings
+
+
+def to_utc(value: datetime) -> datetime:
+    """Return an aware UTC datetime. Naive values are treated as UTC, matching the 'Z' suffix used for API calls."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_event_time(value: Dict[str, Any]) -> datetime:
+    """Parse a Google Calendar start/end object into an aware UTC datetime.
+
+    All-day events carry a 'date' instead of a 'dateTime'. They are anchored at local
+    midnight in the object's timeZone, or DEFAULT_TIMEZONE, the zone working hours are
+    laid out in, so an all-day event blocks exactly its own day.
+    """
+    if value.get('dateTime'):
+        return to_utc(datetime.fromisoformat(value['dateTime'].replace('Z', '+00:00')))
+    zone = ZoneInfo(value.get('timeZone') or get_settings().DEFAULT_TIMEZONE)
+    return datetime.fromisoformat(value['date']).replace(tzinfo=zone).astimezone(timezone.utc)
+
+
+def event_bounds(event: Dict[str, Any]) -> Tuple[datetime, datetime]:
+    """Return the (start, end) of an event as aware UTC datetimes."""
+    return parse_event_time(event['start']), parse_event_time(event['end'])
+
+
+def local_event_time(value: Dict[str, Any], default_tz: tzinfo) -> datetime:
+    """A start/end object as the wall-clock time to show the user.
+
+    That is the object's own timeZone when it names one, else the offset its dateTime
+    was written with; 'Z' times and all-day dates fall back to default_tz.
+    """
+    moment = parse_event_time(value)
+    if value.get('timeZone'):
+        return moment.astimezone(ZoneInfo(value['timeZone']))
+    if value.get('dateTime') and not value['dateTime'].endswith('Z'):
+        written = datetime.fromisoformat(value['dateTime'])
+        if written.tzinfo is not None:
+            return moment.astimezone(written.tzinfo)
+    return moment.astimezone(default_tz)
+
+
+def local_event_bounds(event: Dict[str, Any], default_tz: tzinfo) -> Tuple[datetime, datetime]:
+    """Return the (start, end) of an event as wall-clock times, see local_event_time."""
+    return local_event_time(event['start'], default_tz), local_event_time(event['end'], default_tz)
+
+
+def to_rfc3339(value: datetime) -> str:
+    """Format a datetime for the timeMin/timeMax query parameters."""
+    return to_utc(value).strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -0,0 +1,85 @@
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .event_times import to_utc
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval], buffer: timedelta = timedelta(0)) -> List[Interval]:
+    """Sort intervals and merge any that overlap or touch once padded by buffer on both sides."""
+    padded = sorted((to_utc(start) - buffer, to_utc(end) + buffer) for start, end in intervals)
+    merged: List[Interval] = []
+    for start, end in padded:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def working_windows(start: datetime, end: datetime, working_hours: Optional[Tuple[time, time]] = None,
+                    working_days: Optional[Sequence[int]] = None, tz: tzinfo = timezone.utc) -> List[Interval]:
+    """Split [start, end) into the parts that fall inside working hours on working days.
+
+    working_hours is a (start, end) pair of wall-clock times in tz and working_days
+    holds weekday numbers (Monday is 0). Without either mask the whole range is returned.
+    """
+    start, end = to_utc(start), to_utc(end)
+    if working_hours is None and working_days is None:
+        return [(start, end)] if start < end else []
+
+    day_start, day_end = working_hours or (time.min, time.max)
+    windows = []
+    day = start.astimezone(tz).date()
+    while True:
+        window_start = datetime.combine(day, day_start, tz).astimezone(timezone.utc)
+        if window_start >= end:
+            break
+        if day_end == time.max:
+            window_end = datetime.combine(day + timedelta(days=1), time.min, tz).astimezone(timezone.utc)
+        else:
+            window_end = datetime.combine(day, day_end, tz).astimezone(timezone.utc)
+
+        if working_days is None or day.weekday() in working_days:
+            clipped = (max(window_start, start), min(window_end, end))
+            if clipped[0] < clipped[1]:
+                windows.append(clipped)
+        day += timedelta(days=1)
+    return windows
+
+
+def find_free_intervals(busy: Iterable[Interval], start: datetime, end: datetime, duration_minutes: int,
+                        working_hours: Optional[Tuple[time, time]] = None,
+                        working_days: Optional[Sequence[int]] = None,
+                        buffer_minutes: int = 0, tz: tzinfo = timezone.utc) -> List[Dict[str, datetime]]:
+    """Return every free gap of at least duration_minutes inside [start, end).
+
+    Busy intervals are sorted and merged once (padded by buffer_minutes so meetings keep
+    that distance), then swept against the working-hour windows in a single pass, so the
+    whole multi-day range costs O(n log n) in the number of busy intervals.
+    """
+    merged = merge_intervals(busy, timedelta(minutes=buffer_minutes))
+    windows = working_windows(start, end, working_hours, working_days, tz)
+    duration = timedelta(minutes=duration_minutes)
+
+    free_slots = []
+    i = 0
+    for window_start, window_end in windows:
+        # Busy intervals that end before this window can never matter again
+        while i < len(merged) and merged[i][1] <= window_start:
+            i += 1
+
+        cursor = window_start
+        j = i
+        while j < len(merged) and merged[j][0] < window_end:
+            busy_start, busy_end = merged[j]
+            if busy_start - cursor >= duration:
+                free_slots.append({'start': cursor, 'end': busy_start})
+            cursor = max(cursor, busy_end)
+            j += 1
+
+        if window_end - cursor >= duration:
+            free_slots.append({'start': cursor, 'end': window_end})
+
+    return free_slots
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Any, Iterable, List, Tuple
+from .event_times import to_utc
+
+
+class IntervalIndex:
+    """Static interval tree over half-open [start, end) intervals.
+
+    Intervals are kept in an array sorted by start. The array is treated as an
+    implicit balanced binary tree (the middle element of every sub-range is its
+    root) and each node stores the largest end time in its subtree, so overlap
+    queries can skip whole subtrees that finish before the query begins.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime, Any]] = ()):
+        entries = sorted(
+            ((to_utc(start).timestamp(), to_utc(end).timestamp(), payload) for start, end, payload in intervals),
+            key=lambda entry: entry[0]
+        )
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._payloads = [entry[2] for entry in entries]
+        self._max_end = list(self._ends)
+        self._augment(0, len(entries))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _augment(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float('-inf')
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(self._ends[mid], self._augment(lo, mid), self._augment(mid + 1, hi))
+        return self._max_end[mid]
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Any]:
+        """Return payloads of intervals overlapping [start, end), ordered by start."""
+        return [self._payloads[i] for i in self._search(to_utc(start).timestamp(), to_utc(end).timestamp())]
+
+    def _search(self, start: float, end: float) -> List[int]:
+        matches: List[int] = []
+        self._visit(0, len(self._starts), start, end, matches)
+        return matches
+
+    def _visit(self, lo: int, hi: int, start: float, end: float, matches: List[int]) -> None:
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        # Nothing in this subtree ends after the query starts
+        if self._max_end[mid] <= start:
+            return
+        self._visit(lo, mid, start, end, matches)
+        # Everything to the right starts at or after this node
+        if self._starts[mid] >= end:
+            return
+        if self._ends[mid] > start:
+            matches.append(mid)
+        self._visit(mid + 1, hi, start, end, matches)
+
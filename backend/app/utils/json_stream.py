@@ -0,0 +1,64 @@
+import json
+from typing import Any, Optional
+
+
+class JsonStreamParser:
+    """Finds the first complete JSON object or array in text that arrives in chunks.
+
+    Anything before the opening bracket (a Markdown code fence, a sentence of preamble)
+    is skipped, and the value is decoded as soon as its closing bracket arrives, so the
+    caller can stop reading and ignore whatever follows (a closing fence, trailing prose).
+    Only bracket depth and string/escape state are tracked while scanning; the value is
+    decoded once, with json.loads.
+    """
+
+    def __init__(self, openers: str = '{['):
+        self.openers = openers
+        self.done = False
+        self.value: Any = None
+        self._buffer = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        """Consume chunk; return the decoded value once it is complete, else None.
+
+        Raises ValueError if the complete value turns out not to be valid JSON.
+        """
+        if self.done:
+            return self.value
+
+        position = 0
+        if not self._started:
+            starts = [index for index in (chunk.find(opener) for opener in self.openers) if index >= 0]
+            if not starts:
+                return None
+            position = min(starts)
+            self._started = True
+
+        for index in range(position, len(chunk)):
+            char = chunk[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(chunk[position:index + 1])
+                    self.value = json.loads(''.join(self._buffer))
+                    self.done = True
+                    return self.value
+
+        self._buffer.append(chunk[position:])
+        return None
+
@@ -0,0 +1,91 @@
+"""Throughput of blocking vs. async Calendar calls under concurrent clients.
+
+Each simulated client is a coroutine on one event loop, exactly like concurrent
+requests inside a single uvicorn worker. The blocking variant calls
+googleapiclient's execute() from the coroutine, as the handlers used to; the async
+variant goes through AsyncCalendarService and its pooled keep-alive client.
+
+    python -m benchmarks.async_calendar_bench --clients 50 --requests 10 --latency-ms 50
+"""
+from googleapiclient.discovery import build
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import statistics
+import time
+import httplib2
+from app.services.async_calendar import AsyncCalendarService
+from app.utils.event_times import to_rfc3339
+from .fake_calendar_server import API_PREFIX, create_fake_calendar_app, serve_in_thread
+
+
+async def run_clients(clients: int, requests: int, call) -> dict:
+    latencies = []
+
+    async def client():
+        for _ in range(requests):
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000
+    }
+
+
+async def main(args):
+    server, root_url = serve_in_thread(create_fake_calendar_app(latency_ms=args.latency_ms))
+    day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    blocking_service = build(
+        'calendar', 'v3',
+        http=httplib2.Http(),
+        client_options={'api_endpoint': root_url + API_PREFIX + '/'},
+        static_discovery=True
+    )
+
+    async def blocking_call():
+        blocking_service.events().list(
+            calendarId='primary',
+            timeMin=to_rfc3339(day),
+            timeMax=to_rfc3339(day.replace(hour=23, minute=59)),
+            singleEvents=True,
+            orderBy='startTime'
+        ).execute()
+
+    async_service = AsyncCalendarService(base_url=root_url + API_PREFIX)
+
+    async def async_call():
+        await async_service.get_daily_agenda(day)
+
+    results = {
+        'blocking execute()': await run_clients(args.clients, args.requests, blocking_call),
+        'AsyncCalendarService': await run_clients(args.clients, args.requests, async_call)
+    }
+    await async_service.aclose()
+    server.should_exit = True
+
+    print(f"{args.clients} clients x {args.requests} requests, {args.latency_ms:.0f} ms upstream latency")
+    for name, result in results.items():
+        print(
+            f"{name:<22} {result['throughput']:8.1f} req/s  "
+            f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+            f"({result['requests']} requests in {result['seconds']:.2f} s)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=10, help="requests per client")
+    parser.add_argument('--latency-ms', type=float, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+"""Cached free time as {'start', 'end'} dict lists vs. per-day Availability bitmaps.
+
+Builds each user's free time over a horizon both ways from the same busy intervals,
+then compares memory, cached (serialized) size, and the time to intersect and union
+everyone's free time and find the first common gap, checking that the answers agree.
+
+    python -m benchmarks.availability_bench --users 200 --days 90 --duration 30
+"""
+from datetime import datetime, time, timedelta, timezone
+from functools import reduce
+import argparse
+import pickle
+import random
+import statistics
+import sys
+import time as clock
+from app.utils.availability import Availability
+from app.utils.free_slots import find_free_intervals, merge_intervals
+from .meeting_grid_bench import WORKING_DAYS, WORKING_HOURS, team_busy
+
+
+def deep_size(free_slots) -> int:
+    """Bytes held by a list of {'start', 'end'} dicts, counting every datetime."""
+    return sys.getsizeof(free_slots) + sum(
+        sys.getsizeof(slot) + sys.getsizeof(slot['start']) + sys.getsizeof(slot['end']) for slot in free_slots
+    )
+
+
+def availability_size(free: Availability) -> int:
+    return sys.getsizeof(free) + sys.getsizeof(free._days) + sum(
+        sys.getsizeof(day) + sys.getsizeof(bits) for day, bits in free._days.items()
+    )
+
+
+def intersect_slots(a, b):
+    """Two-pointer intersection of two sorted, disjoint dict lists."""
+    result, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        start, end = max(a[i]['start'], b[j]['start']), min(a[i]['end'], b[j]['end'])
+        if start < end:
+            result.append({'start': start, 'end': end})
+        if a[i]['end'] < b[j]['end']:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def union_slots(lists):
+    return [{'start': start, 'end': end}
+            for start, end in merge_intervals((slot['start'], slot['end']) for slots in lists for slot in slots)]
+
+
+def first_fit_slots(slots, minutes: int):
+    duration = timedelta(minutes=minutes)
+    return next((slot['start'] for slot in slots if slot['end'] - slot['start'] >= duration), None)
+
+
+def measure(call, iterations: int):
+    latencies = []
+    for _ in range(iterations):
+        started = clock.perf_counter()
+        result = call()
+        latencies.append(clock.perf_counter() - started)
+    return result, statistics.median(latencies) * 1000
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    start = datetime(2026, 1, 5, tzinfo=timezone.utc)
+    end = start + timedelta(days=args.days)
+    busy = team_busy(args.users, start, args.days, args.meetings_per_day, rng)
+
+    as_slots = [
+        find_free_intervals([(b['start'], b['end']) for b in intervals], start, end, 1,
+                            working_hours=WORKING_HOURS, working_days=WORKING_DAYS)
+        for intervals in busy.values()
+    ]
+    as_bitmaps = [
+        Availability.from_busy(intervals, start, end, working_hours=WORKING_HOURS, working_days=WORKING_DAYS)
+        for intervals in busy.values()
+    ]
+
+    slot_pickles = [pickle.dumps(slots) for slots in as_slots]
+    bitmap_bytes = [free.to_bytes() for free in as_bitmaps]
+    print(f"{args.users} users, {args.days} days, "
+          f"{sum(len(slots) for slots in as_slots) / args.users:.0f} free intervals per user")
+    print(f"{'':<12} {'memory/user':>12} {'cached/user':>12} {'load all':>10} "
+          f"{'intersect':>10} {'union':>10} {'first fit':>10}")
+
+    _, slot_load = measure(lambda: [pickle.loads(data) for data in slot_pickles], args.iterations)
+    slot_common, slot_intersect = measure(lambda: reduce(intersect_slots, as_slots), args.iterations)
+    slot_any, slot_union = measure(lambda: union_slots(as_slots), args.iterations)
+    slot_fit, slot_first = measure(lambda: first_fit_slots(slot_common, args.duration), args.iterations)
+    print(f"{'dict lists':<12} {sum(map(deep_size, as_slots)) / args.users:10.0f} B "
+          f"{sum(map(len, slot_pickles)) / args.users:10.0f} B {slot_load:7.2f} ms "
+          f"{slot_intersect:7.2f} ms {slot_union:7.2f} ms {slot_first * 1000:7.1f} us")
+
+    _, bitmap_load = measure(lambda: [Availability.from_bytes(data) for data in bitmap_bytes], args.iterations)
+    bitmap_common, bitmap_intersect = measure(lambda: reduce(Availability.intersection, as_bitmaps), args.iterations)
+    bitmap_any, bitmap_union = measure(lambda: reduce(Availability.union, as_bitmaps), args.iterations)
+    bitmap_fit, bitmap_first = measure(lambda: bitmap_common.first_fit(args.duration), args.iterations)
+    print(f"{'bitmaps':<12} {sum(map(availability_size, as_bitmaps)) / args.users:10.0f} B "
+          f"{sum(map(len, bitmap_bytes)) / args.users:10.0f} B {bitmap_load:7.2f} ms "
+          f"{bitmap_intersect:7.2f} ms {bitmap_union:7.2f} ms {bitmap_first * 1000:7.1f} us")
+
+    same = (bitmap_common.slots() == slot_common and bitmap_any.slots() == slot_any and bitmap_fit == slot_fit)
+    print(f"same answers: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--duration', type=int, default=30)
+    parser.add_argument('--meetings-per-day', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,225 @@
+"""Local stand-in for the Google Calendar v3 API used by the benchmarks.
+
+Serves the subset of endpoints CalendarService touches from an in-memory store,
+with a configurable per-request delay to emulate the upstream round trip.
+"""
+from fastapi import FastAPI, Request, Response
+from datetime import datetime, timedelta, timezone
+import asyncio
+import email
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+import uvicorn
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+API_PREFIX = "/calendar/v3"
+
+
+def make_event(event_id: str, start: datetime, minutes: int = 60) -> Dict[str, Any]:
+    """Build an event with the kind of payload a real work calendar returns."""
+    end = start + timedelta(minutes=minutes)
+    return {
+        'kind': 'calendar#event',
+        'etag': f'"{event_id}"',
+        'id': event_id,
+        'status': 'confirmed',
+        'htmlLink': f'https://www.google.com/calendar/event?eid={event_id}',
+        'created': start.isoformat(),
+        'updated': start.isoformat(),
+        'summary': f'Meeting {event_id}',
+        'description': 'Agenda:\n' + '\n'.join(f'- discussion item {i}' for i in range(8)),
+        'location': 'Conference Room 4B, Building 2',
+        'creator': {'email': 'owner@example.com', 'self': True},
+        'organizer': {'email': 'owner@example.com', 'self': True},
+        'start': {'dateTime': start.isoformat(), 'timeZone': 'UTC'},
+        'end': {'dateTime': end.isoformat(), 'timeZone': 'UTC'},
+        'iCalUID': f'{event_id}@google.com',
+        'sequence': 0,
+        'attendees': [
+            {'email': f'person{i}@example.com', 'responseStatus': 'accepted'} for i in range(6)
+        ],
+        'hangoutLink': f'https://meet.google.com/{event_id}',
+        'reminders': {
+            'useDefault': False,
+            'overrides': [{'method': 'email', 'minutes': 30}, {'method': 'popup', 'minutes': 30}]
+        },
+        'eventType': 'default'
+    }
+
+
+def create_fake_calendar_app(latency_ms: float = 50, events_per_day: int = 8, days: int = 14,
+                             start: Optional[datetime] = None) -> FastAPI:
+    """Create the fake API, seeded with events_per_day events for each of `days` days."""
+    app = FastAPI()
+    start = start or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    events: Dict[str, Dict[str, Any]] = {}
+    ids = itertools.count()
+
+    for day in range(days):
+        for slot in range(events_per_day):
+            event_id = f'seed{next(ids)}'
+            events[event_id] = make_event(event_id, start + timedelta(days=day, hours=8 + slot))
+
+    async def upstream_delay():
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    def bounds(event):
+        return (
+            datetime.fromisoformat(event['start']['dateTime']),
+            datetime.fromisoformat(event['end']['dateTime'])
+        )
+
+    @app.get(API_PREFIX + "/calendars/{calendar_id}/events")
+    async def list_events(calendar_id: str, timeMin: Optional[str] = None, timeMax: Optional[str] = None,
+                          maxResults: int = 250, pageToken: Optional[str] = None):
+        await upstream_delay()
+        items = list(events.values())
+        if timeMin and timeMax:
+            window_start = datetime.fromisoformat(timeMin.replace('Z', '+00:00'))
+            window_end = datetime.fromisoformat(timeMax.replace('Z', '+00:00'))
+            items = [e for e in items if bounds(e)[0] < window_end and bounds(e)[1] > window_start]
+        items.sort(key=lambda e: bounds(e)[0])
+
+        offset = int(pageToken or 0)
+        page = {'kind': 'calendar#events', 'items': items[offset:offset + maxResults]}
+        if offset + maxResults < len(items):
+            page['nextPageToken'] = str(offset + maxResults)
+        else:
+            page['nextSyncToken'] = 'fake-sync-token'
+        return page
+
+    @app.post(API_PREFIX + "/freeBusy")
+    async def free_busy(request: Request):
+        await upstream_delay()
+        body = await request.json()
+        window_start = datetime.fromisoformat(body['timeMin'].replace('Z', '+00:00'))
+        window_end = datetime.fromisoformat(body['timeMax'].replace('Z', '+00:00'))
+
+        busy = []
+        for event_start, event_end in sorted(bounds(e) for e in events.values()):
+            if event_start >= window_end or event_end <= window_start:
+                continue
+            if busy and event_start <= busy[-1][1]:
+                busy[-1][1] = max(busy[-1][1], event_end)
+            else:
+                busy.append([event_start, event_end])
+
+        periods = [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in busy]
+        return {
+            'kind': 'calendar#freeBusy',
+            'timeMin': body['timeMin'],
+            'timeMax': body['timeMax'],
+            'calendars': {item['id']: {'busy': periods} for item in body.get('items', [])}
+        }
+
+    def insert(body):
+        event_id = f'new{next(ids)}'
+        events[event_id] = dict(body, id=event_id, status='confirmed')
+        return 200, events[event_id]
+
+    def get(event_id):
+        if event_id not in events:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        return 200, events[event_id]
+
+    def update(event_id, body, merge=False):
+        if event_id not in events:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        events[event_id] = dict(events[event_id], **body) if merge else dict(body, id=event_id)
+        return 200, events[event_id]
+
+    def delete(event_id):
+        if events.pop(event_id, None) is None:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        return 204, None
+
+    def dispatch(method, path, body):
+        match = re.fullmatch(API_PREFIX + r"/calendars/[^/]+/events(?:/([^/]+))?", path)
+        if not match:
+            return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+        event_id = match.group(1)
+        if event_id is None and method == 'POST':
+            return insert(body)
+        if event_id and method == 'GET':
+            return get(event_id)
+        if event_id and method in ('PUT', 'PATCH'):
+            return update(event_id, body, merge=method == 'PATCH')
+        if event_id and method == 'DELETE':
+            return delete(event_id)
+        return 405, {'error': {'code': 405, 'message': 'Method Not Allowed'}}
+
+    def respond(status, payload):
+        if payload is None:
+            return Response(status_code=status)
+        return Response(json.dumps(payload), status_code=status, media_type='application/json')
+
+    @app.post(API_PREFIX + "/calendars/{calendar_id}/events")
+    async def insert_event(calendar_id: str, request: Request):
+        await upstream_delay()
+        return respond(*insert(await request.json()))
+
+    @app.get(API_PREFIX + "/calendars/{calendar_id}/events/{event_id}")
+    async def get_event(calendar_id: str, event_id: str):
+        await upstream_delay()
+        return respond(*get(event_id))
+
+    @app.put(API_PREFIX + "/calendars/{calendar_id}/events/{event_id}")
+    async def update_event(calendar_id: str, event_id: str, request: Request):
+        await upstream_delay()
+        return respond(*update(event_id, await request.json()))
+
+    @app.patch(API_PREFIX + "/calendars/{calendar_id}/events/{event_id}")
+    async def patch_event(calendar_id: str, event_id: str, request: Request):
+        await upstream_delay()
+        return respond(*update(event_id, await request.json(), merge=True))
+
+    @app.delete(API_PREFIX + "/calendars/{calendar_id}/events/{event_id}")
+    async def delete_event(calendar_id: str, event_id: str):
+        await upstream_delay()
+        return respond(*delete(event_id))
+
+    @app.post("/batch/calendar/v3")
+    async def batch(request: Request):
+        """Handle a multipart/mixed batch: one upstream delay for the whole batch."""
+        await upstream_delay()
+        envelope = b'Content-Type: ' + request.headers['content-type'].encode() + b'\r\n\r\n' + await request.body()
+        boundary = 'batch_response_boundary'
+        lines = []
+        for part in email.message_from_bytes(envelope).get_payload():
+            head, _, body = part.get_payload().replace('\r\n', '\n').partition('\n\n')
+            method, url = head.split('\n')[0].split(' ')[:2]
+            status, payload = dispatch(method, urlsplit(url).path, json.loads(body) if body.strip() else None)
+            content_id = part['Content-ID'].strip('<>')
+            lines += [
+                f'--{boundary}',
+                'Content-Type: application/http',
+                f'Content-ID: <response-{content_id}>',
+                '',
+                f'HTTP/1.1 {status} OK',
+                'Content-Type: application/json',
+                '',
+                json.dumps(payload) if payload is not None else ''
+            ]
+        lines.append(f'--{boundary}--')
+        return Response('\r\n'.join(lines), media_type=f'multipart/mixed; boundary={boundary}')
+
+    return app
+
+
+def serve_in_thread(app: FastAPI) -> Tuple[uvicorn.Server, str]:
+    """Run app on a free local port in a daemon thread and return (server, root URL)."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f'http://127.0.0.1:{port}'
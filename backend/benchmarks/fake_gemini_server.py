@@ -0,0 +1,99 @@
+"""Local stand-in for Gemini's generateContent endpoint used by the benchmarks.
+
+Answers every prompt with a fixed-shape event intent (or an array of them for
+multi-item prompts) after a configurable delay; a fraction of calls can be made
+much slower to exercise deadlines. Token counts are estimated at four characters per
+token, and a system instruction seen before is reported as cached, the way the
+provider's implicit prefix caching does.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+import asyncio
+import json
+import random
+import re
+from typing import Any, Dict
+
+API_PREFIX = "/v1beta"
+CHUNK_CHARS = 16  # characters of output per streamed chunk
+TRAILING_PROSE = (
+    "This creates the event with the details you gave. Let me know if you would like "
+    "to change the time, add more attendees, or set a reminder for it."
+)
+
+_USER_INPUT = re.compile(r'^User input: (.*)$', re.MULTILINE)
+_BATCH_INPUT = re.compile(r'^(\d+)\. (".*")$', re.MULTILINE)
+
+
+def fake_intent(text: str) -> Dict[str, Any]:
+    start = (datetime.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    return {
+        'action': 'create',
+        'title': text[:60],
+        'start_time': start.isoformat(),
+        'end_time': (start + timedelta(hours=1)).isoformat(),
+        'priority': 'medium',
+        'duration_minutes': 60
+    }
+
+
+def create_fake_gemini_app(latency_ms: float = 300, slow_fraction: float = 0.0, slow_ms: float = 10000,
+                           chunk_ms: float = 5, noise_fraction: float = 0.0, seed: int = 0) -> FastAPI:
+    """latency_ms is the time to the first token; each further CHUNK_CHARS of output takes chunk_ms.
+
+    noise_fraction of the answers come wrapped in a code fence and followed by a
+    paragraph of prose, as chat-tuned models tend to do.
+    """
+    app = FastAPI()
+    app.state.calls = 0
+    rng = random.Random(seed)
+    seen_instructions = set()
+
+    @app.post(API_PREFIX + "/models/{model_action}")
+    async def generate_content(model_action: str, request: Request):
+        body = await request.json()
+        prompt = ''.join(part.get('text', '') for content in body['contents'] for part in content['parts'])
+        instruction = ''.join(part.get('text', '') for part in body.get('systemInstruction', {}).get('parts', []))
+        cached_tokens = len(instruction) // 4 if instruction in seen_instructions else 0
+        seen_instructions.add(instruction)
+        app.state.calls += 1
+        first_token_delay = slow_ms if rng.random() < slow_fraction else latency_ms
+
+        batch = _BATCH_INPUT.findall(prompt)
+        if batch:
+            # Multi-item prompt: answer with one object per numbered input
+            text = json.dumps([dict(fake_intent(json.loads(item)), index=int(index)) for index, item in batch])
+        else:
+            match = _USER_INPUT.search(prompt)
+            text = json.dumps(fake_intent(match.group(1) if match else 'Event'))
+        if rng.random() < noise_fraction:
+            text = f"```json\n{text}\n```\n\n{TRAILING_PROSE}"
+
+        def usage(output: str) -> dict:
+            return {
+                'promptTokenCount': (len(instruction) + len(prompt)) // 4,
+                'cachedContentTokenCount': cached_tokens,
+                'candidatesTokenCount': len(output) // 4,
+                'totalTokenCount': (len(instruction) + len(prompt) + len(output)) // 4
+            }
+
+        def candidate(output: str) -> dict:
+            return {'content': {'role': 'model', 'parts': [{'text': output}]}}
+
+        chunks = [text[offset:offset + CHUNK_CHARS] for offset in range(0, len(text), CHUNK_CHARS)]
+        if not model_action.endswith(':streamGenerateContent'):
+            await asyncio.sleep((first_token_delay + chunk_ms * (len(chunks) - 1)) / 1000)
+            return {'candidates': [dict(candidate(text), finishReason='STOP')], 'usageMetadata': usage(text)}
+
+        async def events():
+            await asyncio.sleep(first_token_delay / 1000)
+            for index, chunk in enumerate(chunks):
+                if index:
+                    await asyncio.sleep(chunk_ms / 1000)
+                event = {'candidates': [candidate(chunk)], 'usageMetadata': usage(text[:(index + 1) * CHUNK_CHARS])}
+                yield f"data: {json.dumps(event)}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type='text/event-stream')
+
+    return app
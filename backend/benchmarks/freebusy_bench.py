@@ -0,0 +1,82 @@
+"""Payload size and latency of conflict checks: full event listing vs. FreeBusy.
+
+Both variants ask the local fake Calendar server the same question ("what is busy
+in this window?") with the exact request CalendarService sends, then parse the
+answer into busy intervals the way CalendarService does.
+
+    python -m benchmarks.freebusy_bench --days 7 --events-per-day 8 --calendars 3
+"""
+from datetime import datetime, timedelta, timezone
+import argparse
+import statistics
+import time
+import httpx
+from app.config import get_settings
+from app.services.calendar import busy_from_events
+from app.services.backends.google_backend import build_freebusy_query, parse_freebusy_response
+from app.utils.event_times import to_rfc3339
+from .fake_calendar_server import API_PREFIX, create_fake_calendar_app, serve_in_thread
+
+
+def measure(call, iterations: int) -> dict:
+    latencies, sizes = [], []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        sizes.append(call())
+        latencies.append(time.perf_counter() - started)
+    return {'bytes': statistics.mean(sizes), 'p50_ms': statistics.median(latencies) * 1000}
+
+
+def main(args):
+    server, root_url = serve_in_thread(create_fake_calendar_app(
+        latency_ms=args.latency_ms, events_per_day=args.events_per_day, days=args.days
+    ))
+    settings = get_settings()
+    start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=args.days)
+    calendar_ids = ['primary'] + [f'colleague{i}@example.com' for i in range(args.calendars - 1)]
+
+    with httpx.Client(base_url=root_url + API_PREFIX) as client:
+        def listing():
+            # One events().list per calendar, as check_conflicts would need
+            size = 0
+            for calendar_id in calendar_ids:
+                response = client.get(f'/calendars/{calendar_id}/events', params={
+                    'timeMin': to_rfc3339(start),
+                    'timeMax': to_rfc3339(end),
+                    'singleEvents': 'true',
+                    'orderBy': 'startTime'
+                })
+                busy_from_events(response.json()['items'])
+                size += len(response.content)
+            return size
+
+        def freebusy():
+            response = client.post('/freeBusy', json=build_freebusy_query(start, end, calendar_ids, settings))
+            parse_freebusy_response(response.json())
+            return len(response.content)
+
+        results = {
+            'events().list': measure(listing, args.iterations),
+            'freebusy().query': measure(freebusy, args.iterations)
+        }
+    server.should_exit = True
+
+    print(
+        f"{args.calendars} calendar(s), {args.days} days x {args.events_per_day} events/day, "
+        f"{args.latency_ms:.0f} ms upstream latency"
+    )
+    for name, result in results.items():
+        print(f"{name:<18} {result['bytes'] / 1024:9.1f} KiB  p50 {result['p50_ms']:7.1f} ms")
+    ratio = results['events().list']['bytes'] / results['freebusy().query']['bytes']
+    print(f"FreeBusy transfers {ratio:.0f}x fewer bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--events-per-day', type=int, default=8)
+    parser.add_argument('--calendars', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--iterations', type=int, default=20)
+    main(parser.parse_args())
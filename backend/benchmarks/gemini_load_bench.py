@@ -0,0 +1,95 @@
+"""Load on the async NLP path against a fake Gemini endpoint with configurable latency.
+
+Every utterance is phrased so the rule-based parser is not confident and is unique so
+the parse cache never hits, which forces a Gemini call per request. Reports throughput,
+latency percentiles, how many requests fell back to the rule parse (missed deadline or
+unusable answer), the worst event-loop stall seen by a 10 ms heartbeat while the load
+ran, and prompt tokens per call split into cached and uncached.
+
+    python -m benchmarks.gemini_load_bench --requests 200 --latency-ms 300 --slow-fraction 0.05
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from app.config import get_settings
+from .fake_calendar_server import serve_in_thread
+from .fake_gemini_server import API_PREFIX, create_fake_gemini_app
+
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the largest delay between when a tick was due and when it ran."""
+    worst = 0.0
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - due)
+    return worst
+
+
+async def main(args):
+    server, root_url = serve_in_thread(create_fake_gemini_app(
+        latency_ms=args.latency_ms, slow_fraction=args.slow_fraction, slow_ms=args.slow_ms,
+        chunk_ms=args.chunk_ms, noise_fraction=args.noise_fraction
+    ))
+
+    settings = get_settings()
+    settings.GEMINI_API_BASE = root_url + API_PREFIX
+    settings.LLM_TIMEOUT_SECONDS = args.timeout
+    settings.LLM_MAX_CONCURRENCY = args.concurrency
+    from app.services.nlp import NLPService
+    service = NLPService()
+
+    latencies = []
+    fallbacks = 0
+
+    async def one(index: int):
+        nonlocal fallbacks
+        started = time.perf_counter()
+        intent = await service.aparse_event_intent(f"sort out the quarterly planning thing with design, take {index}")
+        latencies.append(time.perf_counter() - started)
+        # Rule-based parses carry a confidence score, Gemini's do not
+        fallbacks += intent.confidence is not None
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_stall = await monitor
+    usage = service.gemini.usage.stats()
+
+    await service.aclose()
+    server.should_exit = True
+
+    latencies.sort()
+    print(
+        f"{args.requests} requests, {args.latency_ms:.0f} ms upstream latency "
+        f"({args.slow_fraction:.0%} at {args.slow_ms:.0f} ms), "
+        f"{args.concurrency} in flight, {args.timeout:.1f} s deadline"
+    )
+    print(f"throughput          {args.requests / elapsed:8.1f} req/s")
+    print(f"latency p50         {statistics.median(latencies) * 1000:8.1f} ms")
+    print(f"latency p95         {latencies[int(len(latencies) * 0.95) - 1] * 1000:8.1f} ms")
+    print(f"latency max         {latencies[-1] * 1000:8.1f} ms")
+    print(f"rule fallbacks      {fallbacks:8d}")
+    print(f"worst loop stall    {worst_stall * 1000:8.1f} ms")
+    print(
+        f"prompt tokens/call  {usage['prompt_tokens_per_request']:8.1f}  "
+        f"({usage['uncached_prompt_tokens_per_request']:.1f} uncached, {usage['cached_share']:.0%} served from cache)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument('--timeout', type=float, default=4, help="LLM_TIMEOUT_SECONDS")
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--slow-fraction', type=float, default=0.05, help="share of calls that take --slow-ms")
+    parser.add_argument('--slow-ms', type=float, default=10000)
+    parser.add_argument('--chunk-ms', type=float, default=5, help="time per streamed chunk after the first")
+    parser.add_argument('--noise-fraction', type=float, default=0.2,
+                        help="share of answers wrapped in a code fence and followed by prose")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""Synthetic teacher-labelled utterances for the intent model benchmark.
+
+Stands in for an IntentLog collected in production: each example pairs an utterance
+with the intent an LLM would be expected to return for it. Half of the phrasings are
+ones the rule parser cannot resolve on its own ("tomorrow morning", "next week",
+"after lunch"), which are the inputs that reach Gemini and so fill the real log.
+"""
+from datetime import datetime, time, timedelta
+import random
+from typing import Any, Dict, List
+from app.models.intent import EventIntent
+
+TITLES = [
+    'team standup', 'design review', 'budget sync', 'dentist appointment', 'call with the landlord',
+    'quarterly planning', '1:1 with Maya', 'code review', 'gym session', 'lunch with Sam',
+    'product demo', 'interview debrief', 'coffee with Priya', 'tax paperwork', 'board prep',
+    'yoga class', 'sprint retro', 'vendor call', 'haircut', 'parent teacher meeting',
+    'onboarding session', 'roadmap discussion', 'pick up groceries', 'car service', 'piano lesson'
+]
+VERBS = ['', '', 'schedule ', 'add ', 'book ', 'set up ', 'put in ', 'plan ', 'please schedule ']
+LOCATIONS = ['Room 4B', 'the main office', 'Cafe Rio', 'Building 2', 'the library', 'Central Park']
+PEOPLE = ['sam@example.com', 'maya@example.com', 'li@example.org', 'ops@example.net']
+DURATIONS = [(None, 60), ('for 30 minutes', 30), ('for 2 hours', 120), ('for half an hour', 30), ('for 90 minutes', 90)]
+WEEKDAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+# Vague times of day resolved the way the LLM is instructed to resolve them
+DAY_PARTS = {'morning': time(9), 'afternoon': time(14), 'evening': time(18), 'after lunch': time(13)}
+
+
+def _clock(hour: int, minute: int) -> str:
+    suffix = 'am' if hour < 12 else 'pm'
+    display = hour % 12 or 12
+    return f'{display}:{minute:02d}{suffix}' if minute else f'{display}{suffix}'
+
+
+def _day_phrase(rng: random.Random, reference: datetime):
+    """A day phrase and the date it means, relative to reference."""
+    kind = rng.randrange(5)
+    if kind == 0:
+        return 'tomorrow', reference.date() + timedelta(days=1)
+    if kind == 1:
+        return 'today', reference.date()
+    if kind == 2:
+        weekday = rng.randrange(7)
+        offset = (weekday - reference.weekday()) % 7 or 7
+        return f'on {WEEKDAY_NAMES[weekday]}', reference.date() + timedelta(days=offset)
+    if kind == 3:
+        days = rng.randint(2, 9)
+        return f'in {days} days', reference.date() + timedelta(days=days)
+    # "next week" means the following Monday
+    return 'next week', reference.date() + timedelta(days=7 - reference.weekday())
+
+
+def _time_phrase(rng: random.Random):
+    """A time phrase and the clock time it means; vague ones are the rule parser's blind spot."""
+    if rng.random() < 0.5:
+        hour, minute = rng.choice([8, 9, 10, 11, 13, 14, 15, 16, 17]), rng.choice([0, 0, 30])
+        return f'at {_clock(hour, minute)}', time(hour, minute)
+    part = rng.choice(list(DAY_PARTS))
+    return part if part.startswith('after') else f'in the {part}', DAY_PARTS[part]
+
+
+def make_example(rng: random.Random, reference: datetime) -> Dict[str, Any]:
+    title = rng.choice(TITLES)
+    day_phrase, day = _day_phrase(rng, reference)
+    time_phrase, clock = _time_phrase(rng)
+    duration_phrase, minutes = rng.choice(DURATIONS)
+    location = rng.choice(LOCATIONS) if rng.random() < 0.3 else None
+    attendee = rng.choice(PEOPLE) if rng.random() < 0.25 else None
+    priority = 'high' if rng.random() < 0.1 else 'medium'
+
+    parts = [title, day_phrase, time_phrase]
+    if rng.random() < 0.3:
+        parts = [title, time_phrase, day_phrase]
+    if duration_phrase:
+        parts.append(duration_phrase)
+    if location:
+        parts.append(f'at {location}')
+    if attendee:
+        parts.append(f'with {attendee}')
+    if priority == 'high':
+        parts.append('high priority')
+    text = rng.choice(VERBS) + ' '.join(parts)
+
+    start = datetime.combine(day, clock)
+    intent = EventIntent(
+        action='create',
+        title=title[0].upper() + title[1:],
+        start_time=start,
+        end_time=start + timedelta(minutes=minutes),
+        location=location,
+        attendees=[attendee] if attendee else [],
+        priority=priority,
+        duration_minutes=minutes
+    )
+    return {'text': text, 'reference_time': reference, 'intent': intent}
+
+
+def make_corpus(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    base = datetime(2026, 10, 5, 8)
+    examples = []
+    for _ in range(size):
+        reference = base + timedelta(days=rng.randrange(28), hours=rng.randrange(10), minutes=rng.randrange(60))
+        examples.append(make_example(rng, reference))
+    return examples
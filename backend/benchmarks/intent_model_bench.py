@@ -0,0 +1,78 @@
+"""Distilled intent model vs. the LLM path: accuracy, coverage and latency.
+
+Trains an IntentModel on a synthetic teacher-labelled log, reports its held-out
+accuracy and calibration, then parses the held-out utterances through NLPService
+against the fake Gemini endpoint, without and with the model tier.
+
+    python -m benchmarks.intent_model_bench --train 3000 --test 500 --latency-ms 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from app.config import get_settings
+from app.services.intent_model import IntentModel, evaluate
+from .fake_calendar_server import serve_in_thread
+from .fake_gemini_server import API_PREFIX, create_fake_gemini_app
+from .intent_corpus import make_corpus
+
+
+async def main(args):
+    training = make_corpus(args.train, seed=args.seed)
+    test = make_corpus(args.test, seed=args.seed + 1)
+
+    model = IntentModel()
+    started = time.perf_counter()
+    model.train(training, epochs=args.epochs)
+    print(f"trained on {args.train} examples in {time.perf_counter() - started:.1f} s")
+    report = evaluate(model, test, args.threshold)
+    print(json.dumps(report, indent=2))
+
+    app = create_fake_gemini_app(latency_ms=args.latency_ms)
+    server, root_url = serve_in_thread(app)
+    settings = get_settings()
+    settings.GEMINI_API_BASE = root_url + API_PREFIX
+    settings.INTENT_MODEL_MIN_CONFIDENCE = args.threshold
+    # Measure the tiers behind the caches only
+    settings.PARSE_CACHE_SIZE = 0
+    settings.SIMILAR_CACHE_SIZE = 0
+    from app.services.nlp import NLPService
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'intent_model.json')
+        model.save(model_path)
+
+        for name, path in (('LLM path', ''), ('model tier', model_path)):
+            settings.INTENT_MODEL_PATH = path
+            service = NLPService()
+            calls_before = app.state.calls
+            latencies = []
+            for example in test:
+                started = time.perf_counter()
+                await service.aparse_event_intent(example['text'], example['reference_time'])
+                latencies.append(time.perf_counter() - started)
+            await service.aclose()
+
+            latencies.sort()
+            print(
+                f"{name:<11} mean {statistics.mean(latencies) * 1000:7.2f} ms  "
+                f"p50 {latencies[len(latencies) // 2] * 1000:7.2f} ms  "
+                f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.2f} ms  "
+                f"{app.state.calls - calls_before:4d} LLM calls"
+            )
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--train', type=int, default=3000)
+    parser.add_argument('--test', type=int, default=500)
+    parser.add_argument('--epochs', type=int, default=8)
+    parser.add_argument('--threshold', type=float, default=0.9, help="INTENT_MODEL_MIN_CONFIDENCE")
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
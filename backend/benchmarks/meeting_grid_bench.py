@@ -0,0 +1,78 @@
+"""Multi-person meeting search: NumPy availability grid vs. merging every calendar and sweeping.
+
+Generates busy intervals for a team over a horizon (a handful of meetings per working
+day each) and finds every common gap of the requested length in working hours both
+ways, checking that they agree. Merge and sweep is what find_meeting_times uses when
+everyone must attend; the grid only serves the quorum (k of n free) query, timed last.
+
+    python -m benchmarks.meeting_grid_bench --people 100 --days 14 --duration 30
+"""
+from datetime import datetime, time, timedelta, timezone
+import argparse
+import random
+import statistics
+import time as clock
+from app.utils.availability_grid import find_common_free
+from app.utils.free_slots import find_free_intervals
+
+WORKING_HOURS = (time(9), time(17))
+WORKING_DAYS = [0, 1, 2, 3, 4]
+
+
+def team_busy(people: int, start: datetime, days: int, meetings_per_day: int, rng: random.Random):
+    busy = {}
+    for person in range(people):
+        intervals = []
+        for day in range(days):
+            for _ in range(rng.randint(0, meetings_per_day)):
+                meeting_start = start + timedelta(days=day, hours=8, minutes=5 * rng.randrange(12 * 10))
+                intervals.append({'start': meeting_start, 'end': meeting_start + timedelta(minutes=rng.choice([15, 30, 60]))})
+        busy[f'person{person}@example.com'] = intervals
+    return busy
+
+
+def measure(call, iterations: int):
+    latencies = []
+    for _ in range(iterations):
+        started = clock.perf_counter()
+        result = call()
+        latencies.append(clock.perf_counter() - started)
+    return result, statistics.median(latencies) * 1000
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=args.days)
+    busy = team_busy(args.people, start, args.days, args.meetings_per_day, rng)
+
+    grid, grid_ms = measure(lambda: find_common_free(
+        busy, start, end, args.duration, working_hours=WORKING_HOURS, working_days=WORKING_DAYS
+    ), args.iterations)
+    sweep, sweep_ms = measure(lambda: find_free_intervals(
+        [(interval['start'], interval['end']) for intervals in busy.values() for interval in intervals],
+        start, end, args.duration, working_hours=WORKING_HOURS, working_days=WORKING_DAYS
+    ), args.iterations)
+
+    quorum = int(args.people * 0.9)
+    quorum_slots, quorum_ms = measure(lambda: find_common_free(
+        busy, start, end, args.duration, working_hours=WORKING_HOURS, working_days=WORKING_DAYS,
+        min_attendees=quorum
+    ), args.iterations)
+
+    intervals = sum(len(intervals) for intervals in busy.values())
+    print(f"{args.people} people, {args.days} days, {intervals} busy intervals, {args.duration}-minute meeting")
+    print(f"numpy grid      p50 {grid_ms:7.2f} ms  {len(grid)} slots")
+    print(f"numpy grid, {quorum} of {args.people} free  p50 {quorum_ms:7.2f} ms  {len(quorum_slots)} slots")
+    print(f"merge + sweep   p50 {sweep_ms:7.2f} ms  {len(sweep)} slots  same answer: {grid == sweep}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--people', type=int, default=100)
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--meetings-per-day', type=int, default=3)
+    parser.add_argument('--duration', type=int, default=30)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    main(parser.parse_args())
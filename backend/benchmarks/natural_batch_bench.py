@@ -0,0 +1,75 @@
+"""Bulk natural-language entry: one LLM call per line vs. multi-item batch prompts.
+
+Parses a task list against the fake Gemini endpoint and creates the events in a
+SQLite-backed CalendarService, first line by line as /events/natural does, then with
+aparse_event_intents plus one batch create as /events/natural/batch does.
+
+    python -m benchmarks.natural_batch_bench --lines 200 --latency-ms 800
+"""
+import argparse
+import asyncio
+import time
+from app.config import get_settings
+from app.services.backends.sqlite_backend import SQLiteCalendarBackend
+from app.services.calendar import CalendarService
+from .fake_calendar_server import serve_in_thread
+from .fake_gemini_server import API_PREFIX, create_fake_gemini_app
+
+
+def intent_to_event_data(event_intent) -> dict:
+    return {
+        'title': event_intent.title,
+        'start_time': event_intent.start_time,
+        'end_time': event_intent.end_time,
+        'location': event_intent.location,
+        'attendees': event_intent.attendees
+    }
+
+
+async def main(args):
+    app = create_fake_gemini_app(latency_ms=args.latency_ms)
+    server, root_url = serve_in_thread(app)
+
+    settings = get_settings()
+    settings.GEMINI_API_BASE = root_url + API_PREFIX
+    settings.LLM_BATCH_SIZE = args.batch_size
+    from app.services.nlp import NLPService
+
+    # Phrased so the rule parser defers to the LLM; numbered so the cache never hits
+    lines = [f"sort out item {index} of the quarterly planning backlog sometime soon" for index in range(args.lines)]
+
+    async def line_by_line(service: NLPService, calendar: CalendarService):
+        for line in lines:
+            event_intent = await service.aparse_event_intent(line)
+            calendar.create_event(intent_to_event_data(event_intent))
+
+    async def batched(service: NLPService, calendar: CalendarService):
+        event_intents = await service.aparse_event_intents(lines)
+        calendar.batch_create_events([intent_to_event_data(event_intent) for event_intent in event_intents])
+
+    print(f"{args.lines} lines, {args.latency_ms:.0f} ms per LLM call, {args.batch_size} lines per batch prompt")
+    baseline = None
+    for name, run in (('one call per line', line_by_line), ('batch prompts', batched)):
+        service = NLPService()
+        calendar = CalendarService(backend=SQLiteCalendarBackend())
+        calls_before = app.state.calls
+        started = time.perf_counter()
+        await run(service, calendar)
+        elapsed = time.perf_counter() - started
+        await service.aclose()
+
+        baseline = baseline or elapsed
+        print(
+            f"{name:<18} {elapsed:7.2f} s  {args.lines / elapsed:8.1f} lines/s  "
+            f"{app.state.calls - calls_before:4d} LLM calls  {baseline / elapsed:5.1f}x"
+        )
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=800)
+    parser.add_argument('--batch-size', type=int, default=20, help="LLM_BATCH_SIZE")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,50 @@
+"""Round trips and latency of optimize_schedule on days with many overlapping events.
+
+Fills one day of a SQLite-backed calendar with overlapping events, then plans (dry
+run) and applies the optimization, counting backend listings and write round trips
+(a batch counts as one).
+
+    python -m benchmarks.optimize_bench --events 10 50 200
+"""
+from datetime import datetime, timedelta
+import argparse
+import random
+import time
+from app.services.calendar import CalendarService
+from app.services.scheduler import SchedulerService
+from .scheduler_bench import CountingBackend
+
+
+def main(args):
+    for count in args.events:
+        rng = random.Random(count)
+        backend = CountingBackend()
+        calendar = CalendarService(backend=backend)
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        # Packed into ten hours so many of them collide
+        starts = [day + timedelta(hours=8, minutes=15 * rng.randrange(40)) for _ in range(count)]
+        calendar.batch_create_events([
+            {
+                'title': f'Event {index}',
+                'start_time': start,
+                'end_time': start + timedelta(minutes=rng.choice([15, 30, 45]))
+            }
+            for index, start in enumerate(starts)
+        ])
+        backend.listings = backend.writes = 0
+        scheduler = SchedulerService(calendar_service=calendar)
+
+        started = time.perf_counter()
+        plan = scheduler.optimize_schedule(day)
+        planned = time.perf_counter() - started
+        scheduler.apply_schedule_plan(plan)
+        applied = time.perf_counter() - started
+        print(f"{count:4d} events  {len(plan['moves']):4d} moves  {len(plan['unresolved']):3d} unresolved  "
+              f"plan {planned * 1000:7.1f} ms  plan+apply {applied * 1000:7.1f} ms  "
+              f"listings {backend.listings}  write round trips {backend.writes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, nargs='+', default=[10, 50, 200])
+    main(parser.parse_args())
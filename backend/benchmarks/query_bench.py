@@ -0,0 +1,72 @@
+"""Latency of calendar questions answered from the warm event mirror.
+
+Fills a SQLite-backed calendar, syncs the mirror once, then answers a mix of agenda
+and free-time questions the way /events/natural does, counting how many times the
+backend was asked to list events along the way.
+
+    python -m benchmarks.query_bench --days 60 --events-per-day 12 --iterations 200
+"""
+from datetime import datetime, timedelta
+import argparse
+import random
+import statistics
+import time
+from app.services.backends.sqlite_backend import SQLiteCalendarBackend
+from app.services.calendar import CalendarService
+from app.services.nlp import NLPService
+from app.services.query_answerer import QueryAnswerer
+
+QUESTIONS = [
+    'what do I have friday afternoon', 'am I free at 3', 'what is on next week', 'show my agenda tomorrow',
+    'what do I have today?', 'am I free tonight', 'is there time for gym between 2 and 4pm tomorrow',
+    'what do I have on monday morning', 'am I available tomorrow at 11am for 30 minutes'
+]
+
+
+class CountingBackend(SQLiteCalendarBackend):
+    list_calls = 0
+
+    def list_events(self, *args, **kwargs):
+        CountingBackend.list_calls += 1
+        return super().list_events(*args, **kwargs)
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    backend = CountingBackend()
+    calendar = CalendarService(backend=backend)
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=args.days // 2)
+    calendar.batch_create_events([
+        {
+            'title': f'Event {day}-{slot}',
+            'start_time': start + timedelta(days=day, hours=7 + slot, minutes=rng.choice([0, 15, 30])),
+            'end_time': start + timedelta(days=day, hours=7 + slot, minutes=rng.choice([45, 60, 75]))
+        }
+        for day in range(args.days) for slot in range(args.events_per_day)
+    ])
+    calendar.mirror.sync()
+    answerer = QueryAnswerer(calendar, NLPService())
+
+    latencies = []
+    for iteration in range(args.iterations):
+        question = QUESTIONS[iteration % len(QUESTIONS)]
+        started = time.perf_counter()
+        answer = answerer.answer_text(question)
+        latencies.append(time.perf_counter() - started)
+        assert answer is not None, question
+
+    latencies.sort()
+    print(f"{args.days * args.events_per_day} events mirrored, {args.iterations} questions")
+    print(
+        f"p50 {statistics.median(latencies) * 1000:.2f} ms  p95 {latencies[int(len(latencies) * 0.95)] * 1000:.2f} ms  "
+        f"max {latencies[-1] * 1000:.2f} ms  upstream listings {CountingBackend.list_calls}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--events-per-day', type=int, default=12)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    main(parser.parse_args())
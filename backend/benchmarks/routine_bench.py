@@ -0,0 +1,36 @@
+"""suggest_routine_times latency and upstream listings as the horizon grows.
+
+Runs against a SQLite-backed calendar holding a few meetings a day and counts the
+event listings each suggestion makes.
+
+    python -m benchmarks.routine_bench --horizons 7 28 91
+"""
+from datetime import datetime, time
+import argparse
+import random
+import time as clock
+from app.services.scheduler import SchedulerService
+from .scheduler_bench import make_calendar
+
+
+def main(args):
+    rng = random.Random(0)
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    backend, calendar = make_calendar(start, max(args.horizons) + 1, rng)
+    scheduler = SchedulerService(calendar_service=calendar)
+
+    for horizon in args.horizons:
+        backend.listings = 0
+        started = clock.perf_counter()
+        suggestions = scheduler.suggest_routine_times({
+            'duration_minutes': 45, 'preferred_time': time(12, 30), 'horizon_days': horizon
+        })
+        elapsed = clock.perf_counter() - started
+        print(f"{horizon:4d} days  {elapsed * 1000:7.2f} ms  {len(suggestions):3d} suggestions  "
+              f"listings {backend.listings}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--horizons', type=int, nargs='+', default=[7, 28, 91])
+    main(parser.parse_args())
@@ -0,0 +1,110 @@
+"""Placing a backlog of tasks: schedule_task one at a time vs. schedule_tasks in one pass.
+
+Both run against a SQLite-backed calendar that already holds a few meetings a day,
+counting upstream event listings and insert round trips (a batch counts as one).
+
+    python -m benchmarks.scheduler_bench --tasks 10 100 1000
+"""
+from datetime import datetime, timedelta
+import argparse
+import random
+import time
+from app.services.backends.sqlite_backend import SQLiteCalendarBackend
+from app.services.calendar import CalendarService
+from app.services.scheduler import SchedulerService
+
+
+class CountingBackend(SQLiteCalendarBackend):
+    """Counts the calls that would each be an HTTP round trip against Google."""
+
+    def __init__(self):
+        super().__init__()
+        self.listings = 0
+        self.writes = 0
+
+    def list_events(self, *args, **kwargs):
+        self.listings += 1
+        return super().list_events(*args, **kwargs)
+
+    def insert_event(self, body):
+        if not self._in_batch:
+            self.writes += 1
+        return super().insert_event(body)
+
+    def execute_batch(self, operations):
+        self.writes += 1
+        return super().execute_batch(operations)
+
+
+def make_tasks(count: int, start: datetime, horizon_days: int, rng: random.Random):
+    tasks = []
+    for index in range(count):
+        task = {
+            'title': f'Task {index}',
+            'duration_minutes': rng.choice([30, 45, 60, 90, 120]),
+            'priority': rng.choice(['low', 'medium', 'medium', 'high', 'urgent']),
+            'preferred_date': start.date()
+        }
+        if rng.random() < 0.5:
+            task['deadline'] = start + timedelta(days=rng.randint(1, horizon_days))
+        tasks.append(task)
+    return tasks
+
+
+def make_calendar(start: datetime, days: int, rng: random.Random):
+    backend = CountingBackend()
+    calendar = CalendarService(backend=backend)
+    calendar.batch_create_events([
+        {
+            'title': f'Meeting {day}-{slot}',
+            'start_time': start + timedelta(days=day, hours=hour),
+            'end_time': start + timedelta(days=day, hours=hour, minutes=rng.choice([30, 60]))
+        }
+        for day in range(days) for slot, hour in enumerate(rng.sample(range(9, 17), 3))
+    ])
+    backend.listings = backend.writes = 0
+    return backend, calendar
+
+
+def run(name, count, schedule):
+    rng = random.Random(count)
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    # Eight working hours a day hold roughly six tasks once the meetings are in
+    horizon_days = max(14, count * 7 // 5 // 5)
+    backend, calendar = make_calendar(start, horizon_days, rng)
+    scheduler = SchedulerService(calendar_service=calendar)
+    tasks = make_tasks(count, start, horizon_days, rng)
+
+    started = time.perf_counter()
+    placed = schedule(scheduler, tasks, start, horizon_days)
+    elapsed = time.perf_counter() - started
+    print(f"{count:5d} tasks  {name:<16} {elapsed * 1000:9.1f} ms  placed {placed:5d}  "
+          f"listings {backend.listings:5d}  insert round trips {backend.writes:5d}")
+
+
+def one_at_a_time(scheduler, tasks, start, horizon_days):
+    placed = 0
+    for task in tasks:
+        try:
+            scheduler.schedule_task(task)
+            placed += 1
+        except ValueError:
+            pass
+    return placed
+
+
+def one_pass(scheduler, tasks, start, horizon_days):
+    results = scheduler.schedule_tasks(tasks, start=start, horizon_days=horizon_days)
+    return sum(result['scheduled'] for result in results)
+
+
+def main(args):
+    for count in args.tasks:
+        run('schedule_task', count, one_at_a_time)
+        run('schedule_tasks', count, one_pass)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[10, 100, 1000])
+    main(parser.parse_args())
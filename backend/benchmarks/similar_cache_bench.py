@@ -0,0 +1,77 @@
+"""Near-duplicate reuse of LLM parses: hit rate, LLM calls and lookup latency.
+
+Sends a stream of utterances in which each task comes back several times with a
+different day, time or shorthand ("tmrw") through NLPService against the fake Gemini
+endpoint, with the near-duplicate cache off and on. The exact-match cache stays on in
+both runs, so the difference is what the similarity tier adds.
+
+    python -m benchmarks.similar_cache_bench --tasks 50 --repeats 6
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from app.config import get_settings
+from .fake_calendar_server import serve_in_thread
+from .fake_gemini_server import API_PREFIX, create_fake_gemini_app
+
+# Wordy enough that the rule parser defers to the LLM
+TASKS = [
+    'walk through the {} roadmap draft with the whole design team',
+    'go over the {} hiring plan and open headcount with finance',
+    'review the {} launch checklist together with support and sales',
+    'sit down with the platform folks about the {} migration backlog'
+]
+TOPICS = ['q1', 'q2', 'q3', 'q4', 'mobile', 'billing', 'search', 'payments', 'infra', 'growth',
+          'onboarding', 'analytics', 'security']
+WHEN = ['tomorrow at 10', 'tmrw at 10', 'tmrw 3pm', 'on friday at 2', 'tomorrow at 11:30 for 30 minutes',
+        'on monday at 4pm', 'today at 5', 'on 11/3 at 9am']
+
+
+def workload(tasks: int, repeats: int, seed: int):
+    rng = random.Random(seed)
+    titles = [template.format(topic) for topic in TOPICS for template in TASKS][:tasks]
+    lines = [f'{title} {rng.choice(WHEN)}' for title in titles for _ in range(repeats)]
+    rng.shuffle(lines)
+    return lines
+
+
+async def main(args):
+    app = create_fake_gemini_app(latency_ms=args.latency_ms)
+    server, root_url = serve_in_thread(app)
+    settings = get_settings()
+    settings.GEMINI_API_BASE = root_url + API_PREFIX
+    from app.services.nlp import NLPService
+
+    lines = workload(args.tasks, args.repeats, args.seed)
+    print(f"{len(lines)} utterances, {args.tasks} distinct tasks, {args.latency_ms:.0f} ms per LLM call")
+    for name, size in (('exact cache only', 0), ('with similarity', args.cache_size)):
+        settings.SIMILAR_CACHE_SIZE = size
+        service = NLPService()
+        calls_before = app.state.calls
+        latencies = []
+        for line in lines:
+            started = time.perf_counter()
+            await service.aparse_event_intent(line)
+            latencies.append(time.perf_counter() - started)
+        await service.aclose()
+
+        stats = service.similar_cache.stats()
+        print(
+            f"{name:<17} mean {statistics.mean(latencies) * 1000:7.1f} ms  "
+            f"{app.state.calls - calls_before:4d} LLM calls  "
+            f"similar hit rate {stats['hit_rate']:.2f}  lookup {stats['mean_lookup_us']:.0f} us"
+        )
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=6)
+    parser.add_argument('--cache-size', type=int, default=1024, help="SIMILAR_CACHE_SIZE")
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
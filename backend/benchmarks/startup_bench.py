@@ -0,0 +1,72 @@
+"""Worker cold start: time from process launch to importing the app and to its first response.
+
+Each run starts a fresh interpreter that imports app.main and serves it with uvicorn,
+while this process polls GET / until it answers.
+
+    python -m benchmarks.startup_bench --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+CHILD = """
+import sys, time
+started = float(sys.argv[1])
+import app.main
+print(f"imported {time.time() - started:.6f}", flush=True)
+import uvicorn
+uvicorn.run(app.main.app, host="127.0.0.1", port=int(sys.argv[2]), log_level="warning")
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_once(timeout: float) -> dict:
+    port = free_port()
+    started = time.time()
+    child = subprocess.Popen(
+        [sys.executable, '-c', CHILD, str(started), str(port)],
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    try:
+        while True:
+            if time.time() - started > timeout:
+                raise TimeoutError("app did not answer in time")
+            # A bare connect attempt is cheap, so polling does not steal CPU from the child
+            with socket.socket() as sock:
+                if sock.connect_ex(('127.0.0.1', port)) != 0:
+                    time.sleep(0.005)
+                    continue
+            if httpx.get(f'http://127.0.0.1:{port}/', timeout=5).status_code == 200:
+                first_response = time.time() - started
+                break
+        imported = float(child.stdout.readline().split()[1])
+    finally:
+        child.terminate()
+        child.wait()
+    return {'import': imported, 'first_response': first_response}
+
+
+def main(args):
+    runs = [run_once(args.timeout) for _ in range(args.runs)]
+    for key, label in (('import', 'launch -> app imported'), ('first_response', 'launch -> first response')):
+        values = [run[key] * 1000 for run in runs]
+        print(f"{label:<26} median {statistics.median(values):7.1f} ms  min {min(values):7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60)
+    main(parser.parse_args())
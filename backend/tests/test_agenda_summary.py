@@ -0,0 +1,17 @@
+from app.services.nlp import NLPService
+
+
+def test_agenda_shows_events_at_their_own_offset():
+    events = [
+        {'summary': 'Standup', 'start': {'dateTime': '2026-10-16T09:00:00-07:00'},
+         'end': {'dateTime': '2026-10-16T09:15:00-07:00'}},
+        {'summary': 'Review', 'start': {'dateTime': '2026-10-16T14:00:00Z', 'timeZone': 'Europe/Berlin'},
+         'end': {'dateTime': '2026-10-16T15:00:00Z', 'timeZone': 'Europe/Berlin'}},
+    ]
+
+    summary = NLPService().generate_agenda_summary(events)
+
+    assert "• 09:00 AM - 09:15 AM: Standup" in summary
+    assert "• 04:00 PM - 05:00 PM: Review" in summary
+    # Sorted by the actual moment: 14:00 UTC comes before 16:00 UTC
+    assert summary.index("Review") < summary.index("Standup")
@@ -0,0 +1,91 @@
+from datetime import datetime, time, timedelta, timezone
+import random
+import pytest
+from app.utils.availability import Availability
+from app.utils.free_slots import find_free_intervals
+
+DAY = datetime(2026, 10, 15, tzinfo=timezone.utc)
+
+
+def at(hours: float, day: int = 0) -> datetime:
+    return DAY + timedelta(days=day, hours=hours)
+
+
+def free_between(*spans) -> Availability:
+    result = Availability()
+    for start, end in spans:
+        result |= Availability.window(start, end)
+    return result
+
+
+def test_first_fit_takes_the_earliest_run_long_enough():
+    free = free_between((at(9), at(9.5)), (at(10), at(12)))
+    assert free.first_fit(30) == at(9)
+    assert free.first_fit(45) == at(10)
+    assert free.first_fit(45, not_before=at(10.5)) == at(10.5)
+    assert free.first_fit(45, before=at(10.5)) is None
+    assert free.first_fit(180) is None
+
+
+def test_first_fit_continues_across_midnight():
+    free = free_between((at(23), at(1, day=1)))
+    assert free.first_fit(120) == at(23)
+    assert free.first_fit(121) is None
+
+
+def test_best_fit_takes_the_tightest_run():
+    free = free_between((at(9), at(12)), (at(13), at(14)), (at(15), at(15.5)))
+    assert free.best_fit(30) == at(15)
+    assert free.best_fit(45) == at(13)
+    assert free.best_fit(90) == at(9)
+    assert free.best_fit(45, not_before=at(13.5)) is None
+    assert free.best_fit(30, before=at(14)) == at(13)
+
+
+def test_nearest_fit_moves_the_target_into_the_closest_run():
+    free = free_between((at(9), at(10)), (at(14), at(17)))
+    assert free.nearest_fit(30, at(15)) == at(15)
+    # 16:45 would run past the end of the free time
+    assert free.nearest_fit(30, at(16.75)) == at(16.5)
+    assert free.nearest_fit(30, at(11)) == at(9.5)
+    assert free.nearest_fit(30, at(12.5)) == at(14)
+    assert free.nearest_fit(120, at(9)) == at(14)
+
+
+def test_shift_moves_free_time_across_days():
+    free = free_between((at(22), at(23)))
+    assert free.shift(timedelta(hours=1, minutes=30)) == free_between((at(23.5), at(0.5, day=1)))
+    assert free.shift(timedelta(days=-2)) == free_between((at(22, day=-2), at(23, day=-2)))
+    with pytest.raises(ValueError):
+        free.shift(timedelta(seconds=30))
+
+
+def test_bytes_round_trip():
+    rng = random.Random(0)
+    free = Availability()
+    for _ in range(50):
+        start = at(rng.randrange(0, 24 * 30 * 60) / 60)
+        free |= Availability.window(start, start + timedelta(minutes=rng.randrange(1, 300)))
+    assert Availability.from_bytes(free.to_bytes()) == free
+    assert Availability.from_bytes(Availability().to_bytes()) == Availability()
+
+
+def test_partial_minutes_round_towards_busy():
+    # A free window keeps only its whole minutes, busy time takes every minute it touches
+    window = Availability.window(at(9) + timedelta(seconds=30), at(10) + timedelta(seconds=30))
+    assert window == free_between((at(9) + timedelta(minutes=1), at(10)))
+    busy = Availability.from_intervals([(at(9.5) + timedelta(seconds=10), at(9.75) - timedelta(seconds=10))])
+    assert busy == free_between((at(9.5), at(9.75)))
+    free = window - busy
+    # The half minute lost at 9:00 leaves 29 minutes before the busy time
+    assert free.first_fit(29) == at(9) + timedelta(minutes=1)
+    assert free.first_fit(30) is None
+    assert free.first_fit(15, not_before=at(9) + timedelta(minutes=20)) == at(9.75)
+    assert free.first_fit(16, not_before=at(9) + timedelta(minutes=20)) is None
+
+
+def test_from_busy_agrees_with_the_sweep():
+    busy = [(at(10), at(11)), (at(13, day=1), at(15, day=1)), (at(8, day=2), at(18, day=2))]
+    hours = (time(9), time(17))
+    free = Availability.from_busy(busy, at(0), at(0, day=3), working_hours=hours, buffer_minutes=10)
+    assert free.slots(30) == find_free_intervals(busy, at(0), at(0, day=3), 30, working_hours=hours, buffer_minutes=10)
@@ -0,0 +1,89 @@
+import pytest
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, 'time', clock)
+    return clock
+
+
+def open_breaker(**options) -> CircuitBreaker:
+    breaker = CircuitBreaker('test', min_calls=4, failure_rate=0.5, reset_seconds=30, **options)
+    for _ in range(2):
+        breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_once_enough_calls_fail(clock):
+    breaker = CircuitBreaker('test', min_calls=4, failure_rate=0.5)
+    for _ in range(3):
+        breaker.record_failure()
+    # Fewer than min_calls recorded
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = open_breaker()
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    # Only one probe at a time
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+    assert breaker.stats()['failure_rate'] == 0.0
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = open_breaker()
+    clock.now += 30
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    clock.now += 29
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+
+
+def test_lost_probe_stops_counting_after_reset(clock):
+    breaker = open_breaker()
+    clock.now += 30
+    assert breaker.allow_request()
+    # The probe's caller never reports back
+    clock.now += 30
+    assert breaker.allow_request()
+
+
+def test_slow_calls_count_as_failures(clock):
+    breaker = CircuitBreaker('test', min_calls=4, failure_rate=0.5, slow_call_seconds=2.0)
+    breaker.record_success(latency=0.5)
+    breaker.record_success(latency=2.0)
+    breaker.record_success(latency=2.5)
+    assert breaker.state == CLOSED
+    breaker.record_success(latency=3.0)
+    assert breaker.state == OPEN
@@ -0,0 +1,32 @@
+from datetime import datetime, time, timezone
+from zoneinfo import ZoneInfo
+from app.config import get_settings
+from app.services.backends.sqlite_backend import SQLiteCalendarBackend
+from app.services.calendar import CalendarService
+from app.utils.event_times import parse_event_time
+
+LOS_ANGELES = ZoneInfo('America/Los_Angeles')
+
+
+def test_all_day_dates_start_at_local_midnight(monkeypatch):
+    monkeypatch.setattr(get_settings(), 'DEFAULT_TIMEZONE', 'America/Los_Angeles')
+
+    assert parse_event_time({'date': '2026-10-16'}) == datetime(2026, 10, 16, 7, tzinfo=timezone.utc)
+    assert parse_event_time({'date': '2026-10-16', 'timeZone': 'Europe/Berlin'}) == datetime(
+        2026, 10, 15, 22, tzinfo=timezone.utc)
+
+
+def test_all_day_event_blocks_its_own_working_day(monkeypatch):
+    monkeypatch.setattr(get_settings(), 'DEFAULT_TIMEZONE', 'America/Los_Angeles')
+    calendar = CalendarService(backend=SQLiteCalendarBackend())
+    calendar.backend.insert_event({'summary': 'Offsite', 'start': {'date': '2026-10-16'}, 'end': {'date': '2026-10-17'}})
+
+    slots = calendar.find_free_intervals(
+        datetime(2026, 10, 15, tzinfo=LOS_ANGELES), datetime(2026, 10, 18, tzinfo=LOS_ANGELES), 30,
+        working_hours=(time(9), time(17)), working_days=range(7)
+    )
+
+    assert [(slot['start'].astimezone(LOS_ANGELES), slot['end'].astimezone(LOS_ANGELES)) for slot in slots] == [
+        (datetime(2026, 10, 15, 9, tzinfo=LOS_ANGELES), datetime(2026, 10, 15, 17, tzinfo=LOS_ANGELES)),
+        (datetime(2026, 10, 17, 9, tzinfo=LOS_ANGELES), datetime(2026, 10, 17, 17, tzinfo=LOS_ANGELES)),
+    ]
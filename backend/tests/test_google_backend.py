@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from app.services.backends.google_backend import FREEBUSY_MAX_CALENDARS, GoogleCalendarBackend
+
+
+class FakeFreeBusy:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, body):
+        self.queries.append(body)
+        return self
+
+    def execute(self):
+        body = self.queries[-1]
+        return {'calendars': {item['id']: {'busy': [{'start': body['timeMin'], 'end': body['timeMax']}]}
+                              for item in body['items']}}
+
+
+class FakeEvents:
+    def insert(self, calendarId, body):
+        return body
+
+
+class FailingBatch:
+    """Answers the first two requests, then fails the way a dropped connection would."""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, request, callback):
+        self.added.append((request, callback))
+
+    def execute(self):
+        for request, callback in self.added[:2]:
+            callback(None, request, None)
+        raise ConnectionError("connection reset")
+
+
+class FakeService:
+    def __init__(self):
+        self.free_busy = FakeFreeBusy()
+
+    def freebusy(self):
+        return self.free_busy
+
+    def events(self):
+        return FakeEvents()
+
+    def new_batch_http_request(self):
+        return FailingBatch()
+
+
+def test_query_busy_splits_large_teams():
+    backend = GoogleCalendarBackend()
+    backend._service = FakeService()
+    calendar_ids = [f'person{i}@example.com' for i in range(120)]
+    start = datetime(2026, 10, 15, 9, tzinfo=timezone.utc)
+
+    busy = backend.query_busy(start, start + timedelta(hours=8), calendar_ids)
+
+    assert [len(query['items']) for query in backend._service.free_busy.queries] == [
+        FREEBUSY_MAX_CALENDARS, FREEBUSY_MAX_CALENDARS, 20]
+    assert sorted(busy) == sorted(calendar_ids)
+
+
+def test_execute_batch_keeps_answers_received_before_a_failure(monkeypatch):
+    backend = GoogleCalendarBackend()
+    backend._service = FakeService()
+    monkeypatch.setattr(backend.settings, 'CALENDAR_BATCH_SIZE', 50)
+
+    results = backend.execute_batch([('insert', {'summary': f'Event {i}'}) for i in range(4)])
+
+    assert [result['success'] for result in results] == [True, True, False, False]
+    assert results[1]['event'] == {'summary': 'Event 1'}
+    assert results[3]['error'] == "connection reset"
+
+
+def test_cannot_sync_unattended_before_any_login(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    backend = GoogleCalendarBackend()
+
+    assert not backend.can_sync_unattended()
+    backend._creds = object()
+    assert backend.can_sync_unattended()
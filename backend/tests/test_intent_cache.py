@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+import pytest
+from app.services import intent_cache
+from app.services.intent_cache import IntentCache
+
+REFERENCE_TIME = datetime(2026, 10, 15, 10, 0)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(intent_cache, 'time', clock)
+    return clock
+
+
+def standup_fields(day: int) -> dict:
+    return {
+        'action': 'create',
+        'title': 'Standup',
+        'start_time': datetime(2026, 10, day, 9, 0, tzinfo=timezone.utc),
+        'end_time': datetime(2026, 10, day, 9, 30, tzinfo=timezone.utc)
+    }
+
+
+def test_relative_key_is_text_weekday_and_hour_bucket():
+    cache = IntentCache()
+    key = cache.key('  Standup   TOMORROW at 9am! ', REFERENCE_TIME)
+    assert key == ('standup tomorrow at 9am', REFERENCE_TIME.weekday(), 10)
+    # Same bucket, same key; the next bucket or weekday is a different key
+    assert cache.key('standup tomorrow at 9am', REFERENCE_TIME.replace(minute=59)) == key
+    assert cache.key('standup tomorrow at 9am', REFERENCE_TIME.replace(hour=11)) != key
+    assert cache.key('standup tomorrow at 9am', datetime(2026, 10, 16, 10, 0)) != key
+
+
+def test_explicit_date_key_ignores_reference_time():
+    cache = IntentCache()
+    for text in ('standup 2026-10-16 at 9am', 'standup 10/16 at 9am', 'standup oct 16th at 9am',
+                 'standup 16 october at 9am'):
+        assert cache.key(text, REFERENCE_TIME) == (text,)
+        assert cache.key(text, datetime(2026, 12, 1, 18, 0)) == (text,)
+
+
+def test_explicit_date_hit_keeps_absolute_times():
+    cache = IntentCache()
+    fields = standup_fields(16)
+    cache.put('standup 2026-10-16 at 9am', REFERENCE_TIME, fields)
+
+    assert cache.get('Standup 2026-10-16 at 9am.', datetime(2026, 10, 22, 10, 0)) == fields
+
+
+def test_relative_hit_is_reanchored_to_the_new_reference_day():
+    cache = IntentCache()
+    cache.put('standup tomorrow at 9am', REFERENCE_TIME, standup_fields(16))
+
+    # One week later, same weekday and hour bucket
+    hit = cache.get('standup tomorrow at 9am', datetime(2026, 10, 22, 10, 30))
+    assert hit['start_time'] == datetime(2026, 10, 23, 9, 0, tzinfo=timezone.utc)
+    assert hit['end_time'] == datetime(2026, 10, 23, 9, 30, tzinfo=timezone.utc)
+    assert hit['title'] == 'Standup'
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = IntentCache(ttl_seconds=60)
+    cache.put('standup tomorrow at 9am', REFERENCE_TIME, standup_fields(16))
+
+    clock.now += 59
+    assert cache.get('standup tomorrow at 9am', REFERENCE_TIME) is not None
+    clock.now += 2
+    assert cache.get('standup tomorrow at 9am', REFERENCE_TIME) is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = IntentCache(max_size=2)
+    cache.put('first', REFERENCE_TIME, {'title': 'First'})
+    cache.put('second', REFERENCE_TIME, {'title': 'Second'})
+    # Touching "first" makes "second" the least recently used
+    assert cache.get('first', REFERENCE_TIME) == {'title': 'First'}
+    cache.put('third', REFERENCE_TIME, {'title': 'Third'})
+
+    assert cache.get('second', REFERENCE_TIME) is None
+    assert cache.get('first', REFERENCE_TIME) == {'title': 'First'}
+    assert cache.get('third', REFERENCE_TIME) == {'title': 'Third'}
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert (stats['hits'], stats['misses']) == (3, 1)
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+import pytest
+from app.services.backends.sqlite_backend import SQLiteCalendarBackend
+from app.services.calendar import CalendarService
+from app.services.intent_executor import IntentExecutor
+from app.services.rule_parser import parse_event_text
+from app.utils.event_times import event_bounds, to_utc
+
+REFERENCE_TIME = datetime(2026, 10, 15, 10, 0)
+
+
+@pytest.fixture
+def calendar():
+    service = CalendarService(backend=SQLiteCalendarBackend())
+    start = datetime(2026, 10, 16, 11, 0)
+    service.create_event({'title': 'Review', 'start_time': start, 'end_time': start + timedelta(minutes=30)})
+    return service
+
+
+def moved_bounds(calendar, text):
+    # The rule parse stands in for an LLM one, which carries no confidence
+    intent = parse_event_text(text, REFERENCE_TIME).model_copy(update={'confidence': None})
+    [result] = IntentExecutor(calendar).execute([intent], REFERENCE_TIME)
+    assert result['success'], result
+    return event_bounds(result['event'])
+
+
+def test_update_to_a_range_takes_the_given_end(calendar):
+    assert moved_bounds(calendar, "move the review to tomorrow 2-3pm") == (
+        to_utc(datetime(2026, 10, 16, 14, 0)), to_utc(datetime(2026, 10, 16, 15, 0)))
+
+
+def test_update_to_a_time_keeps_the_event_length(calendar):
+    assert moved_bounds(calendar, "move the review to tomorrow at 2pm") == (
+        to_utc(datetime(2026, 10, 16, 14, 0)), to_utc(datetime(2026, 10, 16, 14, 30)))
+
+
+def test_fallback_parse_does_not_delete(calendar):
+    intent = parse_event_text("cancel the 11am review tomorrow", REFERENCE_TIME)
+    assert intent.confidence < calendar.settings.RULE_PARSER_MIN_CONFIDENCE
+
+    [result] = IntentExecutor(calendar).execute([intent], REFERENCE_TIME)
+
+    assert not result['success'] and result['needs_clarification']
+    assert [event['summary'] for event in calendar.iter_events(REFERENCE_TIME, REFERENCE_TIME + timedelta(days=2))] == [
+        'Review']
@@ -0,0 +1,32 @@
+from datetime import datetime
+from app.services.intent_model import NONE, AveragedPerceptron, IntentModel
+
+REFERENCE_TIME = datetime(2026, 10, 15, 10, 0)
+
+
+def fixed_model(**labels):
+    """A model whose heads always answer labels[head] and whose tagger tags every token as title."""
+    model = IntentModel()
+    model.heads = {name: AveragedPerceptron({'bias': {label: 5.0}}, [label, 'other'])
+                   for name, label in labels.items()}
+    model.tagger = AveragedPerceptron({'bias': {'T': 5.0}}, ['T', 'O'])
+    return model
+
+
+def test_timeless_intent_keeps_its_score():
+    model = fixed_model(action='create', priority='medium', day=NONE, time=NONE, duration=NONE)
+    intent = model.predict("water the plants", REFERENCE_TIME)
+    assert intent.start_time is None
+    assert intent.confidence > 0.9
+
+
+def test_day_without_a_time_is_not_confident():
+    model = fixed_model(action='create', priority='medium', day='1', time=NONE, duration=NONE)
+    intent = model.predict("water the plants tomorrow", REFERENCE_TIME)
+    assert intent.start_time is None
+    assert intent.confidence == 0.0
+
+
+def test_time_without_a_day_is_not_confident():
+    model = fixed_model(action='create', priority='medium', day=NONE, time='09:00', duration=NONE)
+    assert model.predict("water the plants at 9", REFERENCE_TIME).confidence == 0.0
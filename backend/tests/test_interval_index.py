@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+import random
+from app.utils.interval_index import IntervalIndex
+
+BASE = datetime(2026, 10, 15, tzinfo=timezone.utc)
+
+
+def at(minutes: int) -> datetime:
+    return BASE + timedelta(minutes=minutes)
+
+
+def index_of(*spans):
+    return IntervalIndex((at(start), at(end), name) for name, start, end in spans)
+
+
+def test_empty_index_has_no_overlaps():
+    index = IntervalIndex()
+    assert len(index) == 0
+    assert index.overlapping(at(0), at(60)) == []
+
+
+def test_touching_endpoints_do_not_overlap():
+    index = index_of(('a', 0, 60), ('b', 120, 180))
+    assert index.overlapping(at(60), at(120)) == []
+    assert index.overlapping(at(59), at(121)) == ['a', 'b']
+
+
+def test_nested_and_identical_intervals():
+    index = index_of(('day', 0, 600), ('inner', 120, 180), ('twin1', 300, 360), ('twin2', 300, 360))
+    assert index.overlapping(at(150), at(151)) == ['day', 'inner']
+    assert sorted(index.overlapping(at(300), at(360))) == ['day', 'twin1', 'twin2']
+    # A zero-length query finds the intervals containing that instant
+    assert sorted(index.overlapping(at(330), at(330))) == ['day', 'twin1', 'twin2']
+    assert index.overlapping(at(599), at(700)) == ['day']
+
+
+def test_matches_a_linear_scan():
+    rng = random.Random(0)
+    spans = []
+    for number in range(300):
+        start = rng.randrange(0, 10_000)
+        spans.append((number, start, start + rng.choice([0, 1, 15, 30, 60, 600, 3000])))
+    index = index_of(*spans)
+
+    for _ in range(500):
+        query_start = rng.randrange(-100, 10_100)
+        query_end = query_start + rng.randrange(0, 500)
+        expected = [name for name, start, end in spans if start < query_end and end > query_start]
+        found = index.overlapping(at(query_start), at(query_end))
+        assert sorted(found) == expected
+        starts = [spans[name][1] for name in found]
+        assert starts == sorted(starts)
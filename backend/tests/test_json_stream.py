@@ -0,0 +1,50 @@
+import json
+import pytest
+from app.utils.json_stream import JsonStreamParser
+
+VALUE = {
+    'title': 'Sync "planning" {draft} [v2]',
+    'path': 'C:\\notes\\}',
+    'nested': {'attendees': [{'email': 'a@example.com'}, {'email': 'b@example.com'}], 'empty': {}},
+    'unicode': 'caf\u00e9 \u2013 \\"quoted\\"'
+}
+TEXT = "Sure, here it is:\n```json\n" + json.dumps(VALUE) + "\n```\nAnything else?"
+
+
+def feed_all(chunks):
+    parser = JsonStreamParser()
+    for chunk in chunks:
+        value = parser.feed(chunk)
+        if value is not None:
+            return value
+    return None
+
+
+@pytest.mark.parametrize("split", range(1, len(TEXT)))
+def test_any_two_chunk_split_decodes_the_value(split):
+    assert feed_all([TEXT[:split], TEXT[split:]]) == VALUE
+
+
+def test_one_character_at_a_time():
+    assert feed_all(TEXT) == VALUE
+
+
+def test_stops_at_the_first_complete_value():
+    parser = JsonStreamParser()
+    assert parser.feed('[{"a": 1}] trailing [2]') == [{'a': 1}]
+    assert parser.done
+    assert parser.feed('{"ignored": true}') == [{'a': 1}]
+
+
+def test_openers_limit_what_starts_a_value():
+    parser = JsonStreamParser(openers='[')
+    assert parser.feed('{"not": "this"} but [1, {"b": [2]}]') == [1, {'b': [2]}]
+
+
+def test_incomplete_value_is_none():
+    assert feed_all(['{"title": "unterminated ', '\\"}']) is None
+
+
+def test_invalid_json_raises():
+    with pytest.raises(ValueError):
+        JsonStreamParser().feed('{"a": 1,}')
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app import main
+from app.models.intent import EventIntent
+from app.services.backends.sqlite_backend import SQLiteCalendarBackend
+from app.services.calendar import build_event_body
+
+START = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def test_batch_runs_each_action_instead_of_creating_them_all(monkeypatch):
+    backend = SQLiteCalendarBackend()
+    review = backend.insert_event(build_event_body(
+        {'title': 'Review', 'start_time': START, 'end_time': START + timedelta(hours=1)}, main.calendar_service.settings
+    ))
+    monkeypatch.setattr(main.calendar_service, 'backend', backend)
+
+    async def aparse_event_intents(user_inputs, reference_time=None):
+        return [
+            EventIntent(action='create', title='Lunch', start_time=START + timedelta(hours=3),
+                        end_time=START + timedelta(hours=4)),
+            EventIntent(action='delete', title='Review', start_time=START),
+            EventIntent(action='query', start_time=START, end_time=START + timedelta(days=1)),
+        ]
+
+    monkeypatch.setattr(main.nlp_service, 'aparse_event_intents', aparse_event_intents)
+    response = TestClient(main.app).post("/events/natural/batch", json={"texts": [
+        "lunch tomorrow", "cancel the review tomorrow", "what do I have tomorrow"
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [result['action'] for result in results] == ['create', 'delete', 'query']
+    assert all(result['success'] for result in results)
+    assert results[1]['event_id'] == review['id']
+    assert 'Lunch' in results[2]['answer']
+    titles = [event['summary'] for event in backend.list_events(START, START + timedelta(days=1), 10)['items']]
+    assert titles == ['Lunch']
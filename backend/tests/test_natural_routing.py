@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.models.intent import EventIntent
+from app.services.rule_parser import query_window
+
+REFERENCE_TIME = datetime(2026, 10, 15, 10, 0)
+
+CREATE_PHRASINGS = [
+    "Can you schedule lunch with bob tomorrow at noon?",
+    "Could you book a dentist appointment friday at 3pm?",
+    "find time for a 1:1 with sam next week",
+    "show the slides to alice at 2pm tomorrow",
+]
+OTHER_QUESTIONS = ["what is the weather?", "when is my dentist appointment?"]
+CALENDAR_QUESTIONS = [
+    "what do I have friday afternoon",
+    "am I free at 3",
+    "what's on next week",
+    "show me my calendar for tomorrow",
+    "do I have anything tonight?",
+]
+
+
+@pytest.mark.parametrize("text", CREATE_PHRASINGS + OTHER_QUESTIONS)
+def test_query_window_leaves_other_requests_to_the_parser(text):
+    assert query_window(text, REFERENCE_TIME) is None
+
+
+@pytest.mark.parametrize("text", CALENDAR_QUESTIONS)
+def test_query_window_answers_calendar_questions(text):
+    start, end = query_window(text, REFERENCE_TIME)
+    assert start < end
+
+
+@pytest.mark.parametrize("text", CREATE_PHRASINGS)
+def test_create_phrasings_are_created(text, monkeypatch):
+    start = REFERENCE_TIME + timedelta(days=1)
+    created = []
+
+    async def aparse_actions(user_input, reference_time=None):
+        return [EventIntent(action='create', title='Lunch', start_time=start, end_time=start + timedelta(hours=1))]
+
+    async def create_event(event_data):
+        created.append(event_data)
+        return {'id': 'evt1', 'summary': event_data['title']}
+
+    monkeypatch.setattr(main.nlp_service, 'aparse_actions', aparse_actions)
+    monkeypatch.setattr(main.async_calendar_service, 'create_event', create_event)
+    response = TestClient(main.app).post("/events/natural", json={"text": text})
+
+    assert response.status_code == 200
+    assert response.json()['message'] == "Event created successfully"
+    assert [event_data['title'] for event_data in created] == ['Lunch']
@@ -0,0 +1,34 @@
+from datetime import datetime
+from app.config import get_settings
+from app.services.rule_parser import parse_event_text
+
+REFERENCE_TIME = datetime(2026, 10, 15, 10, 0)
+
+
+def test_book_before_an_object_is_a_verb():
+    intent = parse_event_text("book a dentist appointment friday at 3pm", REFERENCE_TIME)
+    assert intent.action == 'create'
+    assert intent.title == "Dentist appointment"
+
+
+def test_book_without_an_object_stays_in_the_title():
+    intent = parse_event_text("book club on the 3rd of november at 7pm", REFERENCE_TIME)
+    assert intent.title == "Book club"
+    assert intent.confidence < get_settings().RULE_PARSER_MIN_CONFIDENCE
+
+
+def test_next_weekday_is_in_the_following_week():
+    # REFERENCE_TIME is a Thursday
+    intent = parse_event_text("meeting next friday 3-5pm", REFERENCE_TIME)
+    assert intent.start_time == datetime(2026, 10, 23, 15, 0)
+    assert intent.end_time == datetime(2026, 10, 23, 17, 0)
+
+
+def test_next_weekday_naming_today_is_a_week_out():
+    intent = parse_event_text("meeting next thursday at 3pm", REFERENCE_TIME)
+    assert intent.start_time == datetime(2026, 10, 22, 15, 0)
+
+
+def test_bare_weekday_is_the_coming_one():
+    intent = parse_event_text("meeting friday at 3pm", REFERENCE_TIME)
+    assert intent.start_time == datetime(2026, 10, 16, 15, 0)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from app.models.intent import EventIntent
+from app.services.similar_intent_cache import SimilarIntentCache, same_content, strip_time_tokens
+
+REFERENCE_TIME = datetime(2026, 10, 15, 10, 0)
+
+
+def llm_intent(title: str, start: datetime, end: datetime, **fields) -> EventIntent:
+    return EventIntent(action='create', title=title, start_time=start, end_time=end,
+                       duration_minutes=int((end - start).total_seconds() // 60), **fields)
+
+
+def test_strip_time_tokens_masks_what_the_rule_parser_resolves():
+    assert strip_time_tokens("Team sync tmrw 10am") == strip_time_tokens("team sync tomorrow at 10") == 'team sync'
+
+
+def test_same_content_allows_filler_and_spelling_variants():
+    assert same_content('kickoff meeting', 'kick-off meeting')
+    assert same_content('lunch with the design team', 'lunch design team')
+
+
+def test_same_content_rejects_a_different_content_word():
+    assert not same_content('q1 roadmap review', 'q2 roadmap review')
+    assert not same_content('dentist appointment', 'doctor appointment')
+
+
+def test_near_duplicate_with_different_content_word_is_a_miss():
+    # Even with no similarity threshold, same_content keeps "q2" from reusing "q1"
+    cache = SimilarIntentCache(threshold=0.0)
+    cache.put('q1 roadmap review tomorrow at 3pm',
+              llm_intent('Q1 roadmap review', datetime(2026, 10, 16, 15, 0), datetime(2026, 10, 16, 16, 0)))
+
+    assert cache.get('q2 roadmap review tomorrow at 3pm', REFERENCE_TIME) is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_hit_keeps_stored_fields_and_takes_times_from_the_new_utterance():
+    cache = SimilarIntentCache()
+    cache.put('team sync tomorrow at 10am for 30 minutes',
+              llm_intent('Team Sync', datetime(2026, 10, 16, 10, 0), datetime(2026, 10, 16, 10, 30),
+                         location='Room 4', priority='high'))
+
+    intent = cache.get('Team sync friday at 2pm', REFERENCE_TIME)
+    assert intent is not None
+    assert (intent.title, intent.location, intent.priority) == ('Team Sync', 'Room 4', 'high')
+    assert intent.start_time == datetime(2026, 10, 16, 14, 0)
+    # No duration in the new utterance keeps the stored one
+    assert intent.end_time == datetime(2026, 10, 16, 14, 30)
+    assert intent.duration_minutes == 30
+
+    intent = cache.get('team sync tomorrow 9am for 90 minutes', REFERENCE_TIME)
+    assert intent.start_time == datetime(2026, 10, 16, 9, 0)
+    assert intent.end_time == datetime(2026, 10, 16, 10, 30)
+    assert intent.duration_minutes == 90
+    assert cache.stats()['hits'] == 2
+
+
+def test_timing_the_rule_parser_cannot_resolve_is_a_miss():
+    cache = SimilarIntentCache()
+    cache.put('team sync tomorrow at 10am',
+              llm_intent('Team sync', datetime(2026, 10, 16, 10, 0), datetime(2026, 10, 16, 11, 0)))
+
+    assert cache.get('team sync next week', REFERENCE_TIME) is None
+    assert cache.get('team sync', REFERENCE_TIME) is None
@@ -20,6 +20,43 @@ export const createEventNatural = async (text: string) => {
 export const getDailyAgenda = (date?: string) =>
   axios.get(`${API_BASE}/events/daily`, { params: { date } });
 
+// Events for a multi-day window, streamed by the backend as NDJSON (one event per line).
+// Each event is handed to onEvent as soon as its line arrives; the promise resolves
+// with all of them once the stream ends.
+export const getRangeAgenda = async (
+  start: string,
+  end: string,
+  onEvent?: (event: any) => void
+) => {
+  const params = new URLSearchParams({ start, end });
+  const res = await fetch(`${API_BASE}/events/range?${params}`);
+  if (!res.ok || !res.body) {
+    throw new Error(`Range agenda failed: HTTP ${res.status}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  const events: any[] = [];
+  let buffered = "";
+  const take = (line: string) => {
+    if (!line.trim()) return;
+    const event = JSON.parse(line);
+    events.push(event);
+    onEvent?.(event);
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split("\n");
+    buffered = lines.pop() ?? "";
+    lines.forEach(take);
+  }
+  take(buffered + decoder.decode());
+  return events;
+};
+
 export const deleteEvent = async (eventId: string) => {
   try {
     return await axios.delete(`${API_BASE}/events/${eventId}`);